@@ -0,0 +1,52 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Compare the time taken to find the candidate devices on Linux by the udev and sysfs device detectors.
+
+Both detectors look at the devices connected to this machine, so connect a few boards first for a meaningful result.
+The candidates found by each detector are printed too: they should match whenever the udev daemon is running.
+
+Usage:
+    python benchmarks/device_detectors.py [--repeat N]
+"""
+import argparse
+import platform
+import sys
+import timeit
+
+from typing import Dict
+
+from mbed_tools.devices._internal.base_detector import DeviceDetector
+
+
+def main() -> int:
+    """Run the benchmark and print a table of results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20, help="Number of times each detector finds the candidates.")
+    args = parser.parse_args()
+
+    if platform.system() != "Linux":
+        print("The device detectors compared are only available on Linux.")
+        return 0
+
+    print(f"{'Detector':<10} {'Candidates':>10} {'Time (ms)':>10}")
+    for name, detector in _get_detectors().items():
+        candidates = detector.find_candidates()
+        timing = min(timeit.repeat(detector.find_candidates, number=1, repeat=args.repeat)) * 1000
+        print(f"{name:<10} {len(candidates):>10} {timing:>10.3f}")
+        for candidate in candidates:
+            print(f"    {candidate}")
+
+    return 0
+
+
+def _get_detectors() -> Dict[str, DeviceDetector]:
+    from mbed_tools.devices._internal.linux.device_detector import LinuxDeviceDetector
+    from mbed_tools.devices._internal.linux.sysfs_device_detector import SysfsDeviceDetector
+
+    return {"udev": LinuxDeviceDetector(), "sysfs": SysfsDeviceDetector()}
+
+
+if __name__ == "__main__":
+    sys.exit(main())
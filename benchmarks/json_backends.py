@@ -0,0 +1,63 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Compare the time taken to decode the JSON data files used by mbed-tools with each available JSON backend.
+
+By default the board database snapshot and targets metadata shipped with mbed-tools are decoded. Paths to other
+JSON files, such as an Mbed OS targets.json, can be passed on the command line.
+
+Usage:
+    python benchmarks/json_backends.py [--repeat N] [path/to/mbed-os/targets/targets.json ...]
+"""
+import argparse
+import functools
+import importlib
+import json
+import pathlib
+import sys
+import timeit
+
+from typing import Any, Callable, Dict, List
+
+from mbed_tools.lib.json_helpers import ACCELERATED_BACKENDS, STDLIB_BACKEND
+from mbed_tools.targets._internal.board_database import get_board_database_path
+from mbed_tools.targets._internal.target_attributes import MBED_OS_METADATA_FILE
+
+
+def main() -> int:
+    """Run the benchmark and print a table of results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*", type=pathlib.Path, help="Additional JSON files to decode.")
+    parser.add_argument("--repeat", type=int, default=20, help="Number of times each file is decoded per backend.")
+    args = parser.parse_args()
+
+    backends = _get_available_backends()
+    paths: List[pathlib.Path] = [get_board_database_path(), MBED_OS_METADATA_FILE, *args.paths]
+    print(f"{'File':<40} {'Size (KB)':>10} " + " ".join(f"{name + ' (ms)':>14}" for name in backends))
+    for path in paths:
+        document = path.read_bytes()
+        timings = []
+        for loads in backends.values():
+            # Check every backend agrees with the standard library before timing it.
+            assert loads(document) == json.loads(document), f"Backend produced a different result for {path}"
+            timings.append(min(timeit.repeat(lambda: loads(document), number=1, repeat=args.repeat)) * 1000)
+        print(f"{path.name:<40} {len(document) / 1024:>10.1f} " + " ".join(f"{t:>14.3f}" for t in timings))
+
+    return 0
+
+
+def _get_available_backends() -> Dict[str, Callable[[bytes], Any]]:
+    backends: Dict[str, Callable[[bytes], Any]] = {STDLIB_BACKEND: json.loads}
+    for name in ACCELERATED_BACKENDS:
+        try:
+            loads = importlib.import_module(name).loads
+        except ImportError:
+            continue
+        # Decoded as by mbed_tools.lib.json_helpers.
+        backends[name] = functools.partial(loads, precise_float=True) if name == "ujson" else loads
+    return backends
+
+
+if __name__ == "__main__":
+    sys.exit(main())
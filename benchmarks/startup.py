@@ -0,0 +1,225 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Measure the start up cost of each mbed-tools subcommand and compare it against a stored baseline.
+
+Every command is run several times, each in a fresh interpreter started with `-X importtime`, from an empty temporary
+directory so commands that act on the working directory have nothing to act on. For each command we record:
+
+- the wall time of the whole process (median of the runs),
+- the total import time and the modules whose own import time is longest, from the `-X importtime` output,
+- the number of modules imported,
+- the peak resident set size of the process (where the platform reports it).
+
+Wall times include the overhead of `-X importtime` itself. Wall and import times depend on the machine, so they are
+only compared against a baseline recorded on the same machine, using a relative tolerance. The number of modules
+imported is machine independent and catches commands which start importing heavy dependencies they don't need.
+
+Usage:
+    python benchmarks/startup.py                        # print the results
+    python benchmarks/startup.py --save-baseline        # record a baseline
+    python benchmarks/startup.py --compare              # exit with an error if a command regressed
+"""
+import argparse
+import json
+import os
+import pathlib
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_BASELINE = pathlib.Path(__file__).parent / "startup_baseline.json"
+
+COMMANDS: Dict[str, List[str]] = {
+    "--version": ["--version"],
+    "--help": ["--help"],
+    "detect": ["detect"],
+    "configure": ["configure"],
+    "compile --help": ["compile", "--help"],
+    "sterm --help": ["sterm", "--help"],
+    "new": ["new"],
+    "deploy": ["deploy"],
+}
+# Exit status of the commands which don't exit successfully from an empty directory, all other commands must exit with
+# 0. These are usage errors, reported after the command's modules have been imported.
+EXPECTED_RETURNCODES: Dict[str, int] = {
+    "configure": 2,
+    "new": 2,
+}
+
+# Relative increase allowed before a timing or memory measurement counts as a regression.
+TIME_TOLERANCE = 0.25
+RSS_TOLERANCE = 0.15
+# Number of extra imported modules allowed before counting as a regression.
+MODULE_COUNT_TOLERANCE = 10
+
+# Runs the function the installed `mbed-tools` console script runs, see `entry_points` in setup.py.
+_RUN_CLI = (
+    "import sys; from mbed_tools.completion.entry_point import main; sys.argv[0] = 'mbed-tools'; main()"
+)
+
+
+class CommandFailed(Exception):
+    """A command exited with an unexpected status, so its measurements can't be trusted."""
+
+
+def main() -> int:
+    """Run the benchmark, then optionally save or compare against the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Number of runs of each command.")
+    parser.add_argument("--top", type=int, default=5, help="Number of slowest imports to show for each command.")
+    parser.add_argument("--baseline", type=pathlib.Path, default=DEFAULT_BASELINE, help="Path to the baseline file.")
+    parser.add_argument("--save-baseline", action="store_true", help="Save the results as the new baseline.")
+    parser.add_argument("--compare", action="store_true", help="Fail if any command regressed against the baseline.")
+    args = parser.parse_args()
+
+    try:
+        results = {
+            name: measure_command(command, args.runs, EXPECTED_RETURNCODES.get(name, 0))
+            for name, command in COMMANDS.items()
+        }
+    except CommandFailed as err:
+        print(err)
+        return 1
+    print_results(results, args.top)
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps({name: _summary(r) for name, r in results.items()}, indent=4))
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if args.compare:
+        if not args.baseline.exists():
+            print(f"\nNo baseline found at {args.baseline}, record one with --save-baseline.")
+            return 2
+
+        regressions = compare_with_baseline(results, json.loads(args.baseline.read_text()))
+        if regressions:
+            print("\nRegressions found:\n" + "\n".join(f"  {r}" for r in regressions))
+            return 1
+        print("\nNo regressions found.")
+
+    return 0
+
+
+def measure_command(command: List[str], runs: int, expected_returncode: int = 0) -> Dict[str, Any]:
+    """Run a command `runs` times in fresh interpreters and collect its start up measurements.
+
+    Raises:
+        CommandFailed: The command exited with a status other than `expected_returncode`.
+    """
+    wall_times = []
+    import_times = []
+    peak_rss = []
+    imports: List[Tuple[str, int, int]] = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for _ in range(runs):
+            wall_time, stderr, rss, returncode = _run(command, work_dir)
+            if returncode != expected_returncode:
+                raise CommandFailed(
+                    f"mbed-tools {' '.join(command)} exited with {returncode}, expected {expected_returncode}:\n"
+                    + "\n".join(line for line in stderr.splitlines() if not line.startswith("import time:"))
+                )
+            imports = _parse_import_times(stderr)
+            wall_times.append(wall_time)
+            import_times.append(sum(cumulative for module, _, cumulative in imports if not module.startswith(" ")))
+            if rss is not None:
+                peak_rss.append(rss)
+
+    return {
+        "wall_ms": statistics.median(wall_times) * 1000,
+        "import_ms": statistics.median(import_times) / 1000,
+        "module_count": len(imports),
+        "peak_rss_kb": max(peak_rss) if peak_rss else None,
+        "slowest_imports": sorted(
+            ((module.strip(), self_time) for module, self_time, _ in imports), key=lambda i: i[1], reverse=True
+        ),
+    }
+
+
+def print_results(results: Dict[str, Dict[str, Any]], top: int) -> None:
+    """Print a table of results and the slowest imports of each command."""
+    print(f"{'Command':<16} {'Wall (ms)':>10} {'Imports (ms)':>13} {'Modules':>8} {'Peak RSS (KB)':>14}")
+    for name, result in results.items():
+        rss = result["peak_rss_kb"] if result["peak_rss_kb"] is not None else "n/a"
+        print(
+            f"{name:<16} {result['wall_ms']:>10.1f} {result['import_ms']:>13.1f} {result['module_count']:>8} {rss:>14}"
+        )
+
+    for name, result in results.items():
+        slowest = ", ".join(f"{module} {us / 1000:.1f}ms" for module, us in result["slowest_imports"][:top])
+        print(f"\n{name}: {slowest}")
+
+
+def compare_with_baseline(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]]) -> List[str]:
+    """Return a description of every measurement which regressed compared to the baseline."""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+
+        base = baseline[name]
+        for key in ("wall_ms", "import_ms"):
+            if result[key] > base[key] * (1 + TIME_TOLERANCE):
+                regressions.append(f"{name}: {key} {result[key]:.1f} (baseline {base[key]:.1f})")
+        if result["module_count"] > base["module_count"] + MODULE_COUNT_TOLERANCE:
+            regressions.append(f"{name}: module_count {result['module_count']} (baseline {base['module_count']})")
+        if result["peak_rss_kb"] and base.get("peak_rss_kb"):
+            if result["peak_rss_kb"] > base["peak_rss_kb"] * (1 + RSS_TOLERANCE):
+                regressions.append(f"{name}: peak_rss_kb {result['peak_rss_kb']} (baseline {base['peak_rss_kb']})")
+    return regressions
+
+
+def _summary(result: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in result.items() if key != "slowest_imports"}
+
+
+def _run(command: List[str], work_dir: str) -> Tuple[float, str, Optional[int], int]:
+    """Run the CLI in a fresh interpreter, returning its wall time, stderr, peak RSS in KB and exit status.
+
+    The exit status is negative when the process was killed by a signal, as with `subprocess.Popen.returncode`.
+    """
+    env = dict(os.environ, MBED_DATABASE_MODE="OFFLINE")
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-X", "importtime", "-c", _RUN_CLI, *command],
+        cwd=work_dir,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    stderr = process.stderr.read() if process.stderr else ""
+    rss = None
+    if hasattr(os, "wait4"):
+        _, status, rusage = os.wait4(process.pid, 0)
+        # Reaped by wait4, setting the status also stops Popen trying to wait for it again.
+        process.returncode = -os.WTERMSIG(status) if os.WIFSIGNALED(status) else os.WEXITSTATUS(status)
+        # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere.
+        rss = rusage.ru_maxrss // 1024 if sys.platform == "darwin" else rusage.ru_maxrss
+    else:
+        process.wait()
+    wall_time = time.perf_counter() - start
+    return wall_time, stderr, rss, process.returncode
+
+
+def _parse_import_times(stderr: str) -> List[Tuple[str, int, int]]:
+    """Parse `-X importtime` lines of the form `import time: self | cumulative | module` (nesting kept as indent)."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        imports.append((fields[2][1:], int(fields[0]), int(fields[1])))
+    return imports
+
+
+if __name__ == "__main__":
+    sys.exit(main())
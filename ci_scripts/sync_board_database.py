@@ -7,7 +7,10 @@
 This utility performs the following actions:
 * Downloads the latest online target database
 * Saves the database to a local file in the mbed-tools repository
+* Saves a pre-indexed SQLite form of the database, used for fast lookups of single boards
 * Writes a news file detailing any added, removed or modified boards
+
+With `--index-only` only the pre-indexed form is regenerated, from the local file.
 """
 
 import argparse
@@ -22,11 +25,13 @@ from mbed_tools.lib.exceptions import ToolsError
 from mbed_tools.lib.logging import log_exception, set_log_level
 
 from mbed_tools.targets._internal.board_database import get_board_database_path
+from mbed_tools.targets._internal.board_snapshot_index import get_board_snapshot_index_path, write_board_snapshot_index
 from mbed_tools.targets.boards import Boards
 
 logger = logging.getLogger()
 
 BOARD_DATABASE_PATH = get_board_database_path()
+BOARD_DATABASE_INDEX_PATH = get_board_snapshot_index_path()
 
 
 @dataclass(frozen=True)
@@ -89,6 +94,11 @@ def parse_args() -> argparse.Namespace:
     """Parse the command line."""
     parser = argparse.ArgumentParser()
     parser.add_argument("--verbose", "-v", action="count", default=0)
+    parser.add_argument(
+        "--index-only",
+        action="store_true",
+        help="Only regenerate the pre-indexed form of the local board database, without downloading.",
+    )
     return parser.parse_args()
 
 
@@ -96,6 +106,10 @@ def main(args: argparse.Namespace) -> int:
     """Main entry point."""
     set_log_level(args.verbose)
     try:
+        if args.index_only:
+            write_board_snapshot_index(Boards.from_offline_database(), BOARD_DATABASE_PATH, BOARD_DATABASE_INDEX_PATH)
+            return 0
+
         online_boards = Boards.from_online_database()
         offline_boards = Boards.from_offline_database()
         result = compare_databases(offline_boards, online_boards)
@@ -106,6 +120,7 @@ def main(args: argparse.Namespace) -> int:
         news_file_text = create_news_file_text_from_result(result)
         create_news_file(news_file_text, NewsType.feature)
         save_board_database(online_boards.json_dump(), BOARD_DATABASE_PATH)
+        write_board_snapshot_index(online_boards, BOARD_DATABASE_PATH, BOARD_DATABASE_INDEX_PATH)
         return 0
     except ToolsError as tools_error:
         log_exception(logger, tools_error)
@@ -0,0 +1 @@
+Add a local cache of compiled Mbed OS objects which is used to seed new build trees. Use `compile --no-mbed-os-cache` to disable it.
@@ -0,0 +1 @@
+Add `compile --changed-since GIT_REF` to only build the executables, such as Greentea tests, affected by changes since a git reference.
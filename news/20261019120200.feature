@@ -0,0 +1 @@
+`compile --clean` no longer waits for the old build tree to be deleted before configuring the project.
@@ -0,0 +1 @@
+JSON files are decoded with orjson, simdjson or ujson when one of them is installed, which speeds up loading targets.json and the board database. Install `mbed-tools[fast-json]` to get orjson.
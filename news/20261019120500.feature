@@ -0,0 +1 @@
+Cache the resolved attributes of each target on disk, so configuring again for the same targets.json does not parse it.
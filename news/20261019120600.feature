@@ -0,0 +1 @@
+Add `get_all_targets` to resolve the attributes of every public target in targets.json at once, resolving each target's ancestors only once.
@@ -0,0 +1 @@
+Only decode the definitions of the requested target and its ancestors from targets.json when configuring, using an index of the file which is cached.
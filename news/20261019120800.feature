@@ -0,0 +1 @@
+Look boards up in the board database by product code, online id and J-Link slug using an index, loading each database at most once per process.
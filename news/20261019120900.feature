@@ -0,0 +1 @@
+Look boards up in a pre-indexed SQLite copy of the offline board database, reading only the matching record.
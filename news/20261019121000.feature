@@ -0,0 +1 @@
+Cache the online board database in the user cache directory, revalidating it with conditional requests once it is older than `MBED_DATABASE_CACHE_TTL` seconds, and download it at most once per process.
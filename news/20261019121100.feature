@@ -0,0 +1 @@
+Lookups of boards which are not in the board database are remembered, so detecting unknown devices no longer searches the online database every time.
@@ -0,0 +1 @@
+Add `mbed-tools targets query` and `mbed_tools.targets.query_targets` to find the targets with particular device_has, features, components, extra_labels, macros, core, supported_toolchains or c_lib values.
@@ -0,0 +1 @@
+Add shell completion of -m/--mbed-target to configure, compile and sterm, completing target names and the NAME[n] names of connected devices without loading the whole command line interface.
@@ -0,0 +1 @@
+Detecting devices on Linux lists the USB disks, serial ports and mounted file systems once, rather than once per connected device. A USB disk without a serial number is no longer paired with a serial port which also has no serial number.
@@ -0,0 +1 @@
+Connected devices are identified in parallel, and a device which takes more than 10 seconds to identify is reported as unidentified instead of stalling detection.
@@ -0,0 +1 @@
+Read only the known identification files from a device, and at most 16 KiB of each.
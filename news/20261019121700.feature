@@ -0,0 +1 @@
+Remember the boards identified for connected devices. A known device is identified by reading one small file, DETAILS.TXT, to check its interface version, instead of reading all of its files and looking up its board.
@@ -0,0 +1 @@
+Add `mbed-tools detect --watch`, which prints a line of JSON each time a device is connected, disconnected or changes (Linux only).
@@ -0,0 +1 @@
+Add `mbed-tools devices serve`, which keeps track of the connected devices and shares them with other mbed-tools commands over a Unix socket (Linux only).
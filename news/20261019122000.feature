@@ -0,0 +1 @@
+Add `--format ndjson` to `mbed-tools detect`, printing each device as soon as it is identified, and fix devices being numbered across different boards.
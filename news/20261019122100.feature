@@ -0,0 +1 @@
+Linux device detection reads sysfs directly when the udev daemon isn't running, e.g. in containers. Set `MBED_TOOLS_DEVICE_DETECTOR` to `udev` or `sysfs` to choose the detector.
@@ -0,0 +1 @@
+Add `wait_for_device` and `wait_for_removal` to `mbed_tools.devices`, which wait for a device to be ready or disconnected, scanning again only when devices change.
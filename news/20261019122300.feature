@@ -0,0 +1 @@
+Add `async_get_connected_devices` and `async_find_connected_device` to `mbed_tools.devices` for asyncio applications. They identify devices concurrently without blocking the event loop.
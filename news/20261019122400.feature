@@ -0,0 +1 @@
+`find_connected_device` with an identifier, e.g. `-m K64F[0]`, stops identifying devices once it has found the device. Add `find_connected_device_by_serial_number`, which stops as soon as the device with that serial number is identified.
@@ -50,6 +50,7 @@ setup(
         "Jinja2",
         "pyserial",
     ],
+    extras_require={"fast-json": ["orjson"]},
     license="Apache 2.0",
     long_description_content_type="text/markdown",
     long_description=long_description,
@@ -60,9 +61,9 @@ setup(
     url=f"https://github.com/ARMmbed/{PROJECT_SLUG}",
     entry_points={
         "console_scripts": [
-            "mbedtools=mbed_tools.cli.main:cli",
-            "mbed-tools=mbed_tools.cli.main:cli",
-            "mbed_tools=mbed_tools.cli.main:cli",
+            "mbedtools=mbed_tools.completion.entry_point:main",
+            "mbed-tools=mbed_tools.completion.entry_point:main",
+            "mbed_tools=mbed_tools.completion.entry_point:main",
         ]
     },
 )
@@ -0,0 +1,232 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Find the executables in a Ninja build tree which depend on files changed since a git reference.
+
+The dependency graph is read from Ninja itself:
+
+- `ninja -t targets all` lists every output and the rule which produces it. Executables are produced by CMake's
+  `*_EXECUTABLE_LINKER*` rules and every CMake target has a phony alias.
+- `ninja -t query` gives the direct inputs of a set of nodes, so the graph can be walked one level at a time with a
+  single Ninja invocation per level.
+- `ninja -t deps` gives the headers each object file was compiled against, as recorded in the deps log.
+
+An object which has no entry in the deps log has never been built, so its headers are unknown. Any executable
+containing such an object is treated as affected.
+"""
+import logging
+import os
+import pathlib
+import subprocess
+
+from typing import Dict, Iterable, List, Optional, Set
+
+import git
+
+from mbed_tools.build.exceptions import MbedBuildError
+
+logger = logging.getLogger(__name__)
+
+EXECUTABLE_LINKER_RULE = "_EXECUTABLE_LINKER"
+PHONY_RULE = "phony"
+
+
+def find_affected_targets(build_dir: pathlib.Path, source_dir: pathlib.Path, base_ref: str) -> List[str]:
+    """Find the CMake executable targets which depend on files changed since `base_ref`.
+
+    Args:
+        build_dir: Path to a configured CMake build tree using the Ninja generator.
+        source_dir: A path inside the git repository to diff.
+        base_ref: The git reference to diff the working tree against.
+
+    Returns:
+        Sorted list of CMake target names.
+
+    Raises:
+        MbedBuildError: The changes or the dependency graph could not be determined.
+    """
+    changed_files = get_changed_files(source_dir, base_ref)
+    if not changed_files:
+        return []
+
+    graph = NinjaGraph(build_dir)
+    affected = []
+    for target_name, executable in graph.get_executable_targets().items():
+        inputs = graph.get_transitive_inputs(executable)
+        if inputs is None or not changed_files.isdisjoint(inputs):
+            affected.append(target_name)
+
+    return sorted(affected)
+
+
+def get_changed_files(source_dir: pathlib.Path, base_ref: str) -> Set[str]:
+    """Return absolute paths of the files that differ between the working tree and `base_ref`, including new files."""
+    try:
+        repo = git.Repo(str(source_dir), search_parent_directories=True)
+        diff_output = repo.git.diff("--name-only", base_ref)
+        untracked = repo.untracked_files
+    except (git.exc.InvalidGitRepositoryError, git.exc.NoSuchPathError) as err:
+        raise MbedBuildError(f"'{source_dir}' is not in a git repository.") from err
+    except git.exc.GitCommandError as err:
+        raise MbedBuildError(f"Could not diff the working tree against '{base_ref}'. Error from VCS: {err}") from err
+
+    root = repo.working_tree_dir
+    return {_normalise(root, name) for name in [*diff_output.splitlines(), *untracked] if name}
+
+
+class NinjaGraph:
+    """Lazily queried view of the dependency graph of a Ninja build tree."""
+
+    def __init__(self, build_dir: pathlib.Path) -> None:
+        """Initialise with the path to the build tree."""
+        self._build_dir = str(build_dir)
+        self._inputs: Dict[str, List[str]] = {}
+        self._rules: Dict[str, Optional[str]] = {}
+        self._deps: Optional[Dict[str, List[str]]] = None
+
+    def get_executable_targets(self) -> Dict[str, str]:
+        """Return a mapping of CMake target name to the path of the executable it builds."""
+        outputs = _parse_targets(self._ninja("-t", "targets", "all"))
+        executables = {path for path, rule in outputs.items() if EXECUTABLE_LINKER_RULE in rule}
+        # CMake adds a phony alias, named after the target, for every executable.
+        aliases = [path for path, rule in outputs.items() if rule == PHONY_RULE and "/" not in path]
+        self._query(aliases)
+        return {
+            alias: self._inputs[alias][0]
+            for alias in aliases
+            if len(self._inputs.get(alias, [])) == 1 and self._inputs[alias][0] in executables
+        }
+
+    def get_transitive_inputs(self, output: str) -> Optional[Set[str]]:
+        """Return the absolute paths of every file `output` is built from, including headers.
+
+        Returns None if a compiled object in the graph has no entry in the deps log, meaning its headers are unknown.
+        """
+        deps = self._get_deps()
+        visited: Set[str] = set()
+        frontier = [output]
+        files: Set[str] = set()
+        while frontier:
+            self._query([node for node in frontier if node not in self._inputs])
+            next_frontier: List[str] = []
+            for node in frontier:
+                visited.add(node)
+                node_inputs = self._inputs.get(node, [])
+                if not node_inputs:
+                    files.add(_normalise(self._build_dir, node))
+                elif _is_compile_rule(self._rules.get(node)):
+                    if node not in deps:
+                        logger.debug("No dependency information recorded for '%s'", node)
+                        return None
+                    files.update(_normalise(self._build_dir, header) for header in deps[node])
+
+                next_frontier.extend(i for i in node_inputs if i not in visited)
+
+            frontier = list(set(next_frontier))
+
+        return files
+
+    def _query(self, nodes: Iterable[str]) -> None:
+        nodes = list(nodes)
+        if not nodes:
+            return
+
+        for node, (rule, inputs) in _parse_query(self._ninja("-t", "query", *nodes)).items():
+            self._rules[node] = rule
+            self._inputs[node] = inputs
+
+    def _get_deps(self) -> Dict[str, List[str]]:
+        if self._deps is None:
+            self._deps = _parse_deps(self._ninja("-t", "deps"))
+        return self._deps
+
+    def _ninja(self, *args: str) -> str:
+        try:
+            return subprocess.run(
+                ["ninja", "-C", self._build_dir, *args],
+                check=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                universal_newlines=True,
+            ).stdout
+        except FileNotFoundError:
+            raise MbedBuildError(
+                "Could not find the 'Ninja' build program. Please ensure 'Ninja' is installed and added to PATH."
+            )
+        except subprocess.CalledProcessError as err:
+            raise MbedBuildError(f"Failed to read the Ninja dependency graph: {err.stderr}")
+
+
+def _parse_targets(output: str) -> Dict[str, str]:
+    """Parse `ninja -t targets all` output, lines of the form `path: rule`."""
+    targets = {}
+    for line in output.splitlines():
+        path, sep, rule = line.rpartition(": ")
+        if sep:
+            targets[path] = rule.strip()
+    return targets
+
+
+def _parse_query(output: str) -> Dict[str, tuple]:
+    """Parse `ninja -t query` output into a mapping of node to (rule, explicit and implicit inputs).
+
+    The output for each node looks like this, order-only inputs are prefixed with `||` and implicit ones with `|`:
+
+        path/to/node:
+          input: RULE
+            explicit_input
+            | implicit_input
+            || order_only_input
+          outputs:
+            dependent
+    """
+    nodes: Dict[str, tuple] = {}
+    node = None
+    section = None
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        if not line.startswith(" "):
+            node = line.rstrip().rstrip(":")
+            nodes[node] = (None, [])
+            section = None
+        elif line.startswith("    ") and section == "input" and node is not None:
+            entry = line.strip()
+            if entry.startswith("||"):
+                continue
+            nodes[node][1].append(entry.lstrip("| "))
+        elif node is not None:
+            section, _, rule = line.strip().partition(":")
+            if section == "input":
+                nodes[node] = (rule.strip(), nodes[node][1])
+    return nodes
+
+
+def _parse_deps(output: str) -> Dict[str, List[str]]:
+    """Parse `ninja -t deps` output into a mapping of object to the headers recorded in the deps log.
+
+    Entries look like `path/to/obj.o: #deps 2, deps mtime 123 (VALID)` followed by indented dependency paths. Stale
+    entries are left out, as they don't reflect the current sources.
+    """
+    deps: Dict[str, List[str]] = {}
+    current: Optional[List[str]] = None
+    for line in output.splitlines():
+        if not line.strip():
+            current = None
+        elif not line.startswith(" "):
+            obj, _, status = line.partition(": #deps")
+            current = [] if "(VALID)" in status else None
+            if current is not None:
+                deps[obj] = current
+        elif current is not None:
+            current.append(line.strip())
+    return deps
+
+
+def _is_compile_rule(rule: Optional[str]) -> bool:
+    return rule is not None and "_COMPILER_" in rule
+
+
+def _normalise(root: Optional[str], path: str) -> str:
+    return os.path.normcase(os.path.normpath(os.path.join(root or "", path)))
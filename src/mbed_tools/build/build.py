@@ -4,16 +4,23 @@
 #
 """Configure and build a CMake project."""
 import logging
+import os
 import pathlib
+import shutil
 import subprocess
+import threading
+import uuid
 
-from typing import Optional
+from typing import List, Optional
 
+from mbed_tools.build._internal.affected_targets import find_affected_targets
 from mbed_tools.build.exceptions import MbedBuildError
 
 
 logger = logging.getLogger(__name__)
 
+TOMBSTONE_MARKER = ".deleted-"
+
 
 def build_project(build_dir: pathlib.Path, target: Optional[str] = None) -> None:
     """Build a project using CMake to invoke Ninja.
@@ -27,6 +34,38 @@ def build_project(build_dir: pathlib.Path, target: Optional[str] = None) -> None
     _cmake_wrapper("--build", str(build_dir), *target_flag)
 
 
+def build_affected_targets(build_dir: pathlib.Path, source_dir: pathlib.Path, base_ref: str) -> List[str]:
+    """Build only the executable targets which depend on files changed since a git reference.
+
+    Uses Ninja's dependency graph and deps log, together with `git diff` against `base_ref`, to find the executables
+    (e.g. Greentea test binaries) affected by a change. The affected targets are built in a single Ninja invocation.
+
+    If the build tree has never been built there is no dependency information, so every target is built.
+
+    Args:
+        build_dir: Path to the CMake build tree.
+        source_dir: A path inside the git repository containing the changes.
+        base_ref: The git reference to compare the working tree against, e.g. 'origin/master'.
+
+    Returns:
+        The affected CMake targets. This is empty if nothing was affected, or if every target had to be built.
+    """
+    _check_ninja_found()
+    if not (build_dir / ".ninja_deps").exists():
+        logger.info("No Ninja dependency information found in '%s', building all targets.", build_dir)
+        _cmake_wrapper("--build", str(build_dir))
+        return []
+
+    targets = find_affected_targets(build_dir, source_dir, base_ref)
+    if not targets:
+        logger.info("No targets are affected by changes since '%s'.", base_ref)
+        return []
+
+    logger.info("Building targets affected by changes since '%s': %s", base_ref, ", ".join(targets))
+    _cmake_wrapper("--build", str(build_dir), "--target", *targets)
+    return targets
+
+
 def generate_build_system(source_dir: pathlib.Path, build_dir: pathlib.Path, profile: str) -> None:
     """Configure a project using CMake.
 
@@ -39,6 +78,59 @@ def generate_build_system(source_dir: pathlib.Path, build_dir: pathlib.Path, pro
     _cmake_wrapper("-S", str(source_dir), "-B", str(build_dir), "-GNinja", f"-DCMAKE_BUILD_TYPE={profile}")
 
 
+def clean_build_tree(build_dir: pathlib.Path) -> Optional[threading.Thread]:
+    """Remove a CMake build tree without waiting for it to be deleted.
+
+    Deleting a large build tree can take a long time. Instead the tree is renamed to a "tombstone" next to it, which
+    is immediately free for a new build tree to be configured in, and the tombstone is deleted in a background thread.
+    Any tombstones left behind by interrupted runs are deleted at the same time.
+
+    Args:
+        build_dir: Path to the CMake build tree.
+
+    Returns:
+        The thread deleting the tombstones, or None if there was nothing to delete.
+    """
+    if build_dir.exists():
+        tombstone = build_dir.with_name(f".{build_dir.name}{TOMBSTONE_MARKER}{uuid.uuid4().hex}")
+        try:
+            os.replace(str(build_dir), str(tombstone))
+        except OSError as err:
+            logger.debug("Could not rename build tree '%s' (%s), deleting it in place.", build_dir, err)
+            shutil.rmtree(build_dir)
+
+    return remove_stale_build_trees(build_dir)
+
+
+def remove_stale_build_trees(build_dir: pathlib.Path) -> Optional[threading.Thread]:
+    """Delete the tombstones of previously cleaned build trees in a background thread.
+
+    Args:
+        build_dir: Path to the CMake build tree whose tombstones should be deleted.
+
+    Returns:
+        The thread deleting the tombstones, or None if there were no tombstones.
+    """
+    if not build_dir.parent.is_dir():
+        return None
+
+    tombstones = list(build_dir.parent.glob(f".{build_dir.name}{TOMBSTONE_MARKER}*"))
+    if not tombstones:
+        return None
+
+    # Not a daemon thread, the interpreter waits for the deletion to finish before exiting.
+    thread = threading.Thread(target=_remove_trees, args=(tombstones,), name="mbed-tools-clean")
+    thread.start()
+    return thread
+
+
+def _remove_trees(trees: List[pathlib.Path]) -> None:
+    for tree in trees:
+        logger.debug("Deleting old build tree '%s'", tree)
+        # Another process may be deleting the same tombstone, it doesn't matter which one finishes the job.
+        shutil.rmtree(tree, ignore_errors=True)
+
+
 def _cmake_wrapper(*cmake_args: str) -> None:
     try:
         logger.debug("Running CMake with args: %s", cmake_args)
@@ -5,11 +5,17 @@
 """Parses the Mbed configuration system and generates a CMake config script."""
 import pathlib
 
-from typing import Any, Tuple
+from collections import ChainMap
+from typing import Any, Dict, Mapping, MutableMapping, Tuple, cast
 
 from mbed_tools.lib.json_helpers import decode_json_file
 from mbed_tools.project import MbedProgram
 from mbed_tools.targets import get_target_by_name
+from mbed_tools.targets._internal.lazy_targets_json import LazyTargetsJson
+from mbed_tools.targets._internal.target_attributes_cache import (
+    TargetAttributesCache,
+    get_target_attributes_cache_key,
+)
 from mbed_tools.build._internal.cmake_file import render_mbed_config_cmake_template
 from mbed_tools.build._internal.config.assemble_build_config import Config, assemble_config
 from mbed_tools.build._internal.write_files import write_file
@@ -31,8 +37,7 @@ def generate_config(target_name: str, toolchain: str, program: MbedProgram) -> T
         Config object (UserDict).
         Path to the generated config file.
     """
-    targets_data = _load_raw_targets_data(program)
-    target_build_attributes = get_target_by_name(target_name, targets_data)
+    target_build_attributes = _get_target_build_attributes(target_name, program)
     config = assemble_config(
         target_build_attributes, [program.root, program.mbed_os.root], program.files.app_config_file
     )
@@ -46,8 +51,22 @@ def generate_config(target_name: str, toolchain: str, program: MbedProgram) -> T
     return config, cmake_config_file_path
 
 
-def _load_raw_targets_data(program: MbedProgram) -> Any:
-    targets_data = decode_json_file(program.mbed_os.targets_json_file)
+def _get_target_build_attributes(target_name: str, program: MbedProgram) -> Dict[str, Any]:
+    """Return the resolved attributes of a target, from the target attributes cache when possible."""
+    cache = TargetAttributesCache()
+    key = get_target_attributes_cache_key(program.mbed_os.targets_json_file, program.files.custom_targets_json)
+    target_build_attributes = cache.get(key, target_name)
+    if target_build_attributes is None:
+        targets_data = _load_raw_targets_data(program)
+        target_build_attributes = get_target_by_name(target_name, targets_data)
+        cache.store(key, target_name, target_build_attributes)
+
+    return target_build_attributes
+
+
+def _load_raw_targets_data(program: MbedProgram) -> Mapping[str, Any]:
+    # Only the definitions of the requested target and its ancestors are decoded from targets.json.
+    targets_data = LazyTargetsJson.from_file(program.mbed_os.targets_json_file)
     if program.files.custom_targets_json.exists():
         custom_targets_data = decode_json_file(program.files.custom_targets_json)
         for custom_target in custom_targets_data:
@@ -58,6 +77,7 @@ def _load_raw_targets_data(program: MbedProgram) -> Any:
                     "Please give your custom target a unique name so it can be identified."
                 )
 
-        targets_data.update(custom_targets_data)
+        # Overlay the custom targets rather than copying targets.json. ChainMap only ever writes to the first mapping.
+        return ChainMap(custom_targets_data, cast(MutableMapping[str, Any], targets_data))
 
     return targets_data
@@ -0,0 +1,200 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Reuse compiled Mbed OS objects between build trees.
+
+The Mbed OS object files in a build tree only depend on the target, toolchain, build profile, the resolved config and
+the Mbed OS sources. None of the application sources have any effect on them. This means a build tree configured with
+the same inputs as a previous build can be seeded with the previously compiled Mbed OS objects, so Ninja only needs
+to compile the application.
+
+The objects are stored in a local artifact store in the user cache directory, keyed by a hash of all the inputs. The
+Ninja build log and dependency log are stored alongside the objects, so Ninja can verify the seeded objects are up to
+date using its usual rules. Anything Ninja considers out of date is simply rebuilt.
+"""
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import shutil
+import tempfile
+
+from typing import Any, List, Optional, Tuple
+
+import git
+
+from mbed_tools.build._internal.config.config import Config
+from mbed_tools.lib.user_cache import get_user_cache_dir
+
+logger = logging.getLogger(__name__)
+
+MBED_OS_BUILD_SUBDIR = "mbed-os"
+NINJA_LOG_FILES = (".ninja_log", ".ninja_deps")
+DEFAULT_MAX_CACHE_SIZE = 4 * 1024**3
+CACHE_FORMAT_VERSION = "1"
+
+_SIZE_FILE_NAME = "size"
+
+
+def get_mbed_os_cache_key(config: Config, toolchain: str, profile: str, mbed_os_root: pathlib.Path) -> Optional[str]:
+    """Compute the key identifying the Mbed OS objects produced by a build.
+
+    The key is a hash of the resolved config, the toolchain, the build profile and the Mbed OS commit. Toolchain flags
+    are defined by the Mbed OS sources, so they are covered by the commit.
+
+    Args:
+        config: The resolved config for the build.
+        toolchain: The toolchain used for the build.
+        profile: The Mbed build profile (develop, debug or release).
+        mbed_os_root: The root of the Mbed OS source tree.
+
+    Returns:
+        The cache key, or None if the Mbed OS sources can't be identified (not a git repository, or one with local
+        modifications).
+    """
+    mbed_os_commit = _get_mbed_os_commit(mbed_os_root)
+    if mbed_os_commit is None:
+        return None
+
+    key_data = {
+        "version": CACHE_FORMAT_VERSION,
+        "config": _canonicalise(dict(config)),
+        "toolchain": toolchain.upper(),
+        "profile": profile.lower(),
+        "mbed_os_commit": mbed_os_commit,
+        "mbed_os_root": str(mbed_os_root.resolve()),
+    }
+    return hashlib.sha256(json.dumps(key_data, sort_keys=True).encode()).hexdigest()
+
+
+class MbedOsObjectCache:
+    """Size bounded store of Mbed OS object files, evicting the least recently used entries."""
+
+    def __init__(self, cache_dir: Optional[pathlib.Path] = None, max_size: int = DEFAULT_MAX_CACHE_SIZE) -> None:
+        """Initialise the cache.
+
+        Args:
+            cache_dir: Directory to store the cached objects in. Defaults to a directory in the user cache dir.
+            max_size: Maximum size of the store in bytes.
+        """
+        self._cache_dir = cache_dir if cache_dir is not None else get_user_cache_dir("mbed-os-objects")
+        self._max_size = max_size
+
+    def seed(self, key: str, build_tree: pathlib.Path) -> bool:
+        """Copy the cached Mbed OS objects for `key` into a build tree.
+
+        Args:
+            key: The cache key, see `get_mbed_os_cache_key`.
+            build_tree: Path to the CMake build tree to seed.
+
+        Returns:
+            True if the build tree was seeded, False if there was no matching entry.
+        """
+        entry = self._cache_dir / key
+        if not entry.is_dir():
+            logger.debug("No cached Mbed OS objects found for key %s", key)
+            return False
+
+        if (build_tree / MBED_OS_BUILD_SUBDIR).exists():
+            logger.debug("Build tree '%s' already contains Mbed OS build outputs, not seeding it.", build_tree)
+            return False
+
+        logger.info("Seeding build tree '%s' with cached Mbed OS objects.", build_tree)
+        build_tree.mkdir(parents=True, exist_ok=True)
+        shutil.copytree(str(entry / MBED_OS_BUILD_SUBDIR), str(build_tree / MBED_OS_BUILD_SUBDIR))
+        for log_file in NINJA_LOG_FILES:
+            if (entry / log_file).exists():
+                shutil.copy2(str(entry / log_file), str(build_tree / log_file))
+
+        # Mark the entry as recently used.
+        os.utime(str(entry / _SIZE_FILE_NAME))
+        return True
+
+    def store(self, key: str, build_tree: pathlib.Path) -> None:
+        """Store the Mbed OS objects from a build tree under `key`, evicting old entries if the store is full.
+
+        Args:
+            key: The cache key, see `get_mbed_os_cache_key`.
+            build_tree: Path to a CMake build tree which has been successfully built.
+        """
+        entry = self._cache_dir / key
+        mbed_os_build_dir = build_tree / MBED_OS_BUILD_SUBDIR
+        if entry.exists() or not mbed_os_build_dir.is_dir():
+            return
+
+        # Populate a temporary directory and rename it into place, so concurrent builds never see a partial entry.
+        staging_dir = pathlib.Path(tempfile.mkdtemp(prefix=f".{key}.", dir=str(self._cache_dir)))
+        try:
+            shutil.copytree(str(mbed_os_build_dir), str(staging_dir / MBED_OS_BUILD_SUBDIR))
+            for log_file in NINJA_LOG_FILES:
+                if (build_tree / log_file).exists():
+                    shutil.copy2(str(build_tree / log_file), str(staging_dir / log_file))
+            (staging_dir / _SIZE_FILE_NAME).write_text(str(_get_tree_size(staging_dir)))
+            staging_dir.rename(entry)
+        except OSError as err:
+            logger.debug("Failed to store Mbed OS objects in the cache: %s", err)
+            shutil.rmtree(str(staging_dir), ignore_errors=True)
+            return
+
+        logger.info("Stored Mbed OS objects in the cache.")
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = self._get_entries_by_last_use()
+        total_size = sum(size for _, _, size in entries)
+        for entry, _, size in entries:
+            if total_size <= self._max_size:
+                break
+
+            logger.debug("Evicting cached Mbed OS objects '%s'", entry.name)
+            shutil.rmtree(str(entry), ignore_errors=True)
+            total_size -= size
+
+    def _get_entries_by_last_use(self) -> List[Tuple[pathlib.Path, float, int]]:
+        entries = []
+        for entry in self._cache_dir.iterdir():
+            size_file = entry / _SIZE_FILE_NAME
+            if entry.name.startswith(".") or not size_file.is_file():
+                continue
+
+            try:
+                entries.append((entry, size_file.stat().st_mtime, int(size_file.read_text())))
+            except (OSError, ValueError):
+                continue
+
+        return sorted(entries, key=lambda e: e[1])
+
+
+def _get_mbed_os_commit(mbed_os_root: pathlib.Path) -> Optional[str]:
+    try:
+        repo = git.Repo(str(mbed_os_root))
+        if repo.is_dirty():
+            logger.info("Mbed OS has local modifications, the Mbed OS object cache will not be used.")
+            return None
+
+        return str(repo.head.commit.hexsha)
+    except (git.exc.InvalidGitRepositoryError, git.exc.NoSuchPathError, git.exc.GitCommandError, ValueError):
+        logger.debug("Could not determine the Mbed OS commit, the Mbed OS object cache will not be used.")
+        return None
+
+
+def _get_tree_size(root: pathlib.Path) -> int:
+    return sum(path.stat().st_size for path in root.rglob("*") if path.is_file())
+
+
+def _canonicalise(value: Any) -> Any:
+    """Convert a config value to a form which serialises to the same JSON in every process."""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return _canonicalise(dataclasses.asdict(value))
+    if isinstance(value, dict):
+        return {str(k): _canonicalise(v) for k, v in value.items()}
+    if isinstance(value, (set, frozenset)):
+        return sorted((_canonicalise(v) for v in value), key=repr)
+    if isinstance(value, (list, tuple)):
+        return [_canonicalise(v) for v in value]
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return repr(value)
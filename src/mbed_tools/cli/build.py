@@ -5,13 +5,22 @@
 """Command to build/compile an Mbed project using CMake."""
 import os
 import pathlib
-import shutil
 
 from typing import Optional, Tuple
 
 import click
 
-from mbed_tools.build import build_project, generate_build_system, generate_config, flash_binary
+from mbed_tools.build import (
+    build_affected_targets,
+    build_project,
+    clean_build_tree,
+    generate_build_system,
+    generate_config,
+    flash_binary,
+    remove_stale_build_trees,
+)
+from mbed_tools.build.mbed_os_cache import MbedOsObjectCache, get_mbed_os_cache_key
+from mbed_tools.completion.click_options import mbed_target_completion
 from mbed_tools.devices import find_connected_device, find_all_connected_devices
 from mbed_tools.project import MbedProgram
 from mbed_tools.sterm import terminal
@@ -25,7 +34,13 @@ from mbed_tools.sterm import terminal
     required=True,
     help="The toolchain you are using to build your app.",
 )
-@click.option("-m", "--mbed-target", required=True, help="A build target for an Mbed-enabled device, e.g. K64F.")
+@click.option(
+    "-m",
+    "--mbed-target",
+    required=True,
+    help="A build target for an Mbed-enabled device, e.g. K64F.",
+    **mbed_target_completion(targets=True, devices=True),
+)
 @click.option("-b", "--profile", default="develop", help="The build type (release, develop or debug).")
 @click.option("-c", "--clean", is_flag=True, default=False, help="Perform a clean build.")
 @click.option(
@@ -55,6 +70,18 @@ from mbed_tools.sterm import terminal
     show_default=True,
     help="Change the serial baud rate (ignored unless --sterm is also given).",
 )
+@click.option(
+    "--no-mbed-os-cache",
+    is_flag=True,
+    default=False,
+    help="Don't seed a new build tree with cached Mbed OS objects, or store them after the build.",
+)
+@click.option(
+    "--changed-since",
+    default=None,
+    metavar="GIT_REF",
+    help="Only build executables (e.g. Greentea tests) which depend on files changed since the given git reference.",
+)
 def build(
     program_path: str,
     profile: str,
@@ -67,6 +94,8 @@ def build(
     mbed_os_path: str,
     custom_targets_json: str,
     app_config: str,
+    no_mbed_os_cache: bool,
+    changed_since: str,
 ) -> None:
     """Configure and build an Mbed project using CMake and Ninja.
 
@@ -85,7 +114,12 @@ def build(
        flash: Flash the binary onto a device.
        sterm: Open a serial terminal to the connected target.
        baudrate: Change the serial baud rate (ignored unless --sterm is also given).
+       no_mbed_os_cache: Don't use the Mbed OS object cache.
+       changed_since: Only build executables affected by changes since this git reference.
     """
+    if changed_since is not None and (flash or sterm):
+        raise click.ClickException("--changed-since cannot be used with --flash or --sterm.")
+
     mbed_target, target_id = _get_target_id(mbed_target)
 
     cmake_build_subdir = pathlib.Path(mbed_target.upper(), profile.lower(), toolchain.upper())
@@ -94,19 +128,35 @@ def build(
     else:
         program = MbedProgram.from_existing(pathlib.Path(program_path), cmake_build_subdir, pathlib.Path(mbed_os_path))
     build_tree = program.files.cmake_build_dir
-    if clean and build_tree.exists():
-        shutil.rmtree(build_tree)
+    if clean:
+        clean_build_tree(build_tree)
+    else:
+        remove_stale_build_trees(build_tree)
 
     click.echo("Configuring project and generating build system...")
     if custom_targets_json is not None:
         program.files.custom_targets_json = pathlib.Path(custom_targets_json)
     if app_config is not None:
         program.files.app_config_file = pathlib.Path(app_config)
+    is_new_build_tree = not (build_tree / ".ninja_log").exists()
     config, _ = generate_config(mbed_target.upper(), toolchain, program)
+
+    mbed_os_cache_key = None
+    if is_new_build_tree and not no_mbed_os_cache:
+        mbed_os_cache = MbedOsObjectCache()
+        mbed_os_cache_key = get_mbed_os_cache_key(config, toolchain, profile, program.mbed_os.root)
+        if mbed_os_cache_key is not None and mbed_os_cache.seed(mbed_os_cache_key, build_tree):
+            click.echo("Reusing cached Mbed OS objects.")
+
     generate_build_system(program.root, build_tree, profile)
 
     click.echo("Building Mbed project...")
-    build_project(build_tree)
+    if changed_since is not None:
+        build_affected_targets(build_tree, program.root, changed_since)
+    else:
+        build_project(build_tree)
+    if mbed_os_cache_key is not None:
+        mbed_os_cache.store(mbed_os_cache_key, build_tree)
 
     if flash or sterm:
         if target_id is not None or sterm:
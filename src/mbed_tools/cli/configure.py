@@ -9,6 +9,7 @@ import click
 
 from mbed_tools.project import MbedProgram
 from mbed_tools.build import generate_config
+from mbed_tools.completion.click_options import mbed_target_completion
 
 
 @click.command(
@@ -24,7 +25,13 @@ from mbed_tools.build import generate_config
     required=True,
     help="The toolchain you are using to build your app.",
 )
-@click.option("-m", "--mbed-target", required=True, help="A build target for an Mbed-enabled device, eg. K64F")
+@click.option(
+    "-m",
+    "--mbed-target",
+    required=True,
+    help="A build target for an Mbed-enabled device, eg. K64F",
+    **mbed_target_completion(targets=True),
+)
 @click.option("-b", "--profile", default="develop", help="The build type (release, develop or debug).")
 @click.option("-o", "--output-dir", type=click.Path(), default=None, help="Path to output directory.")
 @click.option(
@@ -0,0 +1,25 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Commands to manage the connected devices."""
+import click
+
+from mbed_tools.devices import serve_connected_devices
+
+
+@click.group()
+def devices() -> None:
+    """Manage the connected devices."""
+
+
+@devices.command(
+    help="Keep track of the connected devices and share them with other mbed-tools commands until interrupted, so "
+    "they don't each scan for the devices. Only supported on Linux."
+)
+def serve() -> None:
+    """Serves the connected devices to other mbed-tools commands."""
+    try:
+        serve_connected_devices()
+    except KeyboardInterrupt:
+        pass
@@ -5,17 +5,24 @@
 """Command to list all Mbed enabled devices connected to the host computer."""
 import click
 import json
+from collections import Counter
+from datetime import datetime, timezone
 from operator import attrgetter
-from typing import Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from tabulate import tabulate
 
-from mbed_tools.devices import get_connected_devices, Device
+from mbed_tools.devices import get_connected_devices, iter_connected_devices, watch_connected_devices, Device
 from mbed_tools.targets import Board
 
 
 @click.command()
 @click.option(
-    "--format", type=click.Choice(["table", "json"]), default="table", show_default=True, help="Set output format."
+    "--format",
+    type=click.Choice(["table", "json", "ndjson"]),
+    default="table",
+    show_default=True,
+    help="Set output format. ndjson prints a line of JSON for each device as soon as it is identified, in order of "
+    "serial number.",
 )
 @click.option(
     "--show-all",
@@ -24,8 +31,26 @@ from mbed_tools.targets import Board
     default=False,
     help="Show all connected devices, even those which are not Mbed Boards.",
 )
-def list_connected_devices(format: str, show_all: bool) -> None:
+@click.option(
+    "--watch",
+    is_flag=True,
+    default=False,
+    help="Keep running, printing a line of JSON each time a device is connected, disconnected or changes. The "
+    "devices already connected are printed first. Only supported on Linux.",
+)
+def list_connected_devices(format: str, show_all: bool, watch: bool) -> None:
     """Prints connected devices."""
+    if watch:
+        _watch_devices(show_all)
+        return
+
+    if format == "ndjson":
+        for line in _stream_ndjson_output(
+            device for device in iter_connected_devices() if show_all or device.mbed_enabled
+        ):
+            click.echo(line)
+        return
+
     connected_devices = get_connected_devices()
 
     if show_all:
@@ -50,17 +75,21 @@ def _sort_devices(devices: Iterable[Device]) -> Iterable[Device]:
 
 
 def _get_devices_ids(devices: Iterable[Device]) -> List[Tuple[Optional[int], Device]]:
-    """Create tuple of ID and Device for each Device. ID is None when only one Device exists with a given board name."""
+    """Create tuple of ID and Device for each Device. ID is None when only one Device exists with a given board name.
+
+    Devices with the same board name are numbered in the order they are given.
+    """
+    devices = list(devices)
+    board_name_counts = Counter(device.mbed_board.board_name for device in devices)
+    next_ids: Dict[str, int] = Counter()
     devices_ids: List[Tuple[Optional[int], Device]] = []
-    n = 0
     for device in devices:
         board_name = device.mbed_board.board_name
-        if len([dev for dev in devices if dev.mbed_board.board_name == board_name]) > 1:
-            devices_ids.append((n, device))
-            n += 1
+        if board_name_counts[board_name] > 1:
+            devices_ids.append((next_ids[board_name], device))
+            next_ids[board_name] += 1
         else:
             devices_ids.append((None, device))
-            n = 0
     return devices_ids
 
 
@@ -82,28 +111,85 @@ def _build_tabular_output(devices: Iterable[Device]) -> str:
 
 
 def _build_json_output(devices: Iterable[Device]) -> str:
-    devices_data = []
-    for id, device in _get_devices_ids(devices):
-        board = device.mbed_board
-        devices_data.append(
-            {
-                "serial_number": device.serial_number,
-                "serial_port": device.serial_port,
-                "mount_points": [str(m) for m in device.mount_points],
-                "interface_version": device.interface_version,
-                "mbed_board": {
-                    "product_code": board.product_code,
-                    "board_type": board.board_type,
-                    "board_name": board.board_name,
-                    "mbed_os_support": board.mbed_os_support,
-                    "mbed_enabled": board.mbed_enabled,
-                    "build_targets": _get_build_targets(board, id),
-                },
-            }
-        )
+    devices_data = [_get_device_data(device, id) for id, device in _get_devices_ids(devices)]
     return json.dumps(devices_data, indent=4)
 
 
+def _stream_ndjson_output(devices: Iterable[Device]) -> Iterator[str]:
+    """Yield a line of JSON for each device as soon as its ID is known, giving the same IDs as `_get_devices_ids`.
+
+    The devices must be in order of serial number. The ID of a device is then the number of devices with the same board
+    name before it, except that a device whose board name turns out to be unique has no ID. So the first device with
+    each board name is held back until either another device with that name turns up or there are no more devices.
+    """
+    board_name_counts: Dict[str, int] = Counter()
+    first_devices: Dict[str, Device] = {}
+    for device in devices:
+        board_name = device.mbed_board.board_name
+        count = board_name_counts[board_name]
+        board_name_counts[board_name] += 1
+        if count == 0:
+            first_devices[board_name] = device
+            continue
+        if count == 1:
+            yield json.dumps(_get_device_data(first_devices.pop(board_name), 0))
+        yield json.dumps(_get_device_data(device, count))
+
+    for device in first_devices.values():
+        yield json.dumps(_get_device_data(device, None))
+
+
+def _get_device_data(device: Device, identifier: Optional[int]) -> dict:
+    board = device.mbed_board
+    return {
+        "serial_number": device.serial_number,
+        "serial_port": device.serial_port,
+        "mount_points": [str(m) for m in device.mount_points],
+        "interface_version": device.interface_version,
+        "mbed_board": {
+            "product_code": board.product_code,
+            "board_type": board.board_type,
+            "board_name": board.board_name,
+            "mbed_os_support": board.mbed_os_support,
+            "mbed_enabled": board.mbed_enabled,
+            "build_targets": _get_build_targets(board, identifier),
+        },
+    }
+
+
+def _watch_devices(show_all: bool) -> None:
+    """Print a line of JSON for each device event until interrupted.
+
+    Unless all devices are shown, a device is reported as added when it is identified as an Mbed Board and as removed
+    when it is disconnected or no longer identified.
+    """
+    reported: Dict[str, Device] = {}
+    try:
+        for event in watch_connected_devices():
+            serial_number = event.device.serial_number
+            if event.action != "remove" and (show_all or event.device.mbed_enabled):
+                action = "change" if serial_number in reported else "add"
+                reported[serial_number] = event.device
+                click.echo(_build_event_output(action, event.timestamp, event.device, reported.values()))
+            elif serial_number in reported:
+                devices = list(reported.values())
+                click.echo(_build_event_output("remove", event.timestamp, reported.pop(serial_number), devices))
+    except KeyboardInterrupt:
+        pass
+
+
+def _build_event_output(action: str, timestamp: float, device: Device, devices: Iterable[Device]) -> str:
+    """Build a line of JSON describing an event, numbering the device among the devices reported with it."""
+    identifier = next(id for id, reported in _get_devices_ids(_sort_devices(devices)) if reported == device)
+    return json.dumps(
+        {
+            "event": action,
+            "timestamp": datetime.fromtimestamp(timestamp, timezone.utc).isoformat(),
+            "device": _get_device_data(device, identifier),
+        }
+    )
+
+
 def _get_build_targets(board: Board, identifier: Optional[int]) -> List[str]:
     if identifier is not None:
         return [f"{board.board_type}_{variant}[{identifier}]" for variant in board.build_variant] + [
@@ -8,6 +8,7 @@ from typing import Any, Optional
 import click
 
 from mbed_tools.cli.build import _get_target_id
+from mbed_tools.completion.click_options import mbed_target_completion
 from mbed_tools.devices import find_connected_device, get_connected_devices
 from mbed_tools.devices.exceptions import MbedDevicesError
 from mbed_tools.sterm import terminal
@@ -31,7 +32,13 @@ from mbed_tools.sterm import terminal
     type=click.Choice(["on", "off"], case_sensitive=False),
     help="Switch local echo on/off.",
 )
-@click.option("-m", "--mbed-target", type=str, help="Mbed target to detect. Example: K64F, NUCLEO_F401RE, NRF51822...")
+@click.option(
+    "-m",
+    "--mbed-target",
+    type=str,
+    help="Mbed target to detect. Example: K64F, NUCLEO_F401RE, NRF51822...",
+    **mbed_target_completion(targets=False, devices=True),
+)
 def sterm(port: str, baudrate: int, echo: str, mbed_target: str) -> None:
     """Launches a serial terminal to a connected device."""
     if port is None:
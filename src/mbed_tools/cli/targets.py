@@ -0,0 +1,64 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Commands to inspect the targets defined in Mbed OS."""
+import json
+import pathlib
+
+from typing import Tuple
+
+import click
+
+from mbed_tools.project import MbedProgram
+from mbed_tools.targets import query_targets
+from mbed_tools.targets.query_targets import QUERYABLE_ATTRIBUTES
+
+
+@click.group()
+def targets() -> None:
+    """Inspect the targets defined in Mbed OS."""
+
+
+@targets.command(
+    help="List the public targets whose attributes match every term of a query. Each term has the form "
+    "'attribute=value', where attribute is one of: "
+    + ", ".join(QUERYABLE_ATTRIBUTES)
+    + ". Separate several values with '|' to match any of them, use '*' and '?' as wildcards and prefix a term with "
+    "'!' to negate it. For example: device_has=CAN features=BLE 'core=Cortex-M33*'."
+)
+@click.argument("query", nargs=-1)
+@click.option(
+    "--format", type=click.Choice(["list", "json"]), default="list", show_default=True, help="Set output format."
+)
+@click.option(
+    "-p",
+    "--program-path",
+    type=click.Path(),
+    default=".",
+    help="Path to local Mbed program. By default is the current working directory.",
+)
+@click.option(
+    "--mbed-os-path", type=click.Path(), default=None, help="Path to local Mbed OS directory.",
+)
+def query(query: Tuple[str, ...], format: str, program_path: str, mbed_os_path: str) -> None:
+    """Prints the names of the targets matching a query.
+
+    Args:
+        query: the terms of the query.
+        format: the output format (list or json).
+        program_path: the path to the local Mbed program
+        mbed_os_path: the path to the local Mbed OS directory
+    """
+    if mbed_os_path is None:
+        program = MbedProgram.from_existing(pathlib.Path(program_path), pathlib.Path())
+    else:
+        program = MbedProgram.from_existing(pathlib.Path(program_path), pathlib.Path(), pathlib.Path(mbed_os_path))
+
+    target_names = query_targets(query, program.mbed_os.targets_json_file)
+    if format == "json":
+        click.echo(json.dumps(target_names, indent=4))
+    elif target_names:
+        click.echo("\n".join(target_names))
+    else:
+        click.echo("No targets match the query.")
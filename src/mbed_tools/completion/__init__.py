@@ -0,0 +1,20 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Shell completion of the values of command line options.
+
+The shell runs mbed-tools every time Tab is pressed, so completions have to be found without doing the work the
+commands themselves do:
+
+* Target names are read from a list of the public targets in targets.json, which is cached under the hash of the file.
+* The `NAME[n]` names of connected devices are cached for a few seconds after they are detected.
+
+The console scripts start in `mbed_tools.completion.entry_point`, which answers completions of `-m/--mbed-target`
+before the command line interface, and everything it imports, is loaded.
+"""
+from mbed_tools.completion.mbed_target import (
+    get_connected_device_names,
+    get_mbed_target_completions,
+    get_public_target_names,
+)
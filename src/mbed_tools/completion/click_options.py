@@ -0,0 +1,46 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Hooks for click to complete the values of command line options.
+
+These are used when click handles completion itself, e.g. when the command line interface has already been loaded or
+with versions of click whose completion protocol `mbed_tools.completion.entry_point` doesn't answer.
+"""
+from typing import Any, Callable, Dict, List
+
+import click
+
+from mbed_tools.completion.mbed_target import get_mbed_target_completions
+
+
+def mbed_target_completion(targets: bool = True, devices: bool = False) -> Dict[str, Any]:
+    """Return the keyword arguments of `click.option` completing `-m/--mbed-target`.
+
+    The program, Mbed OS and custom_targets.json paths are taken from the command's other options, when it has them.
+
+    Args:
+        targets: Complete the names of the public targets of the program.
+        devices: Complete the `NAME[n]` names of the connected devices.
+    """
+
+    def complete(context: click.Context, incomplete: str) -> List[str]:
+        return get_mbed_target_completions(
+            incomplete,
+            targets=targets,
+            devices=devices,
+            program_path=context.params.get("program_path"),
+            mbed_os_path=context.params.get("mbed_os_path"),
+            custom_targets_json=context.params.get("custom_targets_json"),
+        )
+
+    return _completion_keyword_arguments(complete)
+
+
+def _completion_keyword_arguments(complete: Callable[[click.Context, str], List[str]]) -> Dict[str, Any]:
+    try:
+        import click.shell_completion  # noqa: F401
+    except ImportError:
+        # Click 7 calls `autocompletion` with the arguments typed so far rather than the parameter.
+        return {"autocompletion": lambda context, args, incomplete: complete(context, incomplete)}
+    return {"shell_complete": lambda context, param, incomplete: complete(context, incomplete)}
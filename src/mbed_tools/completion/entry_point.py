@@ -0,0 +1,99 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Entry point of the console scripts.
+
+Shell completion runs the console script with the words typed so far in the environment. Loading the command line
+interface imports most of mbed-tools and its dependencies, which takes far longer than a completion should, so
+completions of `-m/--mbed-target` are answered here first, using click's completion protocol. Everything else is
+left to the command line interface.
+"""
+import os
+import sys
+
+from typing import List, Optional
+
+from mbed_tools.completion.mbed_target import get_mbed_target_completions
+
+# Commands whose `-m/--mbed-target` option is completed, with whether to complete target names and device names.
+MBED_TARGET_COMMANDS = {
+    "configure": (True, False),
+    "compile": (True, True),
+    "sterm": (False, True),
+}
+MBED_TARGET_OPTIONS = ("-m", "--mbed-target")
+# Options of the commands above which take a value, and the keyword argument the value is used for.
+_PATH_OPTIONS = {
+    "-p": "program_path",
+    "--program-path": "program_path",
+    "--mbed-os-path": "mbed_os_path",
+    "--custom-targets-json": "custom_targets_json",
+}
+
+
+def main() -> None:
+    """Run mbed-tools, answering completions of `-m/--mbed-target` without loading the command line interface."""
+    if not complete_mbed_target():
+        from mbed_tools.cli.main import cli
+
+        cli()
+
+
+def complete_mbed_target() -> bool:
+    """Answer a shell completion request for the value of `-m/--mbed-target`, if that is what the environment holds.
+
+    Returns:
+        True if the completions were written to stdout, False if the command line interface should handle the request.
+    """
+    prog_name = os.path.basename(sys.argv[0])
+    instruction = os.environ.get(f"_{prog_name}_COMPLETE".replace("-", "_").upper(), "")
+    shell, _, action = instruction.partition("_")
+    if action != "complete":
+        return False
+
+    try:
+        from click.shell_completion import CompletionItem, get_completion_class
+    except ImportError:
+        return False
+
+    completion_class = get_completion_class(shell)
+    if completion_class is None:
+        return False
+
+    completion = completion_class(None, {}, prog_name, "")
+    args, incomplete = completion.get_completion_args()
+    completions = get_completions(args, incomplete)
+    if completions is None:
+        return False
+
+    for name in completions:
+        print(completion.format_completion(CompletionItem(name)))
+    return True
+
+
+def get_completions(args: List[str], incomplete: str) -> Optional[List[str]]:
+    """Return the completions of `incomplete`, or None if it is not the value of a `-m/--mbed-target` option.
+
+    Args:
+        args: The arguments typed before the one being completed, not including the program name.
+        incomplete: The part of the argument being completed typed so far.
+    """
+    command_index = next((index for index, arg in enumerate(args) if not arg.startswith("-")), None)
+    if command_index is None or not args or args[-1] not in MBED_TARGET_OPTIONS:
+        return None
+
+    command = args[command_index]
+    if command not in MBED_TARGET_COMMANDS:
+        return None
+
+    # sterm's -p is the serial port, so paths are only read from the commands building a program.
+    paths = {}
+    if command != "sterm":
+        command_args = args[command_index + 1 :]
+        for option, value in zip(command_args, command_args[1:]):
+            if option in _PATH_OPTIONS:
+                paths[_PATH_OPTIONS[option]] = value
+
+    targets, devices = MBED_TARGET_COMMANDS[command]
+    return get_mbed_target_completions(incomplete, targets=targets, devices=devices, **paths)
@@ -0,0 +1,219 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Completion of the values of the `-m/--mbed-target` option.
+
+Nothing slow to import is imported here, as this module is loaded on every completion request.
+"""
+import hashlib
+import json
+import logging
+import pathlib
+import time
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from mbed_tools.lib.json_helpers import decode_json
+from mbed_tools.lib.user_cache import get_user_cache_dir, write_cache_file
+
+logger = logging.getLogger(__name__)
+
+TARGET_NAMES_CACHE_SUBDIR = "target-names"
+# Number of targets.json files (e.g. Mbed OS versions) lists of names are kept for.
+MAX_CACHED_TARGET_NAMES = 8
+DEVICE_NAMES_CACHE_SUBDIR = "connected-devices"
+DEVICE_NAMES_CACHE_FILENAME = "names.json"
+# Number of seconds the names of the connected devices are used for before they are detected again.
+DEVICE_NAMES_CACHE_TTL = 10
+
+# These mirror the layout of a program expected by `mbed_tools.project.MbedProgram`, which is too slow to import here.
+_MBED_OS_REFERENCE_FILE_NAME = "mbed-os.lib"
+_MBED_OS_DIR_NAME = "mbed-os"
+_TARGETS_JSON_FILE_PATH = pathlib.Path("targets", "targets.json")
+_CUSTOM_TARGETS_JSON_FILE_NAME = "custom_targets.json"
+
+
+def get_mbed_target_completions(
+    incomplete: str,
+    targets: bool = True,
+    devices: bool = False,
+    program_path: Optional[str] = None,
+    mbed_os_path: Optional[str] = None,
+    custom_targets_json: Optional[str] = None,
+) -> List[str]:
+    """Return the values of `-m/--mbed-target` starting with `incomplete`, compared case insensitively.
+
+    Args:
+        incomplete: The part of the value typed so far.
+        targets: Complete the names of the public targets of the program.
+        devices: Complete the `NAME[n]` names of the connected devices.
+        program_path: Path to the program, defaults to the current working directory.
+        mbed_os_path: Path to Mbed OS, defaults to the Mbed OS directory in the program.
+        custom_targets_json: Path to custom_targets.json, defaults to the one in the program.
+    """
+    names: List[str] = []
+    if targets:
+        targets_files = _find_targets_files(program_path, mbed_os_path, custom_targets_json)
+        if targets_files is not None:
+            names.extend(get_public_target_names(*targets_files))
+    if devices:
+        names.extend(name for name in get_connected_device_names() if name not in names)
+
+    prefix = incomplete.upper()
+    return [name for name in names if name.upper().startswith(prefix)]
+
+
+def get_public_target_names(
+    targets_json_file: pathlib.Path,
+    custom_targets_json_file: Optional[pathlib.Path] = None,
+    cache_dir: Optional[pathlib.Path] = None,
+) -> List[str]:
+    """Return the names of the public targets, from a list cached under the hash of targets.json when possible.
+
+    Returns no names if the files can't be read.
+
+    Args:
+        targets_json_file: Path to Mbed OS's targets.json.
+        custom_targets_json_file: Path to the program's custom_targets.json, if any. A missing file is allowed.
+        cache_dir: Directory to cache lists of names in, defaults to a directory in the user's cache directory.
+    """
+    try:
+        document = targets_json_file.read_bytes()
+    except OSError as err:
+        logger.debug("Unable to read targets.json for completion: %s", err)
+        return []
+
+    cache_dir = cache_dir if cache_dir is not None else get_user_cache_dir(TARGET_NAMES_CACHE_SUBDIR)
+    names_file = cache_dir / f"{hashlib.sha256(document).hexdigest()}.json"
+    names = _read_names(names_file)
+    if names is None:
+        try:
+            names = _get_public_names(decode_json(document))
+        except (ValueError, AttributeError) as err:
+            logger.debug("Unable to decode targets.json for completion: %s", err)
+            return []
+        _write_target_names(names_file, names)
+
+    if custom_targets_json_file is not None and custom_targets_json_file.exists():
+        try:
+            names.extend(_get_public_names(decode_json(custom_targets_json_file.read_bytes())))
+        except (OSError, ValueError, AttributeError) as err:
+            logger.debug("Unable to read custom_targets.json for completion: %s", err)
+
+    return names
+
+
+def get_connected_device_names(cache_file: Optional[pathlib.Path] = None) -> List[str]:
+    """Return the names of the connected Mbed devices, in the `NAME` or `NAME[n]` form the commands accept.
+
+    The names are detected again when the cached ones are more than `DEVICE_NAMES_CACHE_TTL` seconds old.
+
+    Args:
+        cache_file: File to cache the names in, defaults to a file in the user's cache directory.
+    """
+    if cache_file is None:
+        cache_file = get_user_cache_dir(DEVICE_NAMES_CACHE_SUBDIR) / DEVICE_NAMES_CACHE_FILENAME
+
+    try:
+        cached = json.loads(cache_file.read_text())
+        if 0 <= time.time() - cached["stored_at"] < DEVICE_NAMES_CACHE_TTL:
+            return [str(name) for name in cached["names"]]
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, TypeError, KeyError) as err:
+        logger.debug("Ignoring unreadable connected device names %s: %s", cache_file, err)
+
+    names = _detect_device_names()
+    try:
+        write_cache_file(cache_file, json.dumps({"stored_at": time.time(), "names": names}))
+    except OSError as err:
+        logger.debug("Failed to cache connected device names %s: %s", cache_file, err)
+    return names
+
+
+def get_device_names(board_types: Iterable[Tuple[str, str]]) -> List[str]:
+    """Return the names of devices given as (board type, serial number) pairs.
+
+    A device is named after its board type. Where several devices have the same board type each is given an `[n]`
+    identifier, numbering them in order of serial number as `mbed_tools.devices.find_connected_device` does.
+    """
+    serial_numbers: Dict[str, List[str]] = {}
+    for board_type, serial_number in board_types:
+        serial_numbers.setdefault(board_type, []).append(serial_number)
+
+    names = []
+    for board_type, serials in sorted(serial_numbers.items()):
+        if len(serials) == 1:
+            names.append(board_type)
+        else:
+            names.extend(f"{board_type}[{identifier}]" for identifier in range(len(serials)))
+    return names
+
+
+def _detect_device_names() -> List[str]:
+    # Deferred, the devices package is slow to import and is only needed when the cached names have expired.
+    from mbed_tools.devices import get_connected_devices
+
+    try:
+        connected = get_connected_devices()
+    except Exception as err:
+        # Completion must never fail, whatever goes wrong while detecting devices.
+        logger.debug("Unable to detect connected devices for completion: %s", err)
+        return []
+
+    return get_device_names(
+        (device.mbed_board.board_type, device.serial_number) for device in connected.identified_devices
+    )
+
+
+def _find_targets_files(
+    program_path: Optional[str], mbed_os_path: Optional[str], custom_targets_json: Optional[str]
+) -> Optional[Tuple[pathlib.Path, pathlib.Path]]:
+    """Find targets.json and custom_targets.json the way `MbedProgram.from_existing` does."""
+    if mbed_os_path is None:
+        program_root = _find_program_root(pathlib.Path(program_path or "."))
+        if program_root is None:
+            return None
+        mbed_os = program_root / _MBED_OS_DIR_NAME
+    else:
+        program_root = pathlib.Path(program_path or ".")
+        mbed_os = pathlib.Path(mbed_os_path)
+
+    if custom_targets_json is None:
+        return mbed_os / _TARGETS_JSON_FILE_PATH, program_root / _CUSTOM_TARGETS_JSON_FILE_NAME
+    return mbed_os / _TARGETS_JSON_FILE_PATH, pathlib.Path(custom_targets_json)
+
+
+def _find_program_root(path: pathlib.Path) -> Optional[pathlib.Path]:
+    potential_root = path.absolute().resolve()
+    while str(potential_root) != str(potential_root.anchor):
+        if (potential_root / _MBED_OS_REFERENCE_FILE_NAME).is_file():
+            return potential_root
+        potential_root = potential_root.parent
+    return None
+
+
+def _get_public_names(targets_data: Dict[str, Any]) -> List[str]:
+    # "public" is not inherited, a target is public unless its own definition says otherwise.
+    return [name for name, definition in targets_data.items() if definition.get("public", True)]
+
+
+def _read_names(names_file: pathlib.Path) -> Optional[List[str]]:
+    try:
+        return [str(name) for name in json.loads(names_file.read_text())]
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, TypeError) as err:
+        logger.debug("Ignoring unreadable target names %s: %s", names_file, err)
+        return None
+
+
+def _write_target_names(names_file: pathlib.Path, names: List[str]) -> None:
+    try:
+        write_cache_file(names_file, json.dumps(names))
+        cached = sorted(names_file.parent.glob("*.json"), key=lambda path: path.stat().st_mtime)
+        for old_names in cached[:-MAX_CACHED_TARGET_NAMES]:
+            old_names.unlink()
+    except OSError as err:
+        logger.debug("Failed to cache target names %s: %s", names_file, err)
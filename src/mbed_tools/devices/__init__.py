@@ -12,8 +12,16 @@ For the command line interface to the API see the package https://github.com/ARM
 """
 from mbed_tools.devices.devices import (
     get_connected_devices,
+    async_get_connected_devices,
+    iter_connected_devices,
     find_connected_device,
+    async_find_connected_device,
+    find_connected_device_by_serial_number,
     find_all_connected_devices,
+    watch_connected_devices,
+    serve_connected_devices,
+    wait_for_device,
+    wait_for_removal,
 )
-from mbed_tools.devices.device import Device
+from mbed_tools.devices.device import Device, DeviceEvent
 from mbed_tools.devices import exceptions
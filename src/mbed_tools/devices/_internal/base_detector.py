@@ -2,12 +2,16 @@
 # Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
 # SPDX-License-Identifier: Apache-2.0
 #
-"""Interface for device detectors."""
+"""Interfaces for device detectors and monitors."""
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional
 
 from mbed_tools.devices._internal.candidate_device import CandidateDevice
 
+# Maximum number of seconds to wait for a DeviceMonitor before scanning the devices again anyway, in case an event is
+# missed, e.g. because the udev daemon isn't running to pass on events for the serial ports.
+RESCAN_INTERVAL = 5.0
+
 
 class DeviceDetector(ABC):
     """Object in charge of finding USB devices."""
@@ -16,3 +20,21 @@ class DeviceDetector(ABC):
     def find_candidates(self) -> List[CandidateDevice]:
         """Returns CandidateDevices."""
         pass
+
+
+class DeviceMonitor(ABC):
+    """Object in charge of noticing USB devices being connected, disconnected or changing."""
+
+    @abstractmethod
+    def wait_for_change(self, timeout: Optional[float] = None) -> bool:
+        """Wait until USB devices may have changed, returning False if nothing changed before the timeout.
+
+        Args:
+            timeout: Maximum number of seconds to wait, waits indefinitely when None.
+        """
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        """Stop monitoring and release the resources used."""
+        pass
@@ -0,0 +1,219 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Build Devices from candidate devices in parallel, with a time limit for each device.
+
+Building a Device reads files from the device's USB mass storage, which can be slow, or hang altogether when the
+file system is half mounted. Candidates are shared between a bounded number of worker threads, and each one is given
+a time limit from when a worker starts building it. A device which takes longer than that is reported as unidentified
+with the reason, and the worker stuck on it is replaced so the remaining candidates are still built.
+
+Workers are daemon threads, so a worker stuck reading from a device doesn't stop the process from exiting.
+
+`async_build_devices` does the same for asyncio applications, building each device in a daemon thread so the event
+loop is never blocked.
+"""
+import asyncio
+import logging
+import queue
+import threading
+import time
+
+from typing import Any, Callable, Iterable, Iterator, List, Optional, TypeVar, cast
+
+from mbed_tools.devices._internal.candidate_device import CandidateDevice
+from mbed_tools.devices.device import Device
+
+logger = logging.getLogger(__name__)
+
+# Number of seconds a device is given to be built before it is reported as unidentified.
+DEVICE_TIMEOUT = 10.0
+# Maximum number of devices built at the same time.
+MAX_WORKERS = 8
+
+T = TypeVar("T")
+
+
+def build_devices(
+    candidates: Iterable[CandidateDevice], timeout: Optional[float] = None, max_workers: int = MAX_WORKERS
+) -> List[Device]:
+    """Build a Device from each candidate, returning them in the same order as the candidates.
+
+    Args:
+        candidates: The candidate devices.
+        timeout: Number of seconds each device is given to be built, defaults to `DEVICE_TIMEOUT`.
+        max_workers: Maximum number of devices built at the same time.
+
+    Raises:
+        DeviceLookupFailed: The board of a device could not be looked up. When several devices fail the error of
+            the first is raised.
+    """
+    return list(iter_built_devices(candidates, timeout, max_workers))
+
+
+def iter_built_devices(
+    candidates: Iterable[CandidateDevice], timeout: Optional[float] = None, max_workers: int = MAX_WORKERS
+) -> Iterator[Device]:
+    """Build a Device from each candidate, yielding each in the same order as the candidates as soon as it is built.
+
+    Candidates which haven't started being built when the generator is closed are never built.
+
+    Args:
+        candidates: The candidate devices.
+        timeout: Number of seconds each device is given to be built, defaults to `DEVICE_TIMEOUT`.
+        max_workers: Maximum number of devices built at the same time.
+
+    Raises:
+        DeviceLookupFailed: The board of a device could not be looked up.
+    """
+    timeout = timeout if timeout is not None else DEVICE_TIMEOUT
+    jobs = [_Job(candidate) for candidate in candidates]
+    pending: "queue.Queue[_Job]" = queue.Queue()
+    for job in jobs:
+        pending.put(job)
+    for _ in range(min(max_workers, len(jobs))):
+        _start_worker(pending)
+
+    try:
+        for job in jobs:
+            # Jobs are started in order, so every earlier job has finished or had its worker replaced, and a worker is
+            # free to start this one.
+            job.started.wait()
+            if job.finished.wait(max(job.started_at + timeout - time.monotonic(), 0)):
+                if job.error is not None:
+                    raise job.error
+                yield cast(Device, job.device)
+            else:
+                _start_worker(pending)
+                yield _timed_out(job.candidate, timeout)
+    finally:
+        # Stop the workers starting any more jobs.
+        _clear(pending)
+
+
+async def async_build_devices(
+    candidates: Iterable[CandidateDevice], timeout: Optional[float] = None, max_workers: int = MAX_WORKERS
+) -> List[Device]:
+    """Build a Device from each candidate, returning them in the same order as the candidates.
+
+    When cancelled, candidates which haven't started being built are never built, and the devices being built are
+    discarded once their threads finish.
+
+    Args:
+        candidates: The candidate devices.
+        timeout: Number of seconds each device is given to be built, defaults to `DEVICE_TIMEOUT`.
+        max_workers: Maximum number of devices built at the same time.
+
+    Raises:
+        DeviceLookupFailed: The board of a device could not be looked up. When several devices fail the error of
+            the first is raised.
+    """
+    device_timeout = timeout if timeout is not None else DEVICE_TIMEOUT
+    workers = asyncio.Semaphore(max_workers)
+
+    async def build(candidate: CandidateDevice) -> Device:
+        async with workers:
+            try:
+                return await asyncio.wait_for(run_in_thread(Device.from_candidate, candidate), device_timeout)
+            except asyncio.TimeoutError:
+                return _timed_out(candidate, device_timeout)
+
+    # Cancelling the gather cancels every build at once, so no queued candidate starts as a running one stops.
+    devices = []
+    for outcome in await asyncio.gather(*[build(candidate) for candidate in candidates], return_exceptions=True):
+        if isinstance(outcome, BaseException):
+            raise outcome
+        devices.append(outcome)
+    return devices
+
+
+def run_in_thread(func: Callable[..., T], *args: Any) -> "asyncio.Future[T]":
+    """Call a blocking function in a daemon thread, returning a future for its result.
+
+    Unlike the event loop's default executor, a thread stuck in the call doesn't stop the process from exiting.
+    Cancelling the future doesn't stop the call, its result is discarded.
+    """
+    loop = asyncio.get_event_loop()
+    future = loop.create_future()
+
+    def work() -> None:
+        try:
+            result = func(*args)
+        except Exception as err:
+            _call_soon_threadsafe(loop, _set_exception, future, err)
+        else:
+            _call_soon_threadsafe(loop, _set_result, future, result)
+
+    threading.Thread(target=work, name="mbed-tools-device", daemon=True).start()
+    return future
+
+
+def _timed_out(candidate: CandidateDevice, timeout: float) -> Device:
+    logger.warning(
+        f"Timed out after {timeout:g}s identifying the device with serial number {candidate.serial_number} mounted at "
+        f"{', '.join(str(mount_point) for mount_point in candidate.mount_points)}."
+    )
+    return Device.from_unidentified_candidate(
+        candidate, f"Timed out after {timeout:g}s reading the device's files and looking up its board.",
+    )
+
+
+def _call_soon_threadsafe(loop: asyncio.AbstractEventLoop, callback: Callable[..., None], *args: Any) -> None:
+    try:
+        loop.call_soon_threadsafe(callback, *args)
+    except RuntimeError:
+        # The loop was closed while the call was running, so nothing is waiting for the outcome.
+        pass
+
+
+def _set_result(future: "asyncio.Future[T]", result: T) -> None:
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_exception(future: "asyncio.Future[Any]", err: Exception) -> None:
+    if not future.done():
+        future.set_exception(err)
+
+
+class _Job:
+    """A candidate to build a Device from, and the outcome once it has been built."""
+
+    def __init__(self, candidate: CandidateDevice) -> None:
+        self.candidate = candidate
+        self.started = threading.Event()
+        self.started_at = 0.0
+        self.finished = threading.Event()
+        self.device: Optional[Device] = None
+        self.error: Optional[Exception] = None
+
+
+def _start_worker(pending: "queue.Queue[_Job]") -> None:
+    threading.Thread(target=_work, args=(pending,), name="mbed-tools-device", daemon=True).start()
+
+
+def _work(pending: "queue.Queue[_Job]") -> None:
+    while True:
+        try:
+            job = pending.get_nowait()
+        except queue.Empty:
+            return
+
+        job.started_at = time.monotonic()
+        job.started.set()
+        try:
+            job.device = Device.from_candidate(job.candidate)
+        except Exception as err:
+            # Raised again in the thread which asked for the devices.
+            job.error = err
+        finally:
+            job.finished.set()
+
+
+def _clear(pending: "queue.Queue[_Job]") -> None:
+    while True:
+        try:
+            pending.get_nowait()
+        except queue.Empty:
+            return
@@ -2,14 +2,29 @@
 # Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
 # SPDX-License-Identifier: Apache-2.0
 #
-"""Detect Mbed devices connected to host computer."""
+"""Detect Mbed devices connected to host computer.
+
+On Linux devices are detected through udev when the udev daemon is running, and by reading sysfs directly otherwise.
+Either can be chosen by setting the environment variable `MBED_TOOLS_DEVICE_DETECTOR` to `udev` or `sysfs`.
+"""
+import logging
+import os
 import platform
+from pathlib import Path
 from typing import Iterable
 
 from mbed_tools.devices._internal.candidate_device import CandidateDevice
-from mbed_tools.devices._internal.base_detector import DeviceDetector
+from mbed_tools.devices._internal.base_detector import DeviceDetector, DeviceMonitor
 from mbed_tools.devices.exceptions import UnknownOSError
 
+logger = logging.getLogger(__name__)
+
+DEVICE_DETECTOR_ENV_VAR = "MBED_TOOLS_DEVICE_DETECTOR"
+UDEV_DETECTOR = "udev"
+SYSFS_DETECTOR = "sysfs"
+# Created by the udev daemon while it is running.
+UDEV_CONTROL_SOCKET = Path("/run/udev/control")
+
 
 def detect_candidate_devices() -> Iterable[CandidateDevice]:
     """Returns Candidates connected to host computer."""
@@ -17,6 +32,23 @@ def detect_candidate_devices() -> Iterable[CandidateDevice]:
     return detector.find_candidates()
 
 
+def get_device_monitor() -> DeviceMonitor:
+    """Returns a DeviceMonitor for the current operating system.
+
+    Raises:
+        UnknownOSError: Monitoring devices is not implemented for the current operating system.
+    """
+    if platform.system() == "Linux":
+        from mbed_tools.devices._internal.linux.device_monitor import LinuxDeviceMonitor
+
+        return LinuxDeviceMonitor()
+
+    raise UnknownOSError(
+        f"We have detected the OS you are running is '{platform.system()}'. "
+        "Unfortunately watching for devices being connected and disconnected is only supported on Linux. Sorry!"
+    )
+
+
 def _get_detector_for_current_os() -> DeviceDetector:
     """Returns DeviceDetector for current operating system."""
     if platform.system() == "Windows":
@@ -24,9 +56,7 @@ def _get_detector_for_current_os() -> DeviceDetector:
 
         return WindowsDeviceDetector()
     if platform.system() == "Linux":
-        from mbed_tools.devices._internal.linux.device_detector import LinuxDeviceDetector
-
-        return LinuxDeviceDetector()
+        return _get_linux_detector()
     if platform.system() == "Darwin":
         from mbed_tools.devices._internal.darwin.device_detector import DarwinDeviceDetector
 
@@ -36,3 +66,20 @@ def _get_detector_for_current_os() -> DeviceDetector:
         f"We have detected the OS you are running is '{platform.system()}'. "
         "Unfortunately we haven't implemented device detection support for this OS yet. Sorry!"
     )
+
+
+def _get_linux_detector() -> DeviceDetector:
+    """Returns the DeviceDetector requested by the environment, or the udev one if the udev daemon is running."""
+    requested = os.getenv(DEVICE_DETECTOR_ENV_VAR, "").strip().lower()
+    if requested not in ("", UDEV_DETECTOR, SYSFS_DETECTOR):
+        logger.warning(f"Unknown device detector '{requested}' requested, it will be ignored.")
+        requested = ""
+
+    if requested == UDEV_DETECTOR or (not requested and UDEV_CONTROL_SOCKET.exists()):
+        from mbed_tools.devices._internal.linux.device_detector import LinuxDeviceDetector
+
+        return LinuxDeviceDetector()
+
+    from mbed_tools.devices._internal.linux.sysfs_device_detector import SysfsDeviceDetector
+
+    return SysfsDeviceDetector()
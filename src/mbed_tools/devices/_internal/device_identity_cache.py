@@ -0,0 +1,115 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Persistent cache of the boards identified for connected devices.
+
+Identifying a device reads files from its USB mass storage and looks its board up in the board database, even though
+the same boards usually stay connected for a long time. The board and interface version identified for each device
+are recorded in the user's cache directory, keyed by the device's serial number.
+
+Each entry is recorded along with the identity of the device: its USB vendor and product IDs, and the modification
+time and size of its identification files. These are looked up without opening any file on the device. Updating the
+interface firmware usually rewrites the identification files, which changes the identity, so the device is identified
+again. However the virtual file systems of some interface firmware give their files fixed timestamps, and DETAILS.TXT
+can keep the same size across versions, so a matching identity is not enough to trust an entry: the caller also checks
+the interface version recorded against the one read from DETAILS.TXT, see `Device.from_candidate`.
+
+The cache is a single JSON file which is replaced atomically, so concurrent processes never read it partially
+written. Devices are identified in parallel threads, so recording a device holds a lock while the file is read and
+replaced, and no entry recorded by another thread is lost. When several processes record devices at the same time
+some entries may be lost, which only means those devices are identified again.
+"""
+import hashlib
+import json
+import logging
+import pathlib
+import threading
+import time
+
+from dataclasses import asdict
+from typing import Any, Dict, NamedTuple, Optional
+
+from mbed_tools.lib.user_cache import get_user_cache_dir, write_cache_file
+from mbed_tools.targets import Board
+from mbed_tools.devices._internal.candidate_device import CandidateDevice
+from mbed_tools.devices._internal.file_parser import get_identification_file_stats
+
+logger = logging.getLogger(__name__)
+
+CACHE_SUBDIR = "device-identities"
+CACHE_FILENAME = "identities.json"
+# Number of devices recorded, the least recently recorded are dropped first.
+MAX_CACHED_DEVICES = 256
+
+# Serialises the read, update and replacement of the cache file by the threads of this process.
+_write_lock = threading.Lock()
+
+
+class CachedIdentity(NamedTuple):
+    """What was identified for a device."""
+
+    board: Board
+    interface_version: Optional[str]
+
+
+def get_device_identity(candidate: CandidateDevice) -> Optional[str]:
+    """Return a string identifying a device and its interface firmware, None if it has no identification files.
+
+    Args:
+        candidate: The device to identify.
+    """
+    stats = get_identification_file_stats(candidate.mount_points)
+    if not stats:
+        return None
+    return hashlib.sha256(json.dumps([candidate.vendor_id, candidate.product_id, stats]).encode()).hexdigest()
+
+
+class DeviceIdentityCache:
+    """On disk record of the boards identified for connected devices."""
+
+    def __init__(self, cache_file: Optional[pathlib.Path] = None) -> None:
+        """Initialise the cache.
+
+        Args:
+            cache_file: File to record devices in, defaults to a file in the user's cache directory.
+        """
+        self._cache_file = cache_file if cache_file is not None else get_user_cache_dir(CACHE_SUBDIR) / CACHE_FILENAME
+
+    def get(self, serial_number: str, identity: str) -> Optional[CachedIdentity]:
+        """Return what was identified for a device, None if it wasn't recorded with the same identity."""
+        entry = self._load().get(serial_number)
+        if entry is None or entry.get("identity") != identity:
+            return None
+        try:
+            return CachedIdentity(Board.from_offline_board_entry(entry["board"]), entry["interface_version"])
+        except (TypeError, KeyError, AttributeError) as err:
+            logger.debug("Ignoring unreadable device identity of %s: %s", serial_number, err)
+            return None
+
+    def add(self, serial_number: str, identity: str, board: Board, interface_version: Optional[str]) -> None:
+        """Record what was identified for a device. Failing to write to the cache is not an error."""
+        with _write_lock:
+            entries = self._load()
+            entries.pop(serial_number, None)
+            entries[serial_number] = {
+                "identity": identity,
+                "board": asdict(board),
+                "interface_version": interface_version,
+                "recorded_at": time.time(),
+            }
+            newest = dict(list(entries.items())[-MAX_CACHED_DEVICES:])
+            try:
+                write_cache_file(self._cache_file, json.dumps(newest))
+            except OSError as err:
+                logger.debug("Failed to record device identity in %s: %s", self._cache_file, err)
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            contents = json.loads(self._cache_file.read_text())
+            return {str(serial_number): dict(entry) for serial_number, entry in contents.items()}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, TypeError, AttributeError) as err:
+            logger.debug("Ignoring unreadable device identities %s: %s", self._cache_file, err)
+            return {}
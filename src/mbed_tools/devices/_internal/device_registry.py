@@ -0,0 +1,55 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Live record of the connected devices, kept up to date from successive scans of the candidate devices."""
+import time
+
+from typing import Dict, Iterable, List
+
+from mbed_tools.devices._internal.build_devices import build_devices
+from mbed_tools.devices._internal.candidate_device import CandidateDevice
+from mbed_tools.devices.device import Device, DeviceEvent
+
+
+class DeviceRegistry:
+    """The connected devices, by serial number.
+
+    Scanning for candidates is cheap compared to building a Device from each, which reads the device's files, so a
+    Device is only built for candidates which are new or have changed since the previous scan.
+    """
+
+    def __init__(self) -> None:
+        """Initialise an empty registry."""
+        self._candidates: Dict[str, CandidateDevice] = {}
+        self._devices: Dict[str, Device] = {}
+
+    @property
+    def devices(self) -> List[Device]:
+        """The connected devices, in the order they were first found."""
+        return list(self._devices.values())
+
+    def update(self, candidates: Iterable[CandidateDevice]) -> List[DeviceEvent]:
+        """Update the registry from the result of a scan, returning what changed since the previous one.
+
+        Args:
+            candidates: All of the candidate devices found by the scan.
+
+        Raises:
+            DeviceLookupFailed: The board of a new or changed device could not be looked up.
+        """
+        timestamp = time.time()
+        current = {candidate.serial_number: candidate for candidate in candidates}
+        events = []
+        for serial_number in [serial_number for serial_number in self._candidates if serial_number not in current]:
+            del self._candidates[serial_number]
+            events.append(DeviceEvent("remove", self._devices.pop(serial_number), timestamp))
+
+        changed = [candidate for serial, candidate in current.items() if candidate != self._candidates.get(serial)]
+        for candidate, device in zip(changed, build_devices(changed)):
+            action = "change" if candidate.serial_number in self._candidates else "add"
+            self._candidates[candidate.serial_number] = candidate
+            self._devices[candidate.serial_number] = device
+            events.append(DeviceEvent(action, device, timestamp))
+
+        return events
@@ -0,0 +1,119 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Server which shares the connected devices between mbed-tools processes.
+
+Many processes scanning for devices at the same time all contend for the USB bus. Instead the server keeps a registry
+of the connected devices, scanning again when the operating system reports a device changing, or after
+`RESCAN_INTERVAL` seconds in case a change was missed, and answers requests from
+`mbed_tools.devices._internal.device_server_client` from memory.
+"""
+import json
+import logging
+import pathlib
+import socketserver
+import threading
+
+from typing import Any, Dict, List, Optional, cast
+
+from mbed_tools.lib.exceptions import ToolsError
+from mbed_tools.devices._internal.base_detector import RESCAN_INTERVAL
+from mbed_tools.devices._internal.detect_candidate_devices import detect_candidate_devices, get_device_monitor
+from mbed_tools.devices._internal.device_registry import DeviceRegistry
+from mbed_tools.devices._internal.device_server_client import (
+    DEVICES_REQUEST,
+    get_socket_path,
+    is_server_running,
+    serialise_device,
+)
+from mbed_tools.devices.device import Device
+from mbed_tools.devices.exceptions import DeviceServerError
+
+logger = logging.getLogger(__name__)
+
+
+class DeviceServer:
+    """Keeps the connected devices up to date and answers requests for them over a Unix socket."""
+
+    def __init__(self, socket_path: Optional[pathlib.Path] = None) -> None:
+        """Initialise the server.
+
+        Args:
+            socket_path: Path of the socket to listen on, defaults to the one clients look for.
+        """
+        self.socket_path = socket_path if socket_path is not None else get_socket_path()
+        self.scanned = threading.Event()
+        self.devices: List[Device] = []
+        self.error: Optional[str] = None
+
+    def serve_forever(self) -> None:
+        """Serve requests until interrupted.
+
+        Raises:
+            UnknownOSError: Monitoring devices is not supported on the current operating system.
+            DeviceServerError: Another server is already listening on the socket.
+        """
+        monitor = get_device_monitor()
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            if is_server_running(self.socket_path):
+                raise DeviceServerError(f"A devices server is already running on {self.socket_path}.")
+            # Left behind by a server which didn't exit cleanly.
+            self.socket_path.unlink()
+
+        server = _UnixStreamServer(str(self.socket_path), _DevicesRequestHandler)
+        server.device_server = self
+        threading.Thread(target=server.serve_forever, name="mbed-tools-devices-server", daemon=True).start()
+        logger.info(f"Serving the connected devices on {self.socket_path}")
+        try:
+            registry = DeviceRegistry()
+            while True:
+                self._scan(registry)
+                monitor.wait_for_change(RESCAN_INTERVAL)
+        finally:
+            server.shutdown()
+            server.server_close()
+            monitor.close()
+            self.socket_path.unlink()
+
+    def _scan(self, registry: DeviceRegistry) -> None:
+        try:
+            for event in registry.update(detect_candidate_devices()):
+                logger.info(f"Device {event.device.serial_number}: {event.action}")
+            self.devices = registry.devices
+            self.error = None
+        except ToolsError as err:
+            # Clients scan for the devices themselves, and report the error, until a scan succeeds.
+            logger.warning(f"Failed to scan the connected devices: {err}")
+            self.error = str(err)
+        self.scanned.set()
+
+
+class _UnixStreamServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+    device_server: DeviceServer
+
+
+class _DevicesRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        device_server = cast(_UnixStreamServer, self.server).device_server
+        line = self.rfile.readline()
+        if not line:
+            # A client checking whether the server is running.
+            return
+        try:
+            request = json.loads(line)
+        except ValueError:
+            request = None
+
+        response: Dict[str, Any]
+        if request != DEVICES_REQUEST:
+            response = {"error": f"Unsupported request {request!r}."}
+        else:
+            device_server.scanned.wait()
+            if device_server.error is not None:
+                response = {"error": device_server.error}
+            else:
+                response = {"devices": [serialise_device(device) for device in device_server.devices]}
+        self.wfile.write(json.dumps(response).encode() + b"\n")
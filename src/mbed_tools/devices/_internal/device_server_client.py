@@ -0,0 +1,108 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Client of the server which shares the connected devices between mbed-tools processes.
+
+The server listens on a Unix socket in the user's cache directory. A client sends a single line of JSON asking for the
+devices, and the server replies with a single line of JSON and closes the connection. When no server is running, or it
+doesn't answer, the client returns None so the caller can scan for the devices itself.
+"""
+import json
+import logging
+import pathlib
+import socket
+
+from dataclasses import asdict
+from functools import partial
+from typing import Any, Dict, List, Optional
+
+from mbed_tools.lib.user_cache import get_user_cache_dir
+from mbed_tools.targets import Board
+from mbed_tools.devices.device import Device
+
+logger = logging.getLogger(__name__)
+
+SOCKET_SUBDIR = "devices-server"
+SOCKET_FILENAME = "devices.sock"
+# Number of seconds a client waits for an answer, long enough for a server which has just started to scan the devices.
+CLIENT_TIMEOUT = 30.0
+DEVICES_REQUEST = {"request": "devices"}
+
+
+def get_socket_path() -> pathlib.Path:
+    """Return the path of the socket the server listens on.
+
+    The directory isn't created, as clients only look for the socket; the server creates it when it starts.
+    """
+    return get_user_cache_dir(SOCKET_SUBDIR, create=False) / SOCKET_FILENAME
+
+
+def get_devices_from_server(
+    socket_path: Optional[pathlib.Path] = None, timeout: float = CLIENT_TIMEOUT
+) -> Optional[List[Device]]:
+    """Return the connected devices known to the server, None if no server answered.
+
+    Args:
+        socket_path: Path of the server's socket, defaults to `get_socket_path()`.
+        timeout: Number of seconds to wait for the server to answer.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    socket_path = socket_path if socket_path is not None else get_socket_path()
+    if not socket_path.exists():
+        return None
+
+    try:
+        response = json.loads(_send_request(socket_path, DEVICES_REQUEST, timeout))
+        if "error" in response:
+            logger.debug(f"The devices server could not scan the devices: {response['error']}")
+            return None
+        return [deserialise_device(device) for device in response["devices"]]
+    except (OSError, ValueError, TypeError, KeyError, AttributeError) as err:
+        logger.debug(f"No answer from the devices server on {socket_path}: {err}")
+        return None
+
+
+def is_server_running(socket_path: pathlib.Path) -> bool:
+    """Check whether a server is accepting connections on a socket."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(str(socket_path))
+        return True
+    except OSError:
+        return False
+
+
+def serialise_device(device: Device) -> Dict[str, Any]:
+    """Convert a Device to a JSON serialisable dictionary."""
+    return {
+        "mbed_board": asdict(device.mbed_board),
+        "serial_number": device.serial_number,
+        "serial_port": device.serial_port,
+        "mount_points": [str(mount_point) for mount_point in device.mount_points],
+        "mbed_enabled": device.mbed_enabled,
+        "interface_version": device.interface_version,
+        "unidentified_reason": device.unidentified_reason,
+    }
+
+
+def deserialise_device(serialised: Dict[str, Any]) -> Device:
+    """Convert a dictionary made by `serialise_device` back to a Device."""
+    return Device(
+        mbed_board=Board.from_offline_board_entry(serialised["mbed_board"]),
+        serial_number=serialised["serial_number"],
+        serial_port=serialised["serial_port"],
+        mount_points=tuple(pathlib.Path(mount_point) for mount_point in serialised["mount_points"]),
+        mbed_enabled=serialised["mbed_enabled"],
+        interface_version=serialised["interface_version"],
+        unidentified_reason=serialised["unidentified_reason"],
+    )
+
+
+def _send_request(socket_path: pathlib.Path, request: Dict[str, Any], timeout: float) -> bytes:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(str(socket_path))
+        client.sendall(json.dumps(request).encode() + b"\n")
+        return b"".join(iter(partial(client.recv, 65536), b""))
@@ -94,11 +94,21 @@ import pathlib
 import re
 
 from dataclasses import dataclass
-from typing import Optional, NamedTuple, Iterable, List
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
 
 logger = logging.getLogger(__name__)
 
+DETAILS_TXT_FILE_NAME = "details.txt"
+MBED_HTM_FILE_NAME = "mbed.htm"
+BOARD_HTML_FILE_NAME = "board.html"
+SEGGER_HTML_FILE_NAME = "segger.html"
+# The files which identify a device, by lower case name.
+IDENTIFICATION_FILE_NAMES = (DETAILS_TXT_FILE_NAME, MBED_HTM_FILE_NAME, BOARD_HTML_FILE_NAME, SEGGER_HTML_FILE_NAME)
+# Maximum number of bytes read from each identification file. The files are a few hundred bytes long, the limit stops
+# an unexpectedly large or corrupt file from being read in full from the device.
+MAX_IDENTIFICATION_FILE_SIZE = 16 * 1024
+
 
 class OnlineId(NamedTuple):
     """Used to identify the target against the os.mbed.com website.
@@ -114,11 +124,19 @@ class OnlineId(NamedTuple):
 
 @dataclass
 class DeviceFileInfo:
-    """Information gathered from Mbed device files."""
+    """Information gathered from Mbed device files.
+
+    Attributes:
+        product_code: The product code of the board, if found.
+        online_id: The online ID of the board, if found.
+        interface_details: The details of the interface firmware, e.g. its "Version".
+        bytes_read: The number of bytes read from the device's files to gather the information.
+    """
 
     product_code: Optional[str]
     online_id: Optional[OnlineId]
     interface_details: dict
+    bytes_read: int = 0
 
 
 def read_device_files(directory_paths: Iterable[pathlib.Path]) -> DeviceFileInfo:
@@ -128,33 +146,115 @@ def read_device_files(directory_paths: Iterable[pathlib.Path]) -> DeviceFileInfo
     code from the mbed.htm file. We extract an OnlineID from mbed.htm as we also make use of that information to find a
     board entry in Mbed OS's various target databases and JSON files.
 
+    The known identification files are looked up by name, and a directory is only listed when it has no MBED.HTM, to
+    find .htm files with other names. At most `MAX_IDENTIFICATION_FILE_SIZE` bytes are read from each file. The .htm
+    files are read until both a product code and an online ID have been found, and the J-Link files are only read
+    when no online ID was found in them.
+
     Args:
         directory_paths: Paths to the directories containing device files.
     """
+    directory_paths = list(directory_paths)
     device_file_paths = _get_device_file_paths(directory_paths)
     if not device_file_paths:
         paths = "\n".join(str(p) for p in directory_paths)
         logger.warning(
-            f"No files were found in the device's mass storage device. The following paths were searched:\n{paths}."
-            "\nThis device may not be identifiable as Mbed enabled. Check the files exist, are not hidden and are not "
-            "corrupted."
+            "No identification files were found in the device's mass storage device. The following paths were "
+            f"searched:\n{paths}.\nThis device may not be identifiable as Mbed enabled. Check the files exist, are "
+            "not hidden and are not corrupted."
         )
         return DeviceFileInfo(None, None, {})
 
-    htm_file_contents = _read_htm_file_contents(device_file_paths)
-    details_txt_contents = _read_first_details_txt_contents(device_file_paths)
+    reader = _BoundedFileReader()
+    details_txt_contents = _read_first_details_txt_contents(device_file_paths, reader)
     # details.txt is the "preferred" source of truth for the product_code
     code = details_txt_contents.get("code")
-    if code is None:
-        # erk! well, let's get it from the mbed.htm file instead...
-        code = _extract_product_code_from_htm(htm_file_contents)
+    online_id = None
+    for contents in _read_htm_file_contents(device_file_paths, reader):
+        if code is None:
+            # erk! well, let's get it from the mbed.htm file instead...
+            code = _read_product_code(contents)
+        if online_id is None:
+            online_id = _read_online_id(contents)
+        if code is not None and online_id is not None:
+            break
 
-    online_id = _extract_online_id_from_htm(htm_file_contents)
     if online_id is None:
         # If no online ID available from .htm, may be a J-Link
-        online_id = _extract_online_id_jlink_html(device_file_paths)
-        details_txt_contents.update(_extract_version_jlink_html(device_file_paths))
-    return DeviceFileInfo(code, online_id, details_txt_contents)
+        online_id = _extract_online_id_jlink_html(device_file_paths, reader)
+        details_txt_contents.update(_extract_version_jlink_html(device_file_paths, reader))
+
+    logger.debug(
+        f"Read {reader.bytes_read} bytes from {reader.files_read} identification files on the device mounted at "
+        f"{', '.join(str(p) for p in directory_paths)}."
+    )
+    return DeviceFileInfo(code, online_id, details_txt_contents, reader.bytes_read)
+
+
+def get_identification_file_stats(directory_paths: Iterable[pathlib.Path]) -> List[Tuple[str, int, int]]:
+    """Return the lower case name, modification time in nanoseconds and size of the identification files.
+
+    The files are looked up by name but not opened, so this is much cheaper than `read_device_files`. Files only found
+    by listing the directories, e.g. those named in an unusual case, are not included.
+
+    Args:
+        directory_paths: Paths to the directories containing device files.
+    """
+    stats = []
+    for directory in directory_paths:
+        for name in IDENTIFICATION_FILE_NAMES:
+            path = _find_file(directory, name)
+            if path is None:
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            stats.append((name, stat.st_mtime_ns, stat.st_size))
+    return stats
+
+
+def read_interface_version(directory_paths: Iterable[pathlib.Path]) -> Optional[str]:
+    """Return the version of the interface firmware, None if it could not be found.
+
+    Only DETAILS.TXT is read, or segger.html for J-Link devices without one, so this is much cheaper than
+    `read_device_files`.
+
+    Args:
+        directory_paths: Paths to the directories containing device files.
+    """
+    directory_paths = list(directory_paths)
+    reader = _BoundedFileReader()
+    for directory in directory_paths:
+        details_txt = _find_file(directory, DETAILS_TXT_FILE_NAME)
+        if details_txt is not None:
+            contents = reader.read_text(details_txt)
+            if contents:
+                return _read_details_txt(contents).get("Version")
+
+    segger_html = [_find_file(directory, SEGGER_HTML_FILE_NAME) for directory in directory_paths]
+    return _extract_version_jlink_html([path for path in segger_html if path is not None], reader).get("Version")
+
+
+class _BoundedFileReader:
+    """Reads at most `MAX_IDENTIFICATION_FILE_SIZE` bytes from each file, counting the bytes read."""
+
+    def __init__(self) -> None:
+        self.bytes_read = 0
+        self.files_read = 0
+
+    def read_text(self, file_path: pathlib.Path) -> Optional[str]:
+        """Return the beginning of a file's contents, None if it could not be read."""
+        try:
+            with file_path.open("rb") as f:
+                contents = f.read(MAX_IDENTIFICATION_FILE_SIZE)
+        except OSError:
+            logger.warning(f"The file '{file_path}' could not be read from the device, target may not be identified.")
+            return None
+
+        self.bytes_read += len(contents)
+        self.files_read += 1
+        return contents.decode("utf-8", errors="replace")
 
 
 def _read_product_code(file_contents: str) -> Optional[str]:
@@ -191,10 +291,10 @@ def _read_url_slug(file_contents: str) -> Optional[str]:
     return None
 
 
-def _read_first_details_txt_contents(file_paths: Iterable[pathlib.Path]) -> dict:
+def _read_first_details_txt_contents(file_paths: Iterable[pathlib.Path], reader: _BoundedFileReader) -> dict:
     for path in file_paths:
         if _is_details_txt(path):
-            contents = _try_read_file_text(path)
+            contents = reader.read_text(path)
             if contents:
                 return _read_details_txt(contents)
 
@@ -225,27 +325,11 @@ def _read_details_txt(file_contents: str) -> dict:
     return output
 
 
-def _extract_product_code_from_htm(all_files_contents: Iterable[str]) -> Optional[str]:
-    """Return first product code found in files contents, None if not found."""
-    for contents in all_files_contents:
-        product_code = _read_product_code(contents)
-        if product_code:
-            return product_code
-    return None
-
-
-def _extract_online_id_from_htm(all_files_contents: Iterable[str]) -> Optional[OnlineId]:
-    """Return first online ID found in files contents, None if not found."""
-    for contents in all_files_contents:
-        online_id = _read_online_id(contents)
-        if online_id:
-            return online_id
-    return None
-
-
-def _extract_online_id_jlink_html(file_paths: Iterable[pathlib.Path]) -> Optional[OnlineId]:
+def _extract_online_id_jlink_html(
+    file_paths: Iterable[pathlib.Path], reader: _BoundedFileReader
+) -> Optional[OnlineId]:
     """Return online ID found in Board.html, None if not found."""
-    contents = _get_board_html_contents(file_paths)
+    contents = _get_board_html_contents(file_paths, reader)
     if contents is not None:
         slug = _read_url_slug(contents)
         if slug:
@@ -253,10 +337,10 @@ def _extract_online_id_jlink_html(file_paths: Iterable[pathlib.Path]) -> Optiona
     return None
 
 
-def _extract_version_jlink_html(file_paths: Iterable[pathlib.Path]) -> dict:
+def _extract_version_jlink_html(file_paths: Iterable[pathlib.Path], reader: _BoundedFileReader) -> dict:
     """Return dict with version found in Segger.html, empty if not found."""
     interface_data = {}
-    contents = _get_segger_html_content(file_paths)
+    contents = _get_segger_html_content(file_paths, reader)
     if contents is not None:
         segger_version = _read_url_slug(contents)
         if segger_version:
@@ -265,38 +349,54 @@ def _extract_version_jlink_html(file_paths: Iterable[pathlib.Path]) -> dict:
 
 
 def _get_device_file_paths(directories: Iterable[pathlib.Path]) -> List[pathlib.Path]:
-    return [path for directory in directories for path in directory.iterdir() if not _is_hidden_file(path)]
-
-
-def _try_read_file_text(file_path: pathlib.Path) -> Optional[str]:
-    try:
-        return file_path.read_text()
-    except OSError:
-        logger.warning(f"The file '{file_path}' could not be read from the device, target may not be identified.")
-        return None
+    """Return the identification files in the directories, in the order the directories are given."""
+    paths = []
+    for directory in directories:
+        found_or_none = (_find_file(directory, name) for name in IDENTIFICATION_FILE_NAMES)
+        found = [path for path in found_or_none if path is not None]
+        if not any(_is_htm_file(path) for path in found):
+            # The interface firmware may give its .htm file another name, e.g. MICROBIT.HTM, or the files may be named
+            # in an unusual case on a case sensitive file system, so look through everything in the directory.
+            found_names = {path.name.lower() for path in found}
+            found.extend(
+                path
+                for path in directory.iterdir()
+                if _is_identification_file(path) and path.name.lower() not in found_names
+            )
+        paths.extend(found)
+    return paths
+
+
+def _find_file(directory: pathlib.Path, name: str) -> Optional[pathlib.Path]:
+    """Return the path to the file with the given lower case name in any of the cases it is commonly given."""
+    # The mass storage of a device is usually a case insensitive FAT file system, where the first lookup finds the file.
+    for candidate_name in dict.fromkeys((name, name.upper(), name.capitalize())):
+        path = directory / candidate_name
+        if path.is_file():
+            return path
+    return None
 
 
-def _read_htm_file_contents(all_files: Iterable[pathlib.Path]) -> List[str]:
-    htm_files_contents = []
+def _read_htm_file_contents(all_files: Iterable[pathlib.Path], reader: _BoundedFileReader) -> Iterator[str]:
+    """Read the .htm files one at a time, so reading can stop once the wanted information has been found."""
     for file in all_files:
         if _is_htm_file(file):
-            contents = _try_read_file_text(file)
+            contents = reader.read_text(file)
             if contents:
-                htm_files_contents.append(contents)
-    return htm_files_contents
+                yield contents
 
 
-def _get_segger_html_content(file_paths: Iterable[pathlib.Path]) -> Optional[str]:
+def _get_segger_html_content(file_paths: Iterable[pathlib.Path], reader: _BoundedFileReader) -> Optional[str]:
     for fp in file_paths:
-        if fp.name.lower() == "segger.html":
-            return _try_read_file_text(fp)
+        if fp.name.lower() == SEGGER_HTML_FILE_NAME:
+            return reader.read_text(fp)
     return None
 
 
-def _get_board_html_contents(file_paths: Iterable[pathlib.Path]) -> Optional[str]:
+def _get_board_html_contents(file_paths: Iterable[pathlib.Path], reader: _BoundedFileReader) -> Optional[str]:
     for fp in file_paths:
-        if fp.name.lower() == "board.html":
-            return _try_read_file_text(fp)
+        if fp.name.lower() == BOARD_HTML_FILE_NAME:
+            return reader.read_text(fp)
     return None
 
 
@@ -305,9 +405,13 @@ def _is_hidden_file(file: pathlib.Path) -> bool:
     return file.name.startswith(".")
 
 
+def _is_identification_file(path: pathlib.Path) -> bool:
+    return not _is_hidden_file(path) and (_is_htm_file(path) or path.name.lower() in IDENTIFICATION_FILE_NAMES)
+
+
 def _is_htm_file(path: pathlib.Path) -> bool:
     return path.suffix.lower() == ".htm"
 
 
 def _is_details_txt(path: pathlib.Path) -> bool:
-    return path.name.lower() == "details.txt"
+    return path.name.lower() == DETAILS_TXT_FILE_NAME
@@ -5,7 +5,7 @@
 """Defines a device detector for Linux."""
 import logging
 from pathlib import Path
-from typing import Tuple, List, Optional, cast
+from typing import Dict, List, Tuple
 
 import psutil
 import pyudev
@@ -18,27 +18,34 @@ logger = logging.getLogger(__name__)
 
 
 class LinuxDeviceDetector(DeviceDetector):
-    """Linux specific implementation of device detection."""
+    """Linux specific implementation of device detection.
+
+    The USB block devices, tty devices and mounted file systems are each listed once, then the serial port and mount
+    points of each block device are looked up by its serial number and device node.
+    """
 
     def find_candidates(self) -> List[CandidateDevice]:
         """Return a list of CandidateDevices."""
         context = pyudev.Context()
+        serial_ports = _map_serial_ports(context)
+        fs_mounts = _map_fs_mounts()
         candidates = []
         for disk in context.list_devices(subsystem="block", ID_BUS="usb"):
             serial_number = disk.properties.get("ID_SERIAL_SHORT")
+            device_node = disk.properties.get("DEVNAME")
             try:
                 candidates.append(
                     CandidateDevice(
-                        mount_points=_find_fs_mounts_for_device(disk.properties.get("DEVNAME")),
+                        mount_points=fs_mounts.get(device_node, ()),
                         product_id=disk.properties.get("ID_MODEL_ID"),
                         vendor_id=disk.properties.get("ID_VENDOR_ID"),
                         serial_number=serial_number,
-                        serial_port=_find_serial_port_for_device(serial_number),
+                        serial_port=serial_ports.get(serial_number),
                     )
                 )
             except FilesystemMountpointError:
                 logger.warning(
-                    f"A USB block device was detected at path {disk.properties.get('DEVNAME')}. However, the"
+                    f"A USB block device was detected at path {device_node}. However, the"
                     " file system has failed to mount. Please disconnect and reconnect your device and try again."
                     "If this problem persists, try running fsck.vfat on your block device, as the file system may be "
                     "corrupted."
@@ -47,14 +54,19 @@ class LinuxDeviceDetector(DeviceDetector):
         return candidates
 
 
-def _find_serial_port_for_device(disk_serial_id: str) -> Optional[str]:
-    """Try to find a serial port associated with the given device."""
-    for tty_dev in pyudev.Context().list_devices(subsystem="tty"):
-        if tty_dev.properties.get("ID_SERIAL_SHORT") == disk_serial_id:
-            return cast(str, tty_dev.properties.get("DEVNAME"))
-    return None
+def _map_serial_ports(context: pyudev.Context) -> Dict[str, str]:
+    """Map the serial numbers of tty devices to their device nodes, keeping the first device with each serial number."""
+    serial_ports: Dict[str, str] = {}
+    for tty_dev in context.list_devices(subsystem="tty"):
+        serial_number = tty_dev.properties.get("ID_SERIAL_SHORT")
+        if serial_number is not None:
+            serial_ports.setdefault(serial_number, tty_dev.properties.get("DEVNAME"))
+    return serial_ports
 
 
-def _find_fs_mounts_for_device(device_file_path: str) -> Tuple[Path, ...]:
-    """Find the file system mount point for a block device file path."""
-    return tuple(Path(part.mountpoint) for part in psutil.disk_partitions() if part.device == device_file_path)
+def _map_fs_mounts() -> Dict[str, Tuple[Path, ...]]:
+    """Map the device nodes of mounted file systems to their mount points."""
+    fs_mounts: Dict[str, Tuple[Path, ...]] = {}
+    for partition in psutil.disk_partitions():
+        fs_mounts[partition.device] = fs_mounts.get(partition.device, ()) + (Path(partition.mountpoint),)
+    return fs_mounts
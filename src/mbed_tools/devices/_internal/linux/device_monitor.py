@@ -0,0 +1,83 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Defines a device monitor for Linux."""
+import logging
+import select
+import time
+
+from typing import Optional
+
+import pyudev
+
+from mbed_tools.devices._internal.base_detector import DeviceMonitor
+
+
+logger = logging.getLogger(__name__)
+
+# The kernel signals a priority event on this file whenever a file system is mounted or unmounted.
+MOUNTS_FILE = "/proc/self/mounts"
+# Connecting a device produces a burst of udev events and its file system is mounted shortly after, so once something
+# changes the monitor waits until there have been no events for this many seconds.
+SETTLE_TIME = 0.25
+
+
+class LinuxDeviceMonitor(DeviceMonitor):
+    """Linux specific implementation of device monitoring.
+
+    udev events for USB block and tty devices, and changes to the mounted file systems, are waited for together. No
+    CPU is used while nothing changes.
+    """
+
+    def __init__(self) -> None:
+        """Start listening for udev events and changes to the mounted file systems."""
+        self._monitor = pyudev.Monitor.from_netlink(pyudev.Context())
+        self._monitor.filter_by("block")
+        self._monitor.filter_by("tty")
+        self._monitor.start()
+        self._mounts = open(MOUNTS_FILE)
+        self._mounts.read()
+        self._poller = select.poll()
+        self._poller.register(self._monitor.fileno(), select.POLLIN)
+        self._poller.register(self._mounts.fileno(), select.POLLPRI)
+
+    def wait_for_change(self, timeout: Optional[float] = None) -> bool:
+        """Wait until USB devices may have changed, returning False if nothing changed before the timeout.
+
+        Args:
+            timeout: Maximum number of seconds to wait, waits indefinitely when None.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._read_events(None if deadline is None else deadline - time.monotonic()):
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+
+        while self._read_events(SETTLE_TIME):
+            pass
+        return True
+
+    def close(self) -> None:
+        """Stop monitoring and release the resources used."""
+        self._poller.unregister(self._monitor.fileno())
+        self._poller.unregister(self._mounts.fileno())
+        self._mounts.close()
+        # pyudev has no way to close the netlink socket, which is closed when the last reference to the monitor goes.
+        del self._monitor
+
+    def _read_events(self, timeout: Optional[float]) -> bool:
+        """Wait for events and consume them, returning whether any of them were for USB devices or mounts."""
+        relevant = False
+        for fd, _ in self._poller.poll(None if timeout is None else max(timeout, 0) * 1000):
+            if fd == self._mounts.fileno():
+                # Reading the file again clears the event.
+                self._mounts.seek(0)
+                self._mounts.read()
+                relevant = True
+            else:
+                device = self._monitor.poll(timeout=0)
+                while device is not None:
+                    logger.debug(f"udev {device.action} event for {device.device_path}")
+                    relevant = relevant or device.properties.get("ID_BUS") == "usb"
+                    device = self._monitor.poll(timeout=0)
+        return relevant
@@ -0,0 +1,161 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Defines a device detector for Linux which reads sysfs directly.
+
+The udev detector asks libudev for every block and tty device, which loads all of the properties udev has stored for
+each one, and finds nothing when the udev daemon isn't running, e.g. in most containers. This detector reads only the
+attributes it needs from the kernel:
+
+- `/sys/bus/usb/devices` lists the USB devices, with their vendor ID, product ID and serial number.
+- `/sys/class/block` and `/sys/class/tty` link to the block and tty devices, which are in the sysfs tree below the USB
+  device they belong to.
+- `/proc/self/mountinfo` gives the mount points of each block device, by device number.
+
+The serial number, vendor ID and product ID are the USB descriptors udev reports as `ID_SERIAL_SHORT`, `ID_VENDOR_ID`
+and `ID_MODEL_ID`.
+"""
+import logging
+import re
+
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from mbed_tools.devices._internal.base_detector import DeviceDetector
+from mbed_tools.devices._internal.candidate_device import CandidateDevice, FilesystemMountpointError
+
+
+logger = logging.getLogger(__name__)
+
+
+class _UsbDevice(NamedTuple):
+    vendor_id: str
+    product_id: str
+    serial_number: str
+
+
+class SysfsDeviceDetector(DeviceDetector):
+    """Linux specific implementation of device detection, reading sysfs and the mount table directly."""
+
+    def __init__(
+        self,
+        sys_root: Path = Path("/sys"),
+        dev_root: Path = Path("/dev"),
+        mountinfo_path: Path = Path("/proc/self/mountinfo"),
+    ) -> None:
+        """Initialise the detector.
+
+        Args:
+            sys_root: Path sysfs is mounted on.
+            dev_root: Path of the directory holding the device nodes.
+            mountinfo_path: Path of the mount table, in the format of `/proc/self/mountinfo`.
+        """
+        self._sys_root = sys_root
+        self._dev_root = dev_root
+        self._mountinfo_path = mountinfo_path
+
+    def find_candidates(self) -> List[CandidateDevice]:
+        """Return a list of CandidateDevices."""
+        usb_devices = _read_usb_devices(self._sys_root / "bus" / "usb" / "devices")
+        if not usb_devices:
+            return []
+
+        serial_ports = self._map_serial_ports(usb_devices)
+        fs_mounts = _map_fs_mounts(self._mountinfo_path)
+        candidates = []
+        for block_link in _list_class(self._sys_root / "class" / "block"):
+            usb_device = _find_usb_device(block_link, usb_devices)
+            if usb_device is None:
+                continue
+            device_node = self._dev_root / block_link.name
+            try:
+                candidates.append(
+                    CandidateDevice(
+                        mount_points=fs_mounts.get(_read_attribute(block_link / "dev") or "", ()),
+                        product_id=usb_device.product_id,
+                        vendor_id=usb_device.vendor_id,
+                        serial_number=usb_device.serial_number,
+                        serial_port=serial_ports.get(usb_device.serial_number),
+                    )
+                )
+            except FilesystemMountpointError:
+                logger.warning(
+                    f"A USB block device was detected at path {device_node}. However, the"
+                    " file system has failed to mount. Please disconnect and reconnect your device and try again."
+                    "If this problem persists, try running fsck.vfat on your block device, as the file system may be "
+                    "corrupted."
+                )
+                continue
+        return candidates
+
+    def _map_serial_ports(self, usb_devices: Dict[Path, _UsbDevice]) -> Dict[str, str]:
+        """Map the serial numbers of USB devices to the device node of their first tty."""
+        serial_ports: Dict[str, str] = {}
+        for tty_link in _list_class(self._sys_root / "class" / "tty"):
+            usb_device = _find_usb_device(tty_link, usb_devices)
+            if usb_device is not None:
+                serial_ports.setdefault(usb_device.serial_number, str(self._dev_root / tty_link.name))
+        return serial_ports
+
+
+def _read_usb_devices(bus_devices_dir: Path) -> Dict[Path, _UsbDevice]:
+    """Map the sysfs directory of each USB device with a serial number to its descriptors."""
+    usb_devices = {}
+    for device_link in _list_class(bus_devices_dir):
+        # Interfaces of the devices are listed too, named "<device>:<configuration>.<interface>".
+        if ":" in device_link.name:
+            continue
+        serial_number = _read_attribute(device_link / "serial")
+        vendor_id = _read_attribute(device_link / "idVendor")
+        product_id = _read_attribute(device_link / "idProduct")
+        if serial_number and vendor_id and product_id:
+            # udev replaces white space in the serial number it reports.
+            usb_devices[device_link.resolve()] = _UsbDevice(vendor_id, product_id, re.sub(r"\s", "_", serial_number))
+    return usb_devices
+
+
+def _find_usb_device(class_link: Path, usb_devices: Dict[Path, _UsbDevice]) -> Optional[_UsbDevice]:
+    """Return the USB device a block or tty device belongs to, None if it isn't a USB device."""
+    for parent in class_link.resolve().parents:
+        usb_device = usb_devices.get(parent)
+        if usb_device is not None:
+            return usb_device
+    return None
+
+
+def _map_fs_mounts(mountinfo_path: Path) -> Dict[str, Tuple[Path, ...]]:
+    """Map the "major:minor" device numbers of mounted file systems to their mount points."""
+    fs_mounts: Dict[str, Tuple[Path, ...]] = {}
+    try:
+        mountinfo = mountinfo_path.read_text()
+    except OSError as err:
+        logger.warning(f"Unable to read the mounted file systems from {mountinfo_path}: {err}")
+        return fs_mounts
+
+    for line in mountinfo.splitlines():
+        # Fields are: mount ID, parent ID, major:minor, root, mount point, then options we don't use.
+        fields = line.split(" ")
+        if len(fields) < 5:
+            continue
+        fs_mounts[fields[2]] = fs_mounts.get(fields[2], ()) + (Path(_unescape(fields[4])),)
+    return fs_mounts
+
+
+def _unescape(field: str) -> str:
+    """Decode the octal escapes used for white space and backslashes in the fields of mountinfo."""
+    return re.sub(r"\\([0-7]{3})", lambda match: chr(int(match.group(1), 8)), field)
+
+
+def _list_class(directory: Path) -> List[Path]:
+    try:
+        return sorted(directory.iterdir())
+    except OSError:
+        return []
+
+
+def _read_attribute(path: Path) -> Optional[str]:
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
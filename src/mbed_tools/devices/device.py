@@ -2,14 +2,15 @@
 # Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
 # SPDX-License-Identifier: Apache-2.0
 #
-"""Data model definition for Device and ConnectedDevices."""
+"""Data model definition for Device, ConnectedDevices and DeviceEvent."""
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Tuple, Optional, List
 from mbed_tools.targets import Board
 from mbed_tools.devices._internal.detect_candidate_devices import CandidateDevice
 from mbed_tools.devices._internal.resolve_board import resolve_board, NoBoardForCandidate, ResolveBoardError
-from mbed_tools.devices._internal.file_parser import read_device_files
+from mbed_tools.devices._internal.device_identity_cache import DeviceIdentityCache, get_device_identity
+from mbed_tools.devices._internal.file_parser import read_device_files, read_interface_version
 from mbed_tools.devices.exceptions import DeviceLookupFailed
 
 
@@ -25,6 +26,10 @@ class Device:
         serial_number: The serial number presented by the device to the USB subsystem.
         serial_port: The serial port presented by this device, could be None.
         mount_points: The filesystem mount points associated with this device.
+        mbed_enabled: Whether a Board was found for this device.
+        interface_version: The version of the interface firmware, read from the device's files.
+        unidentified_reason: Why the device could not be identified, other than its board not being in the board
+            database, e.g. timing out reading its files.
     """
 
     mbed_board: Board
@@ -33,6 +38,7 @@ class Device:
     mount_points: Tuple[Path, ...]
     mbed_enabled: bool = False
     interface_version: Optional[str] = None
+    unidentified_reason: Optional[str] = None
 
     @classmethod
     def from_candidate(cls, candidate: CandidateDevice) -> "Device":
@@ -42,9 +48,27 @@ class Device:
         If this fails we set the board to `None` which means we couldn't verify this Device
         as being an Mbed enabled device.
 
+        Devices which have been identified before are returned from a cache, reading only their interface version,
+        unless their identification files or interface version have changed since.
+
         Args:
             candidate: The CandidateDevice we're using to create the Device.
         """
+        identity_cache = DeviceIdentityCache()
+        identity = get_device_identity(candidate)
+        if identity is not None:
+            cached = identity_cache.get(candidate.serial_number, identity)
+            # The files of a reflashed interface can keep their timestamps and sizes, so check the version too.
+            if cached is not None and cached.interface_version == read_interface_version(candidate.mount_points):
+                return Device(
+                    serial_port=candidate.serial_port,
+                    serial_number=candidate.serial_number,
+                    mount_points=candidate.mount_points,
+                    mbed_board=cached.board,
+                    mbed_enabled=True,
+                    interface_version=cached.interface_version,
+                )
+
         device_file_info = read_device_files(candidate.mount_points)
         try:
             mbed_board = resolve_board(
@@ -61,13 +85,34 @@ class Device:
                 "board data in the database."
             )
 
+        interface_version = device_file_info.interface_details.get("Version")
+        if mbed_enabled and identity is not None:
+            identity_cache.add(candidate.serial_number, identity, mbed_board, interface_version)
+
         return Device(
             serial_port=candidate.serial_port,
             serial_number=candidate.serial_number,
             mount_points=candidate.mount_points,
             mbed_board=mbed_board,
             mbed_enabled=mbed_enabled,
-            interface_version=device_file_info.interface_details.get("Version"),
+            interface_version=interface_version,
+        )
+
+    @classmethod
+    def from_unidentified_candidate(cls, candidate: CandidateDevice, reason: str) -> "Device":
+        """Construct an unidentified Device from a CandidateDevice, without reading its files.
+
+        Args:
+            candidate: The CandidateDevice we're using to create the Device.
+            reason: Why the device could not be identified.
+        """
+        return Device(
+            serial_port=candidate.serial_port,
+            serial_number=candidate.serial_number,
+            mount_points=candidate.mount_points,
+            mbed_board=Board.from_offline_board_entry({}),
+            mbed_enabled=False,
+            unidentified_reason=reason,
         )
 
 
@@ -101,3 +146,18 @@ class ConnectedDevices:
         else:
             # Keep a list of devices that have been identified as Mbed Boards
             self.identified_devices.append(device)
+
+
+@dataclass(frozen=True)
+class DeviceEvent:
+    """A device being connected, disconnected or changing, e.g. its file system being mounted somewhere else.
+
+    Attributes:
+        action: What happened to the device, one of "add", "remove" or "change".
+        device: The device after the change, or as it was before being disconnected for "remove".
+        timestamp: When the change was noticed, in seconds since the epoch.
+    """
+
+    action: str
+    device: Device
+    timestamp: float
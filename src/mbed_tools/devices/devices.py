@@ -3,14 +3,27 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 """API for listing devices."""
+import logging
+import time
 
+from contextlib import closing
 from operator import attrgetter
-from typing import List, Optional
+from typing import Generator, Iterable, Iterator, List, Optional
 
-from mbed_tools.devices._internal.detect_candidate_devices import detect_candidate_devices
+from mbed_tools.devices._internal.base_detector import RESCAN_INTERVAL, DeviceMonitor
+from mbed_tools.devices._internal.build_devices import async_build_devices, iter_built_devices, run_in_thread
+from mbed_tools.devices._internal.candidate_device import CandidateDevice
+from mbed_tools.devices._internal.detect_candidate_devices import detect_candidate_devices, get_device_monitor
+from mbed_tools.devices._internal.device_registry import DeviceRegistry
+from mbed_tools.devices._internal.device_server_client import get_devices_from_server
 
-from mbed_tools.devices.device import ConnectedDevices, Device
-from mbed_tools.devices.exceptions import DeviceLookupFailed, NoDevicesFound
+from mbed_tools.devices.device import ConnectedDevices, Device, DeviceEvent
+from mbed_tools.devices.exceptions import DeviceLookupFailed, DeviceWaitTimedOut, NoDevicesFound, UnknownOSError
+
+logger = logging.getLogger(__name__)
+
+# Number of seconds between scans while waiting for a device when the operating system can't report devices changing.
+POLL_INTERVAL = 0.5
 
 
 def get_connected_devices() -> ConnectedDevices:
@@ -18,19 +31,160 @@ def get_connected_devices() -> ConnectedDevices:
 
     Connected devices which have been identified as Mbed Boards and also connected devices which are potentially
     Mbed Boards (but not could not be identified in the database) are returned.
+
+    Devices are identified in parallel. A device which takes too long to identify, e.g. because its file system is
+    not responding, is returned as unidentified with the reason in `Device.unidentified_reason`.
+
+    When a devices server started by `serve_connected_devices` is running the devices are fetched from it, otherwise
+    they are scanned for directly.
     """
-    connected_devices = ConnectedDevices()
+    return _to_connected_devices(iter_connected_devices())
 
-    for candidate_device in detect_candidate_devices():
-        device = Device.from_candidate(candidate_device)
-        connected_devices.add_device(device)
 
-    return connected_devices
+async def async_get_connected_devices() -> ConnectedDevices:
+    """Returns Mbed Devices connected to host computer, without blocking the event loop.
+
+    The asyncio counterpart of `get_connected_devices`. Scanning for the devices, and the file reads and board lookup
+    identifying each device, run in threads, with the devices identified concurrently. When cancelled, devices which
+    haven't started being identified are never identified.
+
+    Raises:
+        DeviceLookupFailed: The board of a device could not be looked up.
+    """
+    devices = await run_in_thread(get_devices_from_server)
+    if devices is None:
+        candidates = await run_in_thread(detect_candidate_devices)
+        devices = await async_build_devices(sorted(candidates, key=attrgetter("serial_number")))
+    return _to_connected_devices(sorted(devices, key=attrgetter("serial_number")))
+
+
+def iter_connected_devices() -> Generator[Device, None, None]:
+    """Yields the Mbed Devices connected to host computer in order of serial number, each as soon as it is identified.
+
+    Both identified and unidentified devices are yielded, as for `get_connected_devices`. Devices which haven't
+    started being identified when the generator is closed are never identified.
+
+    Raises:
+        DeviceLookupFailed: The board of a device could not be looked up.
+    """
+    devices = get_devices_from_server()
+    if devices is not None:
+        yield from sorted(devices, key=attrgetter("serial_number"))
+        return
+
+    yield from iter_built_devices(sorted(detect_candidate_devices(), key=attrgetter("serial_number")))
+
+
+def watch_connected_devices() -> Iterator[DeviceEvent]:
+    """Yields an event each time a device is connected, disconnected or changes, until the generator is closed.
+
+    An "add" event is yielded first for each device which is already connected. The devices are scanned again each
+    time the operating system reports a USB device or file system mount changing, and at least every
+    `RESCAN_INTERVAL` seconds in case a change isn't reported. Only the devices which are new or have changed are
+    identified again. Both identified and unidentified devices are reported.
+
+    Raises:
+        UnknownOSError: Watching devices is not supported on the current operating system.
+        DeviceLookupFailed: The board of a device could not be looked up.
+    """
+    # The monitor is started before the first scan so changes made during the scan aren't missed.
+    monitor = get_device_monitor()
+    try:
+        registry = DeviceRegistry()
+        yield from registry.update(detect_candidate_devices())
+        while True:
+            monitor.wait_for_change(RESCAN_INTERVAL)
+            yield from registry.update(detect_candidate_devices())
+    finally:
+        monitor.close()
+
+
+def wait_for_device(
+    serial_number: Optional[str] = None, target_name: Optional[str] = None, timeout: Optional[float] = None
+) -> Device:
+    """Wait until a device is connected and ready to use, and return it.
+
+    A device is ready once its file system is mounted and its serial port is present, e.g. once it has enumerated
+    again after being flashed or reset. A matching device which is already ready is returned straight away. When
+    several are ready the one with the lowest serial number is returned.
+
+    The devices are scanned again each time the operating system reports a USB device or file system mount changing,
+    or every `POLL_INTERVAL` seconds where it can't, and only the devices which are new or have changed are identified.
+
+    Args:
+        serial_number: The serial number of the device, any serial number matches when None.
+        target_name: The Mbed target name of the device, any device matches when None, including unidentified ones.
+        timeout: Maximum number of seconds to wait, waits indefinitely when None.
+
+    Raises:
+        DeviceWaitTimedOut: No matching device was ready before the timeout.
+        DeviceLookupFailed: The board of a device could not be looked up.
+    """
+    registry = DeviceRegistry()
+    for candidates in _scan_on_change(timeout):
+        # Only devices with the right serial number need identifying.
+        registry.update(
+            candidate for candidate in candidates if serial_number is None or candidate.serial_number == serial_number
+        )
+        ready = [
+            device
+            for device in registry.devices
+            if device.mount_points
+            and device.serial_port is not None
+            and (target_name is None or (device.mbed_enabled and _is_target(device, target_name)))
+        ]
+        if ready:
+            return min(ready, key=attrgetter("serial_number"))
+
+    description = target_name or "device"
+    if serial_number is not None:
+        description += f" with serial number {serial_number}"
+    raise DeviceWaitTimedOut(f"Timed out after {timeout:g}s waiting for the {description} to be ready.")
+
+
+def wait_for_removal(serial_number: str, timeout: Optional[float] = None) -> None:
+    """Wait until a device is disconnected, returning straight away if it isn't connected.
+
+    The devices are scanned again as for `wait_for_device`, but no device is identified.
+
+    Args:
+        serial_number: The serial number of the device.
+        timeout: Maximum number of seconds to wait, waits indefinitely when None.
+
+    Raises:
+        DeviceWaitTimedOut: The device was still connected after the timeout.
+    """
+    for candidates in _scan_on_change(timeout):
+        if all(candidate.serial_number != serial_number for candidate in candidates):
+            return
+
+    raise DeviceWaitTimedOut(
+        f"Timed out after {timeout:g}s waiting for the device with serial number {serial_number} to be disconnected."
+    )
+
+
+def serve_connected_devices() -> None:
+    """Keep the connected devices up to date and share them with other processes, until interrupted.
+
+    While the server is running `get_connected_devices`, and the functions which use it, fetch the devices from the
+    server through a Unix socket in the user's cache directory instead of each scanning for them.
+
+    Raises:
+        UnknownOSError: Serving devices is not supported on the current operating system.
+        DeviceServerError: Another devices server is already running.
+    """
+    # Imported here as Unix sockets are not available on every operating system.
+    from mbed_tools.devices._internal.device_server import DeviceServer
+
+    DeviceServer().serve_forever()
 
 
 def find_connected_device(target_name: str, identifier: Optional[int] = None) -> Device:
     """Find a connected device matching the given target_name, if there is only one.
 
+    When an identifier is given no more devices are identified once the device is found. Without one every device
+    has to be identified, to be sure only one matches.
+
     Args:
         target_name: The Mbed target name of the device.
         identifier: Where multiple of the same Mbed device are connected, the associated [id].
@@ -41,27 +195,67 @@ def find_connected_device(target_name: str, identifier: Optional[int] = None) ->
     Returns:
         The first Device found matching target_name.
     """
-    devices = find_all_connected_devices(target_name)
-    if identifier is None and len(devices) == 1:
-        return devices[0]
-    elif identifier is not None and len(devices) > identifier:
-        return devices[identifier]
-
-    detected_targets = "\n".join(
-        f"target: {dev.mbed_board.board_type}[{i}]," f" port: {dev.serial_port}, mount point(s): {dev.mount_points}"
-        for i, dev in enumerate(devices)
-    )
     if identifier is None:
-        msg = (
-            f"`Multiple matching, please select a connected target with [n] identifier.\n"
-            f"The following {target_name}s were detected:\n{detected_targets}"
-        )
-    else:
-        msg = (
-            f"`{target_name}[{identifier}]` is not a valid connected target.\n"
-            f"The following {target_name}s were detected:\n{detected_targets}"
-        )
-    raise DeviceLookupFailed(msg)
+        # Every device has to be identified to be sure only one matches.
+        return _select_device(find_all_connected_devices(target_name), target_name, identifier)
+
+    # Matching devices are numbered in order of serial number, the order they are identified in, so no more devices
+    # need identifying once the one with the identifier is found.
+    connected = ConnectedDevices()
+    matching = 0
+    with closing(iter_connected_devices()) as devices:
+        for device in devices:
+            connected.add_device(device)
+            if device.mbed_enabled and _is_target(device, target_name):
+                if matching == identifier:
+                    return device
+                matching += 1
+
+    return _select_device(_match_devices(connected, target_name), target_name, identifier)
+
+
+async def async_find_connected_device(target_name: str, identifier: Optional[int] = None) -> Device:
+    """Find a connected device matching the given target_name, if there is only one, without blocking the event loop.
+
+    The asyncio counterpart of `find_connected_device`. Every device is identified, concurrently, even when an
+    identifier is given.
+
+    Args:
+        target_name: The Mbed target name of the device.
+        identifier: Where multiple of the same Mbed device are connected, the associated [id].
+
+    Raise:
+        NoDevicesFound: Could not find any connected devices.
+        DeviceLookupFailed: Could not find device matching target_name.
+
+    Returns:
+        The first Device found matching target_name.
+    """
+    devices = _match_devices(await async_get_connected_devices(), target_name)
+    return _select_device(devices, target_name, identifier)
+
+
+def find_connected_device_by_serial_number(serial_number: str) -> Device:
+    """Find the connected device with the given serial number.
+
+    No more devices are identified once the device is found. The device is returned whether or not its board could
+    be identified.
+
+    Args:
+        serial_number: The serial number of the device.
+
+    Raise:
+        DeviceLookupFailed: No connected device has the serial number.
+
+    Returns:
+        The Device with the serial number.
+    """
+    with closing(iter_connected_devices()) as devices:
+        for device in devices:
+            if device.serial_number == serial_number:
+                return device
+
+    raise DeviceLookupFailed(f"No connected device has the serial number '{serial_number}'.")
 
 
 def find_all_connected_devices(target_name: str) -> List[Device]:
@@ -77,12 +271,16 @@ def find_all_connected_devices(target_name: str) -> List[Device]:
     Returns:
         List of Devices matching target_name.
     """
-    connected = get_connected_devices()
+    return _match_devices(get_connected_devices(), target_name)
+
+
+def _match_devices(connected: ConnectedDevices, target_name: str) -> List[Device]:
+    """Return the connected devices matching target_name, in order of serial number."""
     if not connected.identified_devices:
         raise NoDevicesFound("No Mbed enabled devices found.")
 
     matching_devices = sorted(
-        [device for device in connected.identified_devices if device.mbed_board.board_type == target_name.upper()],
+        [device for device in connected.identified_devices if _is_target(device, target_name)],
         key=attrgetter("serial_number"),
     )
     if matching_devices:
@@ -98,3 +296,65 @@ def find_all_connected_devices(target_name: str) -> List[Device]:
         f"The following devices were detected:\n{detected_targets}"
     )
     raise DeviceLookupFailed(msg)
+
+
+def _is_target(device: Device, target_name: str) -> bool:
+    return device.mbed_board.board_type == target_name.upper()
+
+
+def _select_device(devices: List[Device], target_name: str, identifier: Optional[int]) -> Device:
+    """Select the device with the given identifier from the devices matching target_name."""
+    if identifier is None and len(devices) == 1:
+        return devices[0]
+    elif identifier is not None and len(devices) > identifier:
+        return devices[identifier]
+
+    detected_targets = "\n".join(
+        f"target: {dev.mbed_board.board_type}[{i}]," f" port: {dev.serial_port}, mount point(s): {dev.mount_points}"
+        for i, dev in enumerate(devices)
+    )
+    if identifier is None:
+        msg = (
+            f"`Multiple matching, please select a connected target with [n] identifier.\n"
+            f"The following {target_name}s were detected:\n{detected_targets}"
+        )
+    else:
+        msg = (
+            f"`{target_name}[{identifier}]` is not a valid connected target.\n"
+            f"The following {target_name}s were detected:\n{detected_targets}"
+        )
+    raise DeviceLookupFailed(msg)
+
+
+def _to_connected_devices(devices: Iterable[Device]) -> ConnectedDevices:
+    connected_devices = ConnectedDevices()
+    for device in devices:
+        connected_devices.add_device(device)
+    return connected_devices
+
+
+def _scan_on_change(timeout: Optional[float]) -> Iterator[List[CandidateDevice]]:
+    """Yields the candidate devices straight away, then again each time they may have changed, until the timeout."""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    monitor: Optional[DeviceMonitor]
+    # The monitor is started before the first scan so changes made during the scan aren't missed.
+    try:
+        monitor = get_device_monitor()
+    except (UnknownOSError, OSError) as err:
+        logger.debug(f"Unable to monitor the devices, polling for changes instead: {err}")
+        monitor = None
+
+    try:
+        yield list(detect_candidate_devices())
+        while deadline is None or time.monotonic() < deadline:
+            interval = POLL_INTERVAL if monitor is None else RESCAN_INTERVAL
+            if deadline is not None:
+                interval = min(interval, max(deadline - time.monotonic(), 0))
+            if monitor is None:
+                time.sleep(interval)
+            else:
+                monitor.wait_for_change(interval)
+            yield list(detect_candidate_devices())
+    finally:
+        if monitor is not None:
+            monitor.close()
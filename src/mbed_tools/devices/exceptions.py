@@ -20,3 +20,11 @@ class NoDevicesFound(MbedDevicesError):
 
 class UnknownOSError(MbedDevicesError):
     """The current OS is not supported."""
+
+
+class DeviceServerError(MbedDevicesError):
+    """The devices server could not be started."""
+
+
+class DeviceWaitTimedOut(MbedDevicesError):
+    """A device was not connected or disconnected in the time given."""
@@ -2,21 +2,103 @@
 # Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
 # SPDX-License-Identifier: Apache-2.0
 #
-"""Helpers for json related functions."""
+"""Helpers for json related functions.
+
+JSON is decoded with the fastest backend available. If one of the optional packages `orjson`, `simdjson` or `ujson`
+is installed it is used, otherwise the standard library `json` module is used. The backend can be forced by setting
+the environment variable `MBED_TOOLS_JSON_BACKEND` to one of `orjson`, `simdjson`, `ujson` or `json`.
+
+`ujson` is used with `precise_float=True`, as by default it rounds some floats differently from the standard library.
+
+The accelerated backends are not as lenient as the standard library (for example they may reject `NaN` or very large
+integers), and they report errors differently. Whenever an accelerated backend fails to decode a document, the
+document is decoded again with the standard library, so the result and any `json.JSONDecodeError` raised are exactly
+what the standard library would produce.
+"""
+import functools
+import importlib
 import json
 import logging
+import os
 
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Optional, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
+JSON_BACKEND_ENV_VAR = "MBED_TOOLS_JSON_BACKEND"
+STDLIB_BACKEND = "json"
+ACCELERATED_BACKENDS = ("orjson", "simdjson", "ujson")
+
+_backend: Optional[Tuple[str, Callable[[Union[str, bytes]], Any]]] = None
+
 
 def decode_json_file(path: Path) -> Any:
     """Return the contents of json file."""
     try:
         logger.debug(f"Loading JSON file {path}")
-        return json.loads(path.read_text())
+        return decode_json(path.read_bytes())
     except json.JSONDecodeError:
         logger.error(f"Failed to decode JSON data in the file located at '{path}'")
         raise
+
+
+def decode_json(document: Union[str, bytes]) -> Any:
+    """Decode a JSON document using the selected backend.
+
+    Args:
+        document: The JSON document, as text or UTF-8 encoded bytes.
+
+    Raises:
+        json.JSONDecodeError: The document is not valid JSON.
+    """
+    name, loads = get_json_backend()
+    if name == STDLIB_BACKEND:
+        return json.loads(document)
+
+    try:
+        return loads(document)
+    except (ValueError, TypeError, OverflowError):
+        # Let the standard library decide, so the result and the error reported are the same as without the backend.
+        return json.loads(document)
+
+
+def get_json_backend() -> Tuple[str, Callable[[Union[str, bytes]], Any]]:
+    """Return the name and decode function of the JSON backend in use, selecting it on first use."""
+    global _backend
+    if _backend is None:
+        _backend = _select_backend(os.getenv(JSON_BACKEND_ENV_VAR, ""))
+        logger.debug("Using the '%s' JSON backend.", _backend[0])
+    return _backend
+
+
+def reset_json_backend() -> None:
+    """Forget the selected JSON backend, so it is selected again on next use."""
+    global _backend
+    _backend = None
+
+
+def _select_backend(requested: str) -> Tuple[str, Callable[[Union[str, bytes]], Any]]:
+    requested = requested.strip().lower()
+    if requested == STDLIB_BACKEND:
+        return STDLIB_BACKEND, json.loads
+
+    candidates: Tuple[str, ...] = ACCELERATED_BACKENDS
+    if requested:
+        if requested not in ACCELERATED_BACKENDS:
+            logger.warning(f"Unknown JSON backend '{requested}' requested, it will be ignored.")
+        else:
+            candidates = (requested,)
+
+    for name in candidates:
+        try:
+            module = importlib.import_module(name)
+        except ImportError:
+            if requested == name:
+                logger.warning(f"The requested JSON backend '{name}' is not installed, using the standard library.")
+            continue
+        if name == "ujson":
+            return name, functools.partial(module.loads, precise_float=True)
+        return name, module.loads
+
+    return STDLIB_BACKEND, json.loads
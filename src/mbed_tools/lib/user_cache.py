@@ -0,0 +1,66 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Helpers for locating the per-user cache directory used by mbed-tools."""
+import os
+import pathlib
+import platform
+import tempfile
+
+from typing import Union
+
+CACHE_DIR_ENV_VAR = "MBED_TOOLS_CACHE_DIR"
+APP_DIR_NAME = "mbed-tools"
+
+
+def get_user_cache_dir(*subdirs: str, create: bool = True) -> pathlib.Path:
+    """Return the path to the mbed-tools cache directory, creating it if it doesn't exist unless `create` is False.
+
+    The location can be overridden by setting the `MBED_TOOLS_CACHE_DIR` environment variable. Otherwise the platform
+    convention is followed: `%LOCALAPPDATA%` on Windows, `~/Library/Caches` on macOS and `$XDG_CACHE_HOME` (defaulting
+    to `~/.cache`) elsewhere.
+
+    Args:
+        subdirs: Optional path components to append to the cache directory.
+        create: Whether to create the directory.
+    """
+    cache_dir = _get_cache_root().joinpath(*subdirs)
+    if create:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+def write_cache_file(path: pathlib.Path, contents: Union[str, bytes]) -> None:
+    """Write a file in the cache so that concurrent readers never see it partially written.
+
+    The contents are written to a temporary file in the same directory, which then replaces `path`.
+
+    Raises:
+        OSError: the file could not be written.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    mode = "wb" if isinstance(contents, bytes) else "w"
+    with tempfile.NamedTemporaryFile(mode, dir=path.parent, delete=False) as temporary:
+        temporary.write(contents)
+    try:
+        os.replace(temporary.name, path)
+    except OSError:
+        os.unlink(temporary.name)
+        raise
+
+
+def _get_cache_root() -> pathlib.Path:
+    override = os.getenv(CACHE_DIR_ENV_VAR)
+    if override:
+        return pathlib.Path(override)
+
+    system = platform.system()
+    if system == "Windows":
+        local_app_data = os.getenv("LOCALAPPDATA", str(pathlib.Path.home() / "AppData" / "Local"))
+        return pathlib.Path(local_app_data, APP_DIR_NAME, "Cache")
+    if system == "Darwin":
+        return pathlib.Path.home() / "Library" / "Caches" / APP_DIR_NAME
+
+    xdg_cache_home = os.getenv("XDG_CACHE_HOME") or str(pathlib.Path.home() / ".cache")
+    return pathlib.Path(xdg_cache_home, APP_DIR_NAME)
@@ -15,6 +15,11 @@ ____________________
 For the interface to extract target data from their definitions in Mbed OS,
 look at `mbed_tools.targets.get_target`.
 
+Searching targets
+_________________
+
+For the interface to find the targets with particular attributes, look at `mbed_tools.targets.query_targets`.
+
 Configuration
 -------------
 
@@ -22,9 +27,11 @@ For details about configuration of this module, look at `mbed_tools.targets.conf
 """
 from mbed_tools.targets import exceptions
 from mbed_tools.targets.get_target import (
+    get_all_targets,
     get_target_by_name,
     get_target_by_board_type,
 )
+from mbed_tools.targets.query_targets import query_targets
 from mbed_tools.targets.get_board import (
     get_board_by_product_code,
     get_board_by_online_id,
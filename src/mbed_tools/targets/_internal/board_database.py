@@ -2,17 +2,30 @@
 # Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
 # SPDX-License-Identifier: Apache-2.0
 #
-"""Internal helper to retrieve target information from the online database."""
+"""Internal helper to retrieve target information from the online database.
 
+Responses from the online database are cached in the user's cache directory, along with their `ETag` and
+`Last-Modified` headers. A cached response younger than `MBED_DATABASE_CACHE_TTL` seconds is used as is. An older one
+is revalidated with a conditional request, so the database is only downloaded again when it has changed. If the online
+database can't be reached, an expired cached response is used rather than failing.
+
+The online database is requested at most once per process, all requests share one `requests.Session`.
+"""
+
+import hashlib
 import pathlib
+import threading
+import time
 from http import HTTPStatus
-import json
 from json.decoder import JSONDecodeError
+import json
 import logging
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, NamedTuple
 
 import requests
 
+from mbed_tools.lib.json_helpers import decode_json
+from mbed_tools.lib.user_cache import get_user_cache_dir, write_cache_file
 from mbed_tools.targets._internal.exceptions import ResponseJSONError, BoardAPIError
 
 from mbed_tools.targets.env import env
@@ -20,6 +33,7 @@ from mbed_tools.targets.env import env
 
 INTERNAL_PACKAGE_DIR = pathlib.Path(__file__).parent
 SNAPSHOT_FILENAME = "board_database_snapshot.json"
+ONLINE_DATABASE_CACHE_SUBDIR = "online-board-database"
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +45,10 @@ def get_board_database_path() -> pathlib.Path:
 
 _BOARD_API = "https://os.mbed.com/api/v4/targets"
 
+_session: Optional[requests.Session] = None
+_online_board_data: Dict[str, List[dict]] = {}
+_online_board_data_lock = threading.Lock()
+
 
 def get_offline_board_data() -> Any:
     """Loads board data from JSON stored in offline snapshot.
@@ -43,7 +61,7 @@ def get_offline_board_data() -> Any:
     """
     boards_snapshot_path = get_board_database_path()
     try:
-        return json.loads(boards_snapshot_path.read_text())
+        return decode_json(boards_snapshot_path.read_text())
     except JSONDecodeError as json_err:
         raise ResponseJSONError(f"Invalid JSON received from '{boards_snapshot_path}'.") from json_err
 
@@ -51,6 +69,8 @@ def get_offline_board_data() -> Any:
 def get_online_board_data() -> List[dict]:
     """Retrieves board data from the online API.
 
+    The data is retrieved once per process, from the response cache when it is fresh.
+
     Returns:
         The board database as retrieved from the boards API
 
@@ -58,24 +78,117 @@ def get_online_board_data() -> List[dict]:
         ResponseJSONError: error decoding the response JSON.
         BoardAPIError: error retrieving data from the board API.
     """
-    board_data: List[dict] = [{}]
-    response = _get_request()
+    cache_key = _get_cache_key()
+    with _online_board_data_lock:
+        if cache_key not in _online_board_data:
+            _online_board_data[cache_key] = _fetch_online_board_data(cache_key)
+        return _online_board_data[cache_key]
+
+
+def get_online_board_data_etag() -> Optional[str]:
+    """Return the ETag of the cached response from the online database, if there is one."""
+    return CachedResponse.load_etag(_get_cache_path(_get_cache_key()))
+
+
+def clear_online_board_data() -> None:
+    """Forget the online board data retrieved by this process, so it is retrieved again on next use."""
+    with _online_board_data_lock:
+        _online_board_data.clear()
+
+
+class CachedResponse(NamedTuple):
+    """A response from the online database stored in the cache."""
+
+    content: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+
+    @classmethod
+    def load(cls, path: pathlib.Path) -> Optional["CachedResponse"]:
+        """Load a cached response, returning None if there isn't a valid one."""
+        try:
+            header, _, content = path.read_bytes().partition(b"\n")
+            metadata = json.loads(header)
+            return cls(content, metadata.get("etag"), metadata.get("last_modified"), float(metadata["stored_at"]))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as err:
+            logger.debug("Ignoring unreadable cached response %s: %s", path, err)
+            return None
+
+    @staticmethod
+    def load_etag(path: pathlib.Path) -> Optional[str]:
+        """Return the ETag of a cached response without reading the response itself."""
+        try:
+            with path.open("rb") as cached_response:
+                etag = json.loads(cached_response.readline()).get("etag")
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, AttributeError) as err:
+            logger.debug("Ignoring unreadable cached response %s: %s", path, err)
+            return None
+        return etag if isinstance(etag, str) else None
+
+    def store(self, path: pathlib.Path) -> None:
+        """Store the response in the cache. Failing to write to the cache is not an error."""
+        metadata = {"etag": self.etag, "last_modified": self.last_modified, "stored_at": self.stored_at}
+        try:
+            # The metadata is written on the first line, it never contains a newline once encoded.
+            write_cache_file(path, json.dumps(metadata).encode() + b"\n" + self.content)
+        except OSError as err:
+            logger.debug("Failed to cache the response from the online database: %s", err)
+
+    def is_fresh(self) -> bool:
+        """Check the response is young enough to be used without revalidating it."""
+        return 0 <= time.time() - self.stored_at < env.MBED_DATABASE_CACHE_TTL
+
+
+def _fetch_online_board_data(cache_key: str) -> List[dict]:
+    cache_path = _get_cache_path(cache_key)
+    cached_response = CachedResponse.load(cache_path)
+    if cached_response and cached_response.is_fresh():
+        logger.debug("Using the cached response from the online database.")
+        return _extract_board_data(cached_response.content)
+
+    try:
+        response = _get_request(cached_response)
+    except BoardAPIError:
+        if cached_response is None:
+            raise
+        logger.warning("Using a cached copy of the online database, which may be out of date.")
+        return _extract_board_data(cached_response.content)
+
+    if response.status_code == HTTPStatus.NOT_MODIFIED and cached_response is not None:
+        logger.debug("The online database has not changed since it was cached.")
+        cached_response._replace(stored_at=time.time()).store(cache_path)
+        return _extract_board_data(cached_response.content)
+
     if response.status_code != HTTPStatus.OK:
         warning_msg = _response_error_code_to_str(response)
         logger.warning(warning_msg)
         logger.debug(f"Response received from API:\n{response.text}")
         raise BoardAPIError(warning_msg)
 
+    board_data = _extract_board_data(response.content, response.text)
+    CachedResponse(
+        response.content, response.headers.get("ETag"), response.headers.get("Last-Modified"), time.time()
+    ).store(cache_path)
+    return board_data
+
+
+def _extract_board_data(content: bytes, response_text: Optional[str] = None) -> List[dict]:
+    """Decode a response from the online database and return the board data it contains."""
     try:
-        json_data = response.json()
+        json_data = decode_json(content)
     except JSONDecodeError as json_err:
         warning_msg = f"Invalid JSON received from '{_BOARD_API}'."
         logger.warning(warning_msg)
-        logger.debug(f"Response received from API:\n{response.text}")
+        logger.debug(f"Response received from API:\n{response_text if response_text is not None else content!r}")
         raise ResponseJSONError(warning_msg) from json_err
 
     try:
-        board_data = json_data["data"]
+        board_data: List[dict] = json_data["data"]
     except KeyError as key_err:
         warning_msg = f"JSON received from '{_BOARD_API}' is missing the 'data' field."
         logger.warning(warning_msg)
@@ -86,6 +199,22 @@ def get_online_board_data() -> List[dict]:
     return board_data
 
 
+def _get_cache_key() -> str:
+    """Key for the online data, responses depend on the authentication token used to request them."""
+    return hashlib.sha256(f"{_BOARD_API}\n{env.MBED_API_AUTH_TOKEN}".encode()).hexdigest()
+
+
+def _get_cache_path(cache_key: str) -> pathlib.Path:
+    return get_user_cache_dir(ONLINE_DATABASE_CACHE_SUBDIR) / f"{cache_key}.response"
+
+
+def _get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        _session = requests.Session()
+    return _session
+
+
 def _response_error_code_to_str(response: requests.Response) -> str:
     if response.status_code == HTTPStatus.UNAUTHORIZED:
         return (
@@ -96,15 +225,23 @@ def _response_error_code_to_str(response: requests.Response) -> str:
         return f"An HTTP {response.status_code} was received from '{_BOARD_API}'."
 
 
-def _get_request() -> requests.Response:
-    """Make a GET request to the API, ensuring the correct headers are set."""
+def _get_request(cached_response: Optional[CachedResponse] = None) -> requests.Response:
+    """Make a GET request to the API, ensuring the correct headers are set.
+
+    Args:
+        cached_response: A cached response to revalidate, the request is made conditional on it having changed.
+    """
     header: Optional[Dict[str, str]] = None
     mbed_api_auth_token = env.MBED_API_AUTH_TOKEN
     if mbed_api_auth_token:
         header = {"Authorization": f"Bearer {mbed_api_auth_token}"}
+    if cached_response is not None and cached_response.etag:
+        header = {**(header or {}), "If-None-Match": cached_response.etag}
+    if cached_response is not None and cached_response.last_modified:
+        header = {**(header or {}), "If-Modified-Since": cached_response.last_modified}
 
     try:
-        return requests.get(_BOARD_API, headers=header)
+        return _get_session().get(_BOARD_API, headers=header)
     except requests.exceptions.ConnectionError as connection_error:
         if isinstance(connection_error, requests.exceptions.SSLError):
             logger.warning("Unable to verify an SSL certificate with requests.")
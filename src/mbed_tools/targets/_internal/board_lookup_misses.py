@@ -0,0 +1,102 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Persistent cache of board lookups which found no board.
+
+Devices which aren't in the board database are looked up again every time devices are detected, and each of those
+lookups falls back to loading the whole online database. Lookups which found nothing are recorded in the user's cache
+directory so the next ones can fail straight away.
+
+Every miss is recorded along with the version of the databases it was looked up in, made from the hash of the offline
+snapshot, the `ETag` of the cached online database and the database mode. When any of those change all of the recorded
+misses are dropped. Misses also expire after `MBED_DATABASE_CACHE_TTL` seconds, after which the online database is
+revalidated by the next lookup, so a board added to the online database is found once the cache expires.
+
+The cache is a single JSON file which is replaced atomically, so concurrent processes never read it partially
+written. Each miss is merged into the misses on disk as it is recorded, but the file isn't locked: when several
+processes record misses at the same time some may be lost, which only means those boards are looked up again.
+"""
+import hashlib
+import json
+import logging
+import pathlib
+import time
+
+from typing import Dict, Optional
+
+from mbed_tools.lib.user_cache import get_user_cache_dir, write_cache_file
+from mbed_tools.targets.env import env
+
+logger = logging.getLogger(__name__)
+
+CACHE_SUBDIR = "board-lookup-misses"
+CACHE_FILENAME = "misses.json"
+# Number of misses recorded, the oldest are dropped first.
+MAX_RECORDED_MISSES = 1024
+
+
+def get_database_version(snapshot_sha256: str, online_etag: Optional[str], database_mode: str) -> str:
+    """Return a string identifying the contents of the databases a lookup was made in.
+
+    Args:
+        snapshot_sha256: The SHA-256 hash of the offline database snapshot.
+        online_etag: The `ETag` of the cached online database, if there is one.
+        database_mode: The database mode the lookup was made in.
+    """
+    return hashlib.sha256(f"{snapshot_sha256}\n{online_etag or ''}\n{database_mode}".encode()).hexdigest()
+
+
+class BoardLookupMisses:
+    """On disk record of board lookups which found no board."""
+
+    def __init__(self, cache_file: Optional[pathlib.Path] = None, ttl: Optional[int] = None) -> None:
+        """Initialise the cache.
+
+        Args:
+            cache_file: File to record misses in, defaults to a file in the user's cache directory.
+            ttl: Number of seconds a miss is remembered for, defaults to `MBED_DATABASE_CACHE_TTL`.
+        """
+        self._cache_file = cache_file if cache_file is not None else get_user_cache_dir(CACHE_SUBDIR) / CACHE_FILENAME
+        self._ttl = ttl if ttl is not None else env.MBED_DATABASE_CACHE_TTL
+
+    def contains(self, key: str, database_version: str) -> bool:
+        """Check whether a lookup recently found no board in the given version of the databases."""
+        recorded_at = self._load(database_version).get(key)
+        return recorded_at is not None and 0 <= time.time() - recorded_at < self._ttl
+
+    def add(self, key: str, database_version: str) -> None:
+        """Record a lookup which found no board. Failing to write to the cache is not an error.
+
+        The recorded misses are read again and merged with the new one just before the file is replaced, so misses
+        recorded by other processes since are kept, except those recorded at the same time, which may be lost.
+        """
+        if self._ttl <= 0:
+            return
+
+        now = time.time()
+        misses = {
+            recorded_key: recorded_at
+            for recorded_key, recorded_at in self._load(database_version).items()
+            if 0 <= now - recorded_at < self._ttl
+        }
+        misses.pop(key, None)
+        misses[key] = now
+        newest = dict(list(misses.items())[-MAX_RECORDED_MISSES:])
+        try:
+            write_cache_file(self._cache_file, json.dumps({"database_version": database_version, "misses": newest}))
+        except OSError as err:
+            logger.debug("Failed to record board lookup miss in %s: %s", self._cache_file, err)
+
+    def _load(self, database_version: str) -> Dict[str, float]:
+        """Return the recorded misses, or no misses if they were recorded against another version of the databases."""
+        try:
+            contents = json.loads(self._cache_file.read_text())
+            if contents["database_version"] != database_version:
+                return {}
+            return {str(key): float(recorded_at) for key, recorded_at in contents["misses"].items()}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, TypeError, KeyError, AttributeError) as err:
+            logger.debug("Ignoring unreadable board lookup misses %s: %s", self._cache_file, err)
+            return {}
@@ -0,0 +1,179 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Pre-indexed SQLite form of the offline board database snapshot.
+
+Looking a board up in the JSON snapshot means decoding the whole file and creating a Board for every entry. The sync
+tooling also writes the snapshot to an SQLite database, with indexes on each of the identifiers boards are looked up
+by, so a lookup reads only the matching record.
+
+The database records the SHA-256 hash of the JSON snapshot it was created from. It is only used when that matches the
+JSON snapshot shipped alongside it, so a snapshot updated without regenerating the database can't give stale results.
+Callers should fall back to the JSON snapshot when the database can't be used.
+"""
+import hashlib
+import json
+import logging
+import pathlib
+import sqlite3
+import threading
+
+from dataclasses import asdict
+from typing import Iterable, Optional, Tuple
+
+from mbed_tools.targets.board import Board
+from mbed_tools.targets.exceptions import UnknownBoard
+from mbed_tools.targets._internal.board_database import INTERNAL_PACKAGE_DIR, get_board_database_path
+
+SNAPSHOT_INDEX_FILENAME = "board_database_snapshot.sqlite"
+SCHEMA_VERSION = "1"
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE boards (
+    position INTEGER PRIMARY KEY,
+    product_code TEXT NOT NULL,
+    slug TEXT NOT NULL,
+    target_type TEXT NOT NULL,
+    entry TEXT NOT NULL
+);
+CREATE TABLE jlink_aliases (alias TEXT NOT NULL, position INTEGER NOT NULL REFERENCES boards (position));
+CREATE INDEX boards_product_code ON boards (product_code, position);
+CREATE INDEX boards_online_id ON boards (slug, target_type, position);
+CREATE INDEX jlink_aliases_alias ON jlink_aliases (alias, position);
+"""
+
+
+def get_board_snapshot_index_path() -> pathlib.Path:
+    """Return the path to the pre-indexed offline board database."""
+    return pathlib.Path(INTERNAL_PACKAGE_DIR, "data", SNAPSHOT_INDEX_FILENAME)
+
+
+def write_board_snapshot_index(boards: Iterable[Board], snapshot_path: pathlib.Path, output_path: pathlib.Path) -> None:
+    """Write the pre-indexed form of a board database snapshot.
+
+    Args:
+        boards: The boards in the snapshot, in the same order.
+        snapshot_path: Path to the JSON snapshot the boards were saved to.
+        output_path: Path to write the database to, any existing file is replaced.
+    """
+    temporary_path = output_path.with_name(f"{output_path.name}.tmp")
+    if temporary_path.exists():
+        temporary_path.unlink()
+
+    connection = sqlite3.connect(str(temporary_path))
+    try:
+        with connection:
+            connection.executescript(_SCHEMA)
+            connection.executemany(
+                "INSERT INTO metadata VALUES (?, ?)",
+                [("schema_version", SCHEMA_VERSION), ("snapshot_sha256", _hash_file(snapshot_path))],
+            )
+            for position, board in enumerate(boards):
+                connection.execute(
+                    "INSERT INTO boards VALUES (?, ?, ?, ?, ?)",
+                    (
+                        position,
+                        board.product_code,
+                        board.slug.casefold(),
+                        board.target_type,
+                        json.dumps(asdict(board), separators=(",", ":")),
+                    ),
+                )
+                aliases = {alias.casefold() for alias in (board.slug, board.board_name, board.board_type)}
+                connection.executemany("INSERT INTO jlink_aliases VALUES (?, ?)", [(a, position) for a in aliases])
+        connection.execute("VACUUM")
+    finally:
+        connection.close()
+
+    temporary_path.replace(output_path)
+
+
+class BoardSnapshotIndex:
+    """Lookups of single boards in the pre-indexed offline board database."""
+
+    @classmethod
+    def open(
+        cls, index_path: Optional[pathlib.Path] = None, snapshot_path: Optional[pathlib.Path] = None
+    ) -> Optional["BoardSnapshotIndex"]:
+        """Open the pre-indexed database, if it exists and was created from the current JSON snapshot.
+
+        Args:
+            index_path: Path to the database, defaults to the one shipped with mbed-tools.
+            snapshot_path: Path to the JSON snapshot, defaults to the one shipped with mbed-tools.
+
+        Returns:
+            The index, or None if it can't be used and the JSON snapshot should be used instead.
+        """
+        index_path = index_path if index_path is not None else get_board_snapshot_index_path()
+        snapshot_path = snapshot_path if snapshot_path is not None else get_board_database_path()
+        if not index_path.exists():
+            logger.debug("No pre-indexed board database found at '%s'.", index_path)
+            return None
+
+        try:
+            # Lookups may be made from several threads, they are serialised with a lock.
+            connection = sqlite3.connect(f"{index_path.as_uri()}?mode=ro", uri=True, check_same_thread=False)
+            metadata = dict(connection.execute("SELECT key, value FROM metadata").fetchall())
+            snapshot_hash = _hash_file(snapshot_path)
+        except (sqlite3.Error, OSError) as err:
+            logger.debug("Unable to use the pre-indexed board database '%s': %s", index_path, err)
+            return None
+
+        if metadata.get("schema_version") != SCHEMA_VERSION or metadata.get("snapshot_sha256") != snapshot_hash:
+            logger.debug("The pre-indexed board database '%s' does not match the snapshot, ignoring it.", index_path)
+            connection.close()
+            return None
+
+        return cls(connection)
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        """Initialise with an open connection to the database."""
+        self._connection = connection
+        self._lock = threading.Lock()
+
+    def get_board_by_product_code(self, product_code: str) -> Board:
+        """Returns the first Board with the given product code.
+
+        Raises:
+            UnknownBoard: no board has the product code.
+        """
+        return self._get_board(
+            "SELECT entry FROM boards WHERE product_code = ? ORDER BY position LIMIT 1", (product_code,)
+        )
+
+    def get_board_by_online_id(self, slug: str, target_type: str) -> Board:
+        """Returns the first Board with the given slug, compared case insensitively, and target type.
+
+        Raises:
+            UnknownBoard: no board has the slug and target type.
+        """
+        return self._get_board(
+            "SELECT entry FROM boards WHERE slug = ? AND target_type = ? ORDER BY position LIMIT 1",
+            (slug.casefold(), target_type),
+        )
+
+    def get_board_by_jlink_slug(self, slug: str) -> Board:
+        """Returns the first Board whose slug, board_name or board_type matches the J-Link slug case insensitively.
+
+        Raises:
+            UnknownBoard: no board matches the slug.
+        """
+        return self._get_board(
+            "SELECT entry FROM jlink_aliases JOIN boards USING (position) WHERE alias = ? ORDER BY position LIMIT 1",
+            (slug.casefold(),),
+        )
+
+    def _get_board(self, query: str, parameters: Tuple[str, ...]) -> Board:
+        with self._lock:
+            row = self._connection.execute(query, parameters).fetchone()
+        if row is None:
+            raise UnknownBoard()
+        return Board.from_offline_board_entry(json.loads(row[0]))
+
+
+def _hash_file(path: pathlib.Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
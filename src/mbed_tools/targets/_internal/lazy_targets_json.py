@@ -0,0 +1,168 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Read-only view of targets.json which only decodes the target definitions that are used.
+
+targets.json defines hundreds of targets, but resolving the attributes of one target only needs the definitions of
+the target and its ancestors. The first time a targets.json file is seen, the byte offsets of every top level entry
+are recorded in an index, which is cached on disk under the hash of the file. Afterwards a target's definition is
+decoded from its slice of the file the first time it is accessed.
+
+Finding the end of each entry uses the standard library's C accelerated decoder, so building the index costs a full
+decode of the file. Scanning for the brackets and strings in Python would avoid building the values but is several
+times slower. Only the first run with a targets.json file pays for the index, later runs read it from the cache.
+"""
+import hashlib
+import json
+import logging
+import pathlib
+
+from json.decoder import scanstring  # type: ignore
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+
+from mbed_tools.lib.json_helpers import decode_json
+from mbed_tools.lib.user_cache import get_user_cache_dir, write_cache_file
+
+logger = logging.getLogger(__name__)
+
+INDEX_CACHE_SUBDIR = "targets-json-index"
+# Number of targets.json files (e.g. Mbed OS versions) indexes are kept for.
+MAX_CACHED_INDEXES = 8
+_WHITESPACE = " \t\n\r"
+
+
+class LazyTargetsJson(Mapping[str, Any]):
+    """Mapping of target name to target definition, decoding each definition on first access."""
+
+    def __init__(self, document: bytes, index: Dict[str, Tuple[int, int]]) -> None:
+        """Initialise the mapping.
+
+        Args:
+            document: The contents of the targets.json file.
+            index: Mapping of target name to the start and end byte offsets of its definition in `document`.
+        """
+        self._document = document
+        self._index = index
+        self._decoded: Dict[str, Any] = {}
+
+    @classmethod
+    def from_file(cls, path: pathlib.Path, cache_dir: Optional[pathlib.Path] = None) -> "LazyTargetsJson":
+        """Load a targets.json file, indexing it unless its index is in the cache.
+
+        Args:
+            path: Path to the targets.json file.
+            cache_dir: Directory to cache indexes in, defaults to a directory in the user's cache directory.
+
+        Raises:
+            FileNotFoundError: The file does not exist.
+            json.JSONDecodeError: The file is not a JSON object.
+        """
+        document = path.read_bytes()
+        cache_dir = cache_dir if cache_dir is not None else get_user_cache_dir(INDEX_CACHE_SUBDIR)
+        index_file = cache_dir / f"{hashlib.sha256(document).hexdigest()}.json"
+        index = _read_index(index_file)
+        if index is None:
+            logger.debug(f"Indexing targets in {path}")
+            try:
+                index = index_json_object(document)
+            except json.JSONDecodeError:
+                logger.error(f"Failed to decode JSON data in the file located at '{path}'")
+                raise
+            _write_index(index_file, index)
+
+        return cls(document, index)
+
+    def __getitem__(self, target_name: str) -> Any:
+        """Return the definition of a target, decoding it if it hasn't been accessed before."""
+        try:
+            return self._decoded[target_name]
+        except KeyError:
+            start, end = self._index[target_name]
+            definition = decode_json(self._document[start:end])
+            self._decoded[target_name] = definition
+            return definition
+
+    def __contains__(self, target_name: object) -> bool:
+        """Check a target is defined without decoding it."""
+        return target_name in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the names of the targets, in the order they are defined."""
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        """Return the number of targets defined."""
+        return len(self._index)
+
+
+def index_json_object(document: bytes) -> Dict[str, Tuple[int, int]]:
+    """Find the byte offsets of the value of each member of the JSON object in `document`.
+
+    Each value is decoded to find where it ends, and the result discarded. The values are decoded again when used.
+
+    Raises:
+        json.JSONDecodeError: The document is not a JSON object.
+    """
+    # Every byte maps to exactly one character in latin-1, so character offsets are byte offsets. The characters
+    # JSON's syntax is made of are all ASCII, so the structure is found correctly in UTF-8 encoded documents.
+    text = document.decode("latin-1")
+    decoder = json.JSONDecoder()
+    index: Dict[str, Tuple[int, int]] = {}
+    position = _expect(text, _skip_whitespace(text, 0), "{")
+    position = _skip_whitespace(text, position)
+    if position < len(text) and text[position] == "}":
+        return _check_end(text, position + 1, index)
+
+    while True:
+        key_start = _expect(text, position, '"')
+        key, position = scanstring(text, key_start)
+        if any(ord(character) > 127 for character in key):
+            key = decode_json(document[key_start - 1 : position])
+        position = _skip_whitespace(text, _expect(text, _skip_whitespace(text, position), ":"))
+        _, end = decoder.raw_decode(text, position)
+        index[key] = (position, end)
+        position = _skip_whitespace(text, end)
+        if position < len(text) and text[position] == "}":
+            return _check_end(text, position + 1, index)
+        position = _skip_whitespace(text, _expect(text, position, ","))
+
+
+def _expect(text: str, position: int, character: str) -> int:
+    """Check `character` is at `position`, returning the position following it."""
+    if position >= len(text) or text[position] != character:
+        raise json.JSONDecodeError(f"Expecting '{character}'", text, position)
+    return position + 1
+
+
+def _check_end(text: str, position: int, index: Dict[str, Tuple[int, int]]) -> Dict[str, Tuple[int, int]]:
+    """Check only whitespace follows the object, returning its index."""
+    if _skip_whitespace(text, position) != len(text):
+        raise json.JSONDecodeError("Extra data", text, position)
+    return index
+
+
+def _skip_whitespace(text: str, position: int) -> int:
+    while position < len(text) and text[position] in _WHITESPACE:
+        position += 1
+    return position
+
+
+def _read_index(index_file: pathlib.Path) -> Optional[Dict[str, Tuple[int, int]]]:
+    try:
+        return {name: (start, end) for name, (start, end) in json.loads(index_file.read_text()).items()}
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, TypeError, AttributeError) as err:
+        logger.debug("Ignoring unreadable targets.json index %s: %s", index_file, err)
+        return None
+
+
+def _write_index(index_file: pathlib.Path, index: Dict[str, Tuple[int, int]]) -> None:
+    try:
+        write_cache_file(index_file, json.dumps(index))
+        indexes = sorted(index_file.parent.glob("*.json"), key=lambda path: path.stat().st_mtime)
+        for old_index in indexes[:-MAX_CACHED_INDEXES]:
+            old_index.unlink()
+    except OSError as err:
+        logger.debug("Failed to cache targets.json index %s: %s", index_file, err)
@@ -9,7 +9,7 @@ found in the mbed-os repo.
 """
 import logging
 import pathlib
-from typing import Dict, Any, Set, Optional
+from typing import Dict, Any, List, Mapping, Set, Optional
 
 from mbed_tools.lib.exceptions import ToolsError
 from mbed_tools.lib.json_helpers import decode_json_file
@@ -17,6 +17,7 @@ from mbed_tools.lib.json_helpers import decode_json_file
 from mbed_tools.targets._internal.targets_json_parsers.accumulating_attribute_parser import (
     get_accumulating_attributes_for_target,
 )
+from mbed_tools.targets._internal.targets_json_parsers.hierarchy_resolver import TargetHierarchyResolver
 from mbed_tools.targets._internal.targets_json_parsers.overriding_attribute_parser import (
     get_overriding_attributes_for_target,
     get_labels_for_target,
@@ -40,7 +41,7 @@ class TargetNotFoundError(TargetAttributesError):
     """Target definition not found in targets.json."""
 
 
-def get_target_attributes(targets_json_data: dict, target_name: str) -> dict:
+def get_target_attributes(targets_json_data: Mapping[str, Any], target_name: str) -> dict:
     """Retrieves attribute data taken from targets.json for a single target.
 
     Args:
@@ -58,6 +59,44 @@ def get_target_attributes(targets_json_data: dict, target_name: str) -> dict:
     target_attributes["labels"] = get_labels_for_target(targets_json_data, target_name).union(
         _extract_core_labels(target_attributes.get("core", None))
     )
+    return _finalise_target_attributes(target_attributes)
+
+
+def get_all_target_attributes(targets_json_data: Mapping[str, Any]) -> Dict[str, dict]:
+    """Retrieves attribute data taken from targets.json for every public target.
+
+    The inheritance hierarchy is resolved once for all targets, each ancestor's attributes are only resolved once and
+    reused by its descendants. The result for each target is the same as `get_target_attributes` returns.
+
+    Args:
+        targets_json_data: target definitions from targets.json
+
+    Returns:
+        A dictionary mapping each public target's name to its attributes, in the order the targets are defined.
+
+    Raises:
+        ParsingTargetJSONError: a target inherits from a target which is not defined or inherits from itself.
+    """
+    resolver = TargetHierarchyResolver(targets_json_data)
+    core_labels = decode_json_file(MBED_OS_METADATA_FILE)["CORE_LABELS"]
+    all_target_attributes = {}
+    for target_name in _get_resolution_order(targets_json_data):
+        resolver.add_target(target_name)
+        if not targets_json_data[target_name].get("public", True):
+            continue
+
+        target_attributes = resolver.get_overriding_attributes(target_name)
+        target_attributes.update(resolver.get_accumulating_attributes(target_name))
+        target_attributes["labels"] = resolver.get_labels(target_name).union(
+            core_labels.get(target_attributes.get("core"), [])
+        )
+        all_target_attributes[target_name] = _finalise_target_attributes(target_attributes)
+
+    return {name: all_target_attributes[name] for name in targets_json_data if name in all_target_attributes}
+
+
+def _finalise_target_attributes(target_attributes: dict) -> dict:
+    """Convert the accumulated attributes to sets and apply the config overrides."""
     target_attributes["extra_labels"] = set(target_attributes.get("extra_labels", []))
     target_attributes["features"] = set(target_attributes.get("features", []))
     target_attributes["components"] = set(target_attributes.get("components", []))
@@ -68,7 +107,43 @@ def get_target_attributes(targets_json_data: dict, target_name: str) -> dict:
     return target_attributes
 
 
-def _extract_target_attributes(all_targets_data: Dict[str, Any], target_name: str) -> dict:
+def _get_resolution_order(all_targets_data: Mapping[str, Any]) -> List[str]:
+    """Order the targets so every target comes after all of its parents.
+
+    Args:
+        all_targets_data: a dictionary representation of the raw targets.json data.
+
+    Raises:
+        ParsingTargetsJSONError: a target inherits from a target which is not defined or inherits from itself.
+    """
+    order: List[str] = []
+    # A target maps to False while its parents are being visited and to True once it has been ordered.
+    visited: Dict[str, bool] = {}
+    for root in all_targets_data:
+        if root in visited:
+            continue
+
+        visited[root] = False
+        stack = [(root, iter(all_targets_data[root].get("inherits", [])))]
+        while stack:
+            target_name, parents = stack[-1]
+            parent = next(parents, None)
+            if parent is None:
+                stack.pop()
+                visited[target_name] = True
+                order.append(target_name)
+            elif parent not in all_targets_data:
+                raise ParsingTargetsJSONError(f"Target {target_name} inherits from undefined target {parent}.")
+            elif parent not in visited:
+                visited[parent] = False
+                stack.append((parent, iter(all_targets_data[parent].get("inherits", []))))
+            elif not visited[parent]:
+                raise ParsingTargetsJSONError(f"Circular inheritance found involving target {parent}.")
+
+    return order
+
+
+def _extract_target_attributes(all_targets_data: Mapping[str, Any], target_name: str) -> dict:
     """Extracts the definition for a particular target from all the targets in targets.json.
 
     Args:
@@ -126,7 +201,8 @@ def _apply_config_overrides(config: Dict[str, Any], overrides: Dict[str, Any]) -
     config = config.copy()
     for key in overrides:
         try:
-            config[key]["value"] = overrides[key]
+            # Copy the setting, the definition may be shared with other targets.
+            config[key] = {**config[key], "value": overrides[key]}
         except KeyError:
             logger.warning(
                 f"Cannot apply override {key}={overrides[key]}, there is no config setting defined matching that name."
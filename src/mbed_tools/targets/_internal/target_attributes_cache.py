@@ -0,0 +1,117 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Persistent cache of resolved target attributes.
+
+Resolving the attributes of a target means decoding the whole of targets.json and walking the target's inheritance
+hierarchy. The result only depends on the contents of targets.json, custom_targets.json and the targets metadata
+shipped with mbed-tools, so it is stored on disk under a key made from the hashes of those files. Any change to one
+of the files produces a different key, so stale entries are never returned. Entries are kept for a limited number
+of keys, the oldest are removed when that number is exceeded.
+
+Entries are stored as JSON, one file per target, in a directory named after the key. Attributes which are sets in
+the resolved data are stored as sorted lists and turned back into sets when read.
+"""
+import hashlib
+import json
+import logging
+import pathlib
+import shutil
+
+from typing import Any, Dict, Optional
+
+from mbed_tools.lib.user_cache import get_user_cache_dir, write_cache_file
+from mbed_tools.targets._internal.target_attributes import MBED_OS_METADATA_FILE
+
+logger = logging.getLogger(__name__)
+
+CACHE_SUBDIR = "target-attributes"
+# Increment when the way target attributes are resolved changes, so entries from older versions are not used.
+CACHE_FORMAT_VERSION = "1"
+SET_ATTRIBUTES = ("labels", "extra_labels", "features", "components", "macros")
+# Number of distinct sets of targets files (e.g. Mbed OS versions) entries are kept for.
+MAX_CACHED_KEYS = 8
+
+
+def get_target_attributes_cache_key(
+    targets_json_file: pathlib.Path, custom_targets_json_file: Optional[pathlib.Path] = None
+) -> str:
+    """Return a key identifying the contents of the files target attributes are resolved from.
+
+    Args:
+        targets_json_file: Path to Mbed OS's targets.json.
+        custom_targets_json_file: Path to the program's custom_targets.json, if any. A missing file is allowed.
+
+    Raises:
+        FileNotFoundError: targets.json does not exist.
+    """
+    digest = hashlib.sha256(CACHE_FORMAT_VERSION.encode())
+    for path in (targets_json_file, MBED_OS_METADATA_FILE):
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+
+    if custom_targets_json_file is not None and custom_targets_json_file.exists():
+        digest.update(hashlib.sha256(custom_targets_json_file.read_bytes()).digest())
+    else:
+        digest.update(b"no custom targets")
+
+    return digest.hexdigest()
+
+
+class TargetAttributesCache:
+    """On disk cache of resolved target attributes."""
+
+    def __init__(self, cache_dir: Optional[pathlib.Path] = None) -> None:
+        """Initialise the cache.
+
+        Args:
+            cache_dir: Directory to store the cache in, defaults to a directory in the user's cache directory.
+        """
+        self._cache_dir = cache_dir if cache_dir is not None else get_user_cache_dir(CACHE_SUBDIR)
+
+    def get(self, key: str, target_name: str) -> Optional[Dict[str, Any]]:
+        """Return the cached attributes of a target, or None if they are not in the cache."""
+        entry = self._get_entry_path(key, target_name)
+        try:
+            attributes: Dict[str, Any] = json.loads(entry.read_text())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as err:
+            logger.debug("Ignoring unreadable target attributes cache entry %s: %s", entry, err)
+            return None
+
+        for name in SET_ATTRIBUTES:
+            if name in attributes:
+                attributes[name] = set(attributes[name])
+
+        logger.debug("Using cached attributes for target '%s'", target_name)
+        return attributes
+
+    def store(self, key: str, target_name: str, attributes: Dict[str, Any]) -> None:
+        """Store the attributes of a target. Failing to write to the cache is not an error."""
+        serialisable = {
+            name: sorted(value) if name in SET_ATTRIBUTES and isinstance(value, set) else value
+            for name, value in attributes.items()
+        }
+        entry = self._get_entry_path(key, target_name)
+        try:
+            contents = json.dumps(serialisable)
+            if not entry.parent.exists():
+                entry.parent.mkdir(parents=True, exist_ok=True)
+                self._evict()
+            write_cache_file(entry, contents)
+        except (OSError, TypeError, ValueError) as err:
+            logger.debug("Failed to cache attributes for target '%s': %s", target_name, err)
+
+    def _evict(self) -> None:
+        """Remove the entries of the keys least recently written to, keeping at most `MAX_CACHED_KEYS`."""
+        key_dirs = sorted(
+            (path for path in self._cache_dir.iterdir() if path.is_dir()), key=lambda path: path.stat().st_mtime
+        )
+        for path in key_dirs[:-MAX_CACHED_KEYS]:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def _get_entry_path(self, key: str, target_name: str) -> pathlib.Path:
+        # Target names are used as file names, hash them so any character in a name is safe.
+        file_name = hashlib.sha256(target_name.encode()).hexdigest()
+        return self._cache_dir / key / f"{file_name}.json"
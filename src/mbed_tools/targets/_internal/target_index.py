@@ -0,0 +1,151 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Inverted index of the resolved attributes of every public target in targets.json.
+
+For each indexed attribute the index maps every value the attribute takes to the names of the targets which have
+it, so finding the targets with a combination of attributes is a handful of set operations rather than resolving
+every target. Building the index resolves all of the targets, so it is cached on disk under the same key the target
+attributes cache uses, which changes whenever targets.json or the targets metadata shipped with mbed-tools does.
+"""
+import json
+import logging
+import pathlib
+
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional
+
+from mbed_tools.lib.json_helpers import decode_json_file
+from mbed_tools.lib.user_cache import get_user_cache_dir, write_cache_file
+from mbed_tools.targets._internal.target_attributes import get_all_target_attributes
+from mbed_tools.targets._internal.target_attributes_cache import get_target_attributes_cache_key
+
+logger = logging.getLogger(__name__)
+
+INDEX_CACHE_SUBDIR = "target-index"
+# Number of targets.json files (e.g. Mbed OS versions) indexes are kept for.
+MAX_CACHED_INDEXES = 8
+INDEXED_ATTRIBUTES = (
+    "device_has",
+    "features",
+    "components",
+    "extra_labels",
+    "macros",
+    "core",
+    "supported_toolchains",
+    "c_lib",
+)
+
+
+class TargetIndex:
+    """Names of the targets having each value of the indexed attributes."""
+
+    def __init__(self, target_names: Iterable[str], postings: Dict[str, Dict[str, FrozenSet[str]]]) -> None:
+        """Initialise the index.
+
+        Args:
+            target_names: The names of all of the targets, in the order they are defined in targets.json.
+            postings: For each indexed attribute, mapping of each value to the names of the targets with that value.
+        """
+        self.target_names = list(target_names)
+        self._postings = postings
+
+    @classmethod
+    def from_target_attributes(cls, all_target_attributes: Mapping[str, Mapping[str, Any]]) -> "TargetIndex":
+        """Build the index from the resolved attributes of every target, keyed by target name."""
+        postings: Dict[str, Dict[str, set]] = {attribute: {} for attribute in INDEXED_ATTRIBUTES}
+        for target_name, attributes in all_target_attributes.items():
+            for attribute in INDEXED_ATTRIBUTES:
+                for value in _get_values(attributes.get(attribute)):
+                    postings[attribute].setdefault(value, set()).add(target_name)
+
+        return cls(
+            all_target_attributes,
+            {
+                attribute: {value: frozenset(names) for value, names in values.items()}
+                for attribute, values in postings.items()
+            },
+        )
+
+    @classmethod
+    def from_targets_json_file(
+        cls, targets_json_file: pathlib.Path, cache_dir: Optional[pathlib.Path] = None
+    ) -> "TargetIndex":
+        """Load the index of a targets.json file, building it unless it is in the cache.
+
+        Args:
+            targets_json_file: Path to the targets.json file.
+            cache_dir: Directory to cache indexes in, defaults to a directory in the user's cache directory.
+
+        Raises:
+            FileNotFoundError: The file does not exist.
+            TargetAttributesError: The target definitions could not be resolved.
+        """
+        cache_dir = cache_dir if cache_dir is not None else get_user_cache_dir(INDEX_CACHE_SUBDIR)
+        index_file = cache_dir / f"{get_target_attributes_cache_key(targets_json_file)}.json"
+        index = _read_index(index_file)
+        if index is None:
+            logger.debug(f"Indexing the attributes of the targets in {targets_json_file}")
+            index = cls.from_target_attributes(get_all_target_attributes(decode_json_file(targets_json_file)))
+            _write_index(index_file, index)
+
+        return index
+
+    def get_values(self, attribute: str) -> List[str]:
+        """Return the values the targets have for an indexed attribute, sorted."""
+        return sorted(self._postings[attribute])
+
+    def get_targets_with(self, attribute: str, value: str) -> FrozenSet[str]:
+        """Return the names of the targets whose indexed attribute has the given value."""
+        return self._postings[attribute].get(value, frozenset())
+
+    def to_json(self) -> str:
+        """Serialise the index to JSON."""
+        return json.dumps(
+            {
+                "targets": self.target_names,
+                "postings": {
+                    attribute: {value: sorted(names) for value, names in values.items()}
+                    for attribute, values in self._postings.items()
+                },
+            }
+        )
+
+    @classmethod
+    def from_json(cls, serialised: str) -> "TargetIndex":
+        """Deserialise an index serialised with `to_json`."""
+        contents = json.loads(serialised)
+        postings = {
+            attribute: {str(value): frozenset(names) for value, names in contents["postings"][attribute].items()}
+            for attribute in INDEXED_ATTRIBUTES
+        }
+        return cls(contents["targets"], postings)
+
+
+def _get_values(value: Any) -> List[str]:
+    """Return the values of an attribute which is either a single value or a collection of them."""
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [str(element) for element in value]
+    return [str(value)]
+
+
+def _read_index(index_file: pathlib.Path) -> Optional[TargetIndex]:
+    try:
+        return TargetIndex.from_json(index_file.read_text())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, TypeError, KeyError, AttributeError) as err:
+        logger.debug("Ignoring unreadable target index %s: %s", index_file, err)
+        return None
+
+
+def _write_index(index_file: pathlib.Path, index: TargetIndex) -> None:
+    try:
+        write_cache_file(index_file, index.to_json())
+        indexes = sorted(index_file.parent.glob("*.json"), key=lambda path: path.stat().st_mtime)
+        for old_index in indexes[:-MAX_CACHED_INDEXES]:
+            old_index.unlink()
+    except OSError as err:
+        logger.debug("Failed to cache target index %s: %s", index_file, err)
@@ -10,7 +10,7 @@ multiple inheritance, so targets at a lower level will always take precedence ov
 """
 import itertools
 from collections import deque
-from typing import Dict, List, Any, Deque
+from typing import Dict, List, Any, Deque, Mapping
 
 ACCUMULATING_ATTRIBUTES = ("extra_labels", "macros", "device_has", "features", "components")
 MODIFIERS = ("add", "remove")
@@ -19,7 +19,7 @@ ALL_ACCUMULATING_ATTRIBUTES = ACCUMULATING_ATTRIBUTES + tuple(
 )
 
 
-def get_accumulating_attributes_for_target(all_targets_data: Dict[str, Any], target_name: str) -> Dict[str, Any]:
+def get_accumulating_attributes_for_target(all_targets_data: Mapping[str, Any], target_name: str) -> Dict[str, Any]:
     """Parses the data for all targets and returns the accumulating attributes for the specified target.
 
     Args:
@@ -33,7 +33,7 @@ def get_accumulating_attributes_for_target(all_targets_data: Dict[str, Any], tar
     return _determine_accumulated_attributes(accumulating_order)
 
 
-def _targets_accumulate_hierarchy(all_targets_data: Dict[str, Any], target_name: str) -> List[dict]:
+def _targets_accumulate_hierarchy(all_targets_data: Mapping[str, Any], target_name: str) -> List[dict]:
     """List all ancestors of a target in order of accumulation inheritance (breadth-first).
 
     Using a breadth-first traverse of the inheritance tree, return a list of targets in the
@@ -178,7 +178,8 @@ def _calculate_attribute_for_target(
     Returns:
         A dictionary representation of a single accumulating attribute for that target
     """
-    starting_state = {attribute_name: target[attribute_name]}
+    # Copy the starting state, so the modifiers don't change the definition in the targets data.
+    starting_state = {attribute_name: list(target[attribute_name])}
     # Reduces the order list to only the targets in the hierarchy between the starting state and the target itself
     applicable_accumulation_order = targets_in_order[: targets_in_order.index(target)]
     return _calculate_attribute_elements(attribute_name, starting_state, applicable_accumulation_order)
@@ -0,0 +1,112 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Resolve the inherited attributes of many targets, reusing the results computed for their ancestors.
+
+The per-target parsers walk a target's whole inheritance hierarchy, so resolving every target in targets.json walks
+the common ancestors over and over again. Here targets are added in an order where every target comes after all of
+its parents, and the state resolved for each target is kept so its descendants can build on it:
+
+- Overriding attributes: the merged attributes of a target are its parents' merged attributes, last parent first,
+  updated with the target's own definition. This is the same as reducing the depth-first hierarchy from the right.
+- Labels: the labels of a target are its name plus the labels of its parents.
+- Accumulating attributes: the breadth-first hierarchy of a target with a single parent is the target followed by
+  the parent's hierarchy, so its accumulated attributes are the parent's with the target's modifiers applied. For a
+  target with several parents the breadth-first hierarchy is built level by level from the parents' hierarchies and
+  the attributes are accumulated from it.
+
+The resolved state is shared between descendants and must not be modified. The public methods return copies.
+"""
+from typing import Any, Dict, FrozenSet, List, Mapping, Set, Tuple
+
+from mbed_tools.targets._internal.targets_json_parsers.accumulating_attribute_parser import (
+    ACCUMULATING_ATTRIBUTES,
+    _calculate_attribute_elements,
+    _determine_accumulated_attributes,
+)
+from mbed_tools.targets._internal.targets_json_parsers.overriding_attribute_parser import (
+    MERGING_ATTRIBUTES,
+    _remove_unwanted_attributes,
+)
+
+
+class TargetHierarchyResolver:
+    """Resolves target attributes incrementally, one target at a time, parents before children."""
+
+    def __init__(self, all_targets_data: Mapping[str, Any]) -> None:
+        """Initialise the resolver.
+
+        Args:
+            all_targets_data: a dictionary representation of the contents of targets.json
+        """
+        self._all_targets_data = all_targets_data
+        self._overridden: Dict[str, Dict[str, Any]] = {}
+        self._merged: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._labels: Dict[str, FrozenSet[str]] = {}
+        self._accumulate_levels: Dict[str, Tuple[Tuple[str, ...], ...]] = {}
+        self._accumulated: Dict[str, Dict[str, List[Any]]] = {}
+
+    def add_target(self, target_name: str) -> None:
+        """Resolve the state of a target. All of the target's parents must have been added already.
+
+        Raises:
+            KeyError: a parent of the target has not been added.
+        """
+        target = self._all_targets_data[target_name]
+        parents = target.get("inherits", [])
+
+        overridden: Dict[str, Any] = {}
+        merged: Dict[str, Dict[str, Any]] = {attribute: {} for attribute in MERGING_ATTRIBUTES}
+        for parent in reversed(parents):
+            overridden.update(self._overridden[parent])
+            for attribute in MERGING_ATTRIBUTES:
+                merged[attribute].update(self._merged[parent][attribute])
+        overridden.update(target)
+        for attribute in MERGING_ATTRIBUTES:
+            merged[attribute].update(target.get(attribute, {}))
+        self._overridden[target_name] = overridden
+        self._merged[target_name] = merged
+
+        self._labels[target_name] = frozenset([target_name]).union(*(self._labels[parent] for parent in parents))
+
+        parent_levels = [self._accumulate_levels[parent] for parent in parents]
+        self._accumulate_levels[target_name] = ((target_name,),) + tuple(
+            tuple(name for levels in parent_levels if depth < len(levels) for name in levels[depth])
+            for depth in range(max((len(levels) for levels in parent_levels), default=0))
+        )
+        self._accumulated[target_name] = self._accumulate(target_name, target, parents)
+
+    def get_overriding_attributes(self, target_name: str) -> Dict[str, Any]:
+        """Return the overriding attributes of an added target, as `get_overriding_attributes_for_target` would."""
+        target_attributes = dict(self._overridden[target_name])
+        for attribute, merged_attribute_elements in self._merged[target_name].items():
+            if merged_attribute_elements:
+                target_attributes[attribute] = dict(merged_attribute_elements)
+        return _remove_unwanted_attributes(target_attributes)
+
+    def get_accumulating_attributes(self, target_name: str) -> Dict[str, Any]:
+        """Return the accumulating attributes of an added target, as `get_accumulating_attributes_for_target` would."""
+        return {attribute: list(elements) for attribute, elements in self._accumulated[target_name].items()}
+
+    def get_labels(self, target_name: str) -> Set[str]:
+        """Return the labels of an added target, as `get_labels_for_target` would."""
+        return set(self._labels[target_name])
+
+    def _accumulate(self, target_name: str, target: Dict[str, Any], parents: List[str]) -> Dict[str, List[Any]]:
+        if len(parents) > 1:
+            targets_in_order = [
+                self._all_targets_data[name] for level in self._accumulate_levels[target_name] for name in level
+            ]
+            return _determine_accumulated_attributes(targets_in_order)
+
+        inherited = self._accumulated[parents[0]] if parents else {}
+        accumulated: Dict[str, List[Any]] = {}
+        for attribute in ACCUMULATING_ATTRIBUTES:
+            if attribute in target:
+                # The nearest definition is the target's own, none of the target's modifiers apply to it.
+                accumulated[attribute] = target[attribute]
+            elif attribute in inherited:
+                starting_state = {attribute: list(inherited[attribute])}
+                accumulated.update(_calculate_attribute_elements(attribute, starting_state, [target]))
+        return accumulated
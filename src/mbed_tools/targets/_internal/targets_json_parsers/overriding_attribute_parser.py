@@ -20,7 +20,7 @@ This means a target on a higher level could potentially override one on a lower
 """
 from collections import deque
 from functools import reduce
-from typing import Dict, List, Any, Deque, Set
+from typing import Dict, List, Any, Deque, Mapping, Set
 
 from mbed_tools.targets._internal.targets_json_parsers.accumulating_attribute_parser import ALL_ACCUMULATING_ATTRIBUTES
 
@@ -28,7 +28,7 @@ MERGING_ATTRIBUTES = ("config", "overrides")
 NON_OVERRIDING_ATTRIBUTES = ALL_ACCUMULATING_ATTRIBUTES + ("public", "inherits")
 
 
-def get_overriding_attributes_for_target(all_targets_data: Dict[str, Any], target_name: str) -> Dict[str, Any]:
+def get_overriding_attributes_for_target(all_targets_data: Mapping[str, Any], target_name: str) -> Dict[str, Any]:
     """Parses the data for all targets and returns the overriding attributes for the specified target.
 
     Args:
@@ -42,7 +42,7 @@ def get_overriding_attributes_for_target(all_targets_data: Dict[str, Any], targe
     return _determine_overridden_attributes(override_order)
 
 
-def get_labels_for_target(all_targets_data: Dict[str, Any], target_name: str) -> Set[str]:
+def get_labels_for_target(all_targets_data: Mapping[str, Any], target_name: str) -> Set[str]:
     """The labels for a target are the names of all the boards (public and private) that the board inherits from.
 
     The order of these labels are not reflective of inheritance order.
@@ -58,7 +58,7 @@ def get_labels_for_target(all_targets_data: Dict[str, Any], target_name: str) ->
     return _extract_target_labels(targets_in_order, target_name)
 
 
-def _targets_override_hierarchy(all_targets_data: Dict[str, Any], target_name: str) -> List[dict]:
+def _targets_override_hierarchy(all_targets_data: Mapping[str, Any], target_name: str) -> List[dict]:
     """List all ancestors of a target in order of overriding inheritance (depth-first).
 
     Using a depth-first traverse of the inheritance tree, return a list of targets in the
@@ -7,7 +7,7 @@ import json
 
 from dataclasses import asdict
 from collections.abc import Set
-from typing import Iterator, Iterable, Any, Callable
+from typing import Iterator, Iterable, Any, Callable, Dict, FrozenSet, Optional, Tuple
 
 from mbed_tools.targets._internal import board_database
 
@@ -20,6 +20,8 @@ class Boards(Set):
 
     Boards is initialised with an Iterable[Board]. The classmethods
     can be used to construct Boards with data from either the online or offline database.
+
+    Looking boards up by product code, online id or J-Link slug uses an index which is built on the first lookup.
     """
 
     @classmethod
@@ -47,6 +49,8 @@ class Boards(Set):
             boards_data: iterable of board data from a board database source.
         """
         self._boards_data = tuple(boards_data)
+        self._index: Optional[_BoardIndex] = None
+        self._members: Optional[FrozenSet[Board]] = None
 
     def __iter__(self) -> Iterator["Board"]:
         """Yield an Board on each iteration."""
@@ -66,7 +70,9 @@ class Boards(Set):
         if not isinstance(board, Board):
             return False
 
-        return any(x == board for x in self)
+        if self._members is None:
+            self._members = frozenset(self._boards_data)
+        return board in self._members
 
     def get_board(self, matching: Callable) -> Board:
         """Returns first Board for which `matching` returns True.
@@ -82,6 +88,59 @@ class Boards(Set):
         except StopIteration:
             raise UnknownBoard()
 
+    def get_board_by_product_code(self, product_code: str) -> Board:
+        """Returns the first Board with the given product code.
+
+        Raises:
+            UnknownBoard: no board has the product code.
+        """
+        return self._lookup(self._get_index().by_product_code, product_code)
+
+    def get_board_by_online_id(self, slug: str, target_type: str) -> Board:
+        """Returns the first Board with the given slug, compared case insensitively, and target type.
+
+        Raises:
+            UnknownBoard: no board has the slug and target type.
+        """
+        return self._lookup(self._get_index().by_online_id, (slug.casefold(), target_type))
+
+    def get_board_by_jlink_slug(self, slug: str) -> Board:
+        """Returns the first Board whose slug, board_name or board_type matches the J-Link slug case insensitively.
+
+        Raises:
+            UnknownBoard: no board matches the slug.
+        """
+        return self._lookup(self._get_index().by_jlink_slug, slug.casefold())
+
     def json_dump(self) -> str:
         """Return the contents of the board database as a json string."""
         return json.dumps([asdict(b) for b in self], indent=4)
+
+    def _get_index(self) -> "_BoardIndex":
+        if self._index is None:
+            self._index = _BoardIndex(self._boards_data)
+        return self._index
+
+    @staticmethod
+    def _lookup(index: Dict[Any, Board], key: Any) -> Board:
+        try:
+            return index[key]
+        except KeyError:
+            raise UnknownBoard()
+
+
+class _BoardIndex:
+    """Boards keyed by each of the identifiers they are looked up by.
+
+    Where several boards share an identifier the first one wins, the same board a linear search would find.
+    """
+
+    def __init__(self, boards: Iterable[Board]) -> None:
+        self.by_product_code: Dict[str, Board] = {}
+        self.by_online_id: Dict[Tuple[str, str], Board] = {}
+        self.by_jlink_slug: Dict[str, Board] = {}
+        for board in boards:
+            self.by_product_code.setdefault(board.product_code, board)
+            self.by_online_id.setdefault((board.slug.casefold(), board.target_type), board)
+            for alias in (board.slug, board.board_name, board.board_type):
+                self.by_jlink_slug.setdefault(alias.casefold(), board)
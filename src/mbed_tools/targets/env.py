@@ -18,12 +18,17 @@ by any values previously set in your environment.
    Do not upload `.env` files containing private tokens to version control! If you use this package
    as a dependency of your project, please ensure to include the `.env` in your `.gitignore`.
 """
+import logging
 import os
 
 import dotenv
 
 dotenv.load_dotenv(dotenv.find_dotenv(usecwd=True))
 
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATABASE_CACHE_TTL = 24 * 60 * 60
+
 
 class Env:
     """Provides access to environment variables.
@@ -66,6 +71,28 @@ class Env:
         """
         return os.getenv("MBED_DATABASE_MODE", "AUTO")
 
+    @property
+    def MBED_DATABASE_CACHE_TTL(self) -> int:
+        """Number of seconds a downloaded copy of the online database is used for without checking for changes.
+
+        The online database is cached in the user's cache directory. Once the cached copy is older than
+        `MBED_DATABASE_CACHE_TTL` seconds, the online database is asked whether it has changed, and is only downloaded
+        again if it has. Set to 0 to check every time the online database is used.
+
+        Boards which could not be found in the board database are remembered for the same length of time, so they are
+        not searched for again until then, unless either database changes.
+
+        If `MBED_DATABASE_CACHE_TTL` is not set, it defaults to one day.
+        """
+        ttl = os.getenv("MBED_DATABASE_CACHE_TTL", "")
+        if not ttl:
+            return DEFAULT_DATABASE_CACHE_TTL
+        try:
+            return max(int(ttl), 0)
+        except ValueError:
+            logger.warning(f"Ignoring MBED_DATABASE_CACHE_TTL={ttl}, it is not a whole number of seconds.")
+            return DEFAULT_DATABASE_CACHE_TTL
+
 
 env = Env()
 """Instance of `Env` class."""
@@ -15,6 +15,10 @@ class TargetError(ToolsError):
     """Target definition cannot be retrieved."""
 
 
+class TargetQueryError(TargetError):
+    """A query for targets is invalid."""
+
+
 class UnknownBoard(MbedTargetsError):
     """Requested board was not found."""
 
@@ -6,14 +6,19 @@
 
 An instance of `mbed_tools.targets.board.Board` can be retrieved by calling one of the public functions.
 """
+import functools
+import hashlib
 import logging
 from enum import Enum
-from typing import Callable
+from typing import Any, Callable, Optional, Union
 
 from mbed_tools.targets.env import env
 from mbed_tools.targets.exceptions import UnknownBoard, UnsupportedMode, BoardDatabaseError
 from mbed_tools.targets.board import Board
 from mbed_tools.targets.boards import Boards
+from mbed_tools.targets._internal import board_database
+from mbed_tools.targets._internal.board_lookup_misses import BoardLookupMisses, get_database_version
+from mbed_tools.targets._internal.board_snapshot_index import BoardSnapshotIndex
 
 
 logger = logging.getLogger(__name__)
@@ -28,7 +33,11 @@ def get_board_by_product_code(product_code: str) -> Board:
     Raises:
         UnknownBoard: a board with a matching product code was not found.
     """
-    return get_board(lambda board: board.product_code == product_code)
+    return _lookup_board(
+        lambda boards: boards.get_board_by_product_code(product_code),
+        use_snapshot_index=True,
+        miss_key=f"product_code:{product_code}",
+    )
 
 
 def get_board_by_online_id(slug: str, target_type: str) -> Board:
@@ -41,8 +50,11 @@ def get_board_by_online_id(slug: str, target_type: str) -> Board:
     Raises:
         UnknownBoard: a board with a matching slug and target type could not be found.
     """
-    matched_slug = slug.casefold()
-    return get_board(lambda board: board.slug.casefold() == matched_slug and board.target_type == target_type)
+    return _lookup_board(
+        lambda boards: boards.get_board_by_online_id(slug, target_type),
+        use_snapshot_index=True,
+        miss_key=f"online_id:{slug.casefold()}/{target_type}",
+    )
 
 
 def get_board_by_jlink_slug(slug: str) -> Board:
@@ -58,9 +70,10 @@ def get_board_by_jlink_slug(slug: str) -> Board:
     Raises:
         UnknownBoard: a board matching the slug was not found.
     """
-    matched_slug = slug.casefold()
-    return get_board(
-        lambda board: any(matched_slug == c.casefold() for c in [board.slug, board.board_name, board.board_type])
+    return _lookup_board(
+        lambda boards: boards.get_board_by_jlink_slug(slug),
+        use_snapshot_index=True,
+        miss_key=f"jlink_slug:{slug.casefold()}",
     )
 
 
@@ -75,27 +88,96 @@ def get_board(matching: Callable) -> Board:
     Raises:
         UnknownBoard: a board matching the criteria could not be found in the board database.
     """
+    return _lookup_board(lambda boards: boards.get_board(matching))
+
+
+def _lookup_board(
+    lookup: Callable[[Any], Board], use_snapshot_index: bool = False, miss_key: Optional[str] = None
+) -> Board:
+    """Look a board up in the databases selected by the database mode configured in the environment.
+
+    Args:
+        lookup: A function which returns the board from a database, or raises UnknownBoard.
+        use_snapshot_index: Look the board up in the pre-indexed offline database, when it is available. The lookup
+            function must then only use the `get_board_by_*` methods, which it also provides.
+        miss_key: A key identifying the lookup. When given, lookups which use the online database and find no board
+            are recorded, and a repeated lookup fails without searching the databases until the record expires.
+
+    Raises:
+        UnknownBoard: the board could not be found in the board database.
+    """
     database_mode = _get_database_mode()
+    get_offline_boards = _get_indexed_offline_boards if use_snapshot_index else _get_all_offline_boards
 
     if database_mode == _DatabaseMode.OFFLINE:
         logger.info("Using the offline database (only) to identify boards.")
-        return Boards.from_offline_database().get_board(matching)
+        return lookup(get_offline_boards())
+
+    if miss_key is not None and BoardLookupMisses().contains(miss_key, _get_database_version(database_mode)):
+        logger.info("The board was not found in the board database recently, not searching again.")
+        raise UnknownBoard()
 
     if database_mode == _DatabaseMode.ONLINE:
         logger.info("Using the online database (only) to identify boards.")
-        return Boards.from_online_database().get_board(matching)
+        return _lookup_online_board(lookup, database_mode, miss_key)
     try:
         logger.info("Using the offline database to identify boards.")
-        return Boards.from_offline_database().get_board(matching)
+        return lookup(get_offline_boards())
     except UnknownBoard:
         logger.info("Unable to identify a board using the offline database, trying the online database.")
         try:
-            return Boards.from_online_database().get_board(matching)
+            return _lookup_online_board(lookup, database_mode, miss_key)
         except BoardDatabaseError:
             logger.error("Unable to access the online database to identify a board.")
             raise UnknownBoard()
 
 
+def _lookup_online_board(
+    lookup: Callable[[Any], Board], database_mode: "_DatabaseMode", miss_key: Optional[str]
+) -> Board:
+    """Look a board up in the online database, recording the lookup if it finds no board."""
+    try:
+        return lookup(_get_online_boards())
+    except UnknownBoard:
+        if miss_key is not None:
+            # Taken after the lookup, which may have revalidated the cached online database.
+            BoardLookupMisses().add(miss_key, _get_database_version(database_mode))
+        raise
+
+
+def _get_database_version(database_mode: "_DatabaseMode") -> str:
+    return get_database_version(
+        _get_offline_snapshot_sha256(), board_database.get_online_board_data_etag(), database_mode.name
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _get_offline_snapshot_sha256() -> str:
+    return hashlib.sha256(board_database.get_board_database_path().read_bytes()).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_all_offline_boards() -> Boards:
+    """Return the boards in the offline database, loading them the first time they are needed in the process."""
+    return Boards.from_offline_database()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_indexed_offline_boards() -> Union[Boards, BoardSnapshotIndex]:
+    """Return the pre-indexed offline database, or the boards in the offline database if it can't be used."""
+    index = BoardSnapshotIndex.open()
+    return index if index is not None else _get_all_offline_boards()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_online_boards() -> Boards:
+    """Return the boards in the online database, downloading them the first time they are needed in the process.
+
+    A failed download is not cached, it is attempted again on the next call.
+    """
+    return Boards.from_online_database()
+
+
 class _DatabaseMode(Enum):
     """Selected database mode."""
 
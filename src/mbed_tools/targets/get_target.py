@@ -7,11 +7,13 @@
 An instance of `mbed_tools.targets.target.Target`
 can be retrieved by calling one of the public functions.
 """
+from typing import Any, Dict, Mapping
+
 from mbed_tools.targets.exceptions import TargetError
 from mbed_tools.targets._internal import target_attributes
 
 
-def get_target_by_name(name: str, targets_json_data: dict) -> dict:
+def get_target_by_name(name: str, targets_json_data: Mapping[str, Any]) -> dict:
     """Returns a dictionary of attributes for the target whose name matches the name given.
 
     The target is as defined in the targets.json file found in the Mbed OS library.
@@ -29,7 +31,25 @@ def get_target_by_name(name: str, targets_json_data: dict) -> dict:
         raise TargetError(e) from e
 
 
-def get_target_by_board_type(board_type: str, targets_json_data: dict) -> dict:
+def get_all_targets(targets_json_data: Mapping[str, Any]) -> Dict[str, dict]:
+    """Returns a dictionary of attributes for every public target, keyed by target name.
+
+    This is much faster than calling `get_target_by_name` for each target, as the attributes each target inherits are
+    only resolved once.
+
+    Args:
+        targets_json_data: target definitions from targets.json
+
+    Raises:
+        TargetError: an error has occurred while fetching the targets
+    """
+    try:
+        return target_attributes.get_all_target_attributes(targets_json_data)
+    except (FileNotFoundError, target_attributes.TargetAttributesError) as e:
+        raise TargetError(e) from e
+
+
+def get_target_by_board_type(board_type: str, targets_json_data: Mapping[str, Any]) -> dict:
     """Returns the target whose name matches a board's build_type.
 
     The target is as defined in the targets.json file found in the Mbed OS library.
@@ -0,0 +1,83 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Interface for searching the targets in Mbed OS's targets.json by their attributes.
+
+A query is a list of terms, all of which a target must satisfy. Each term has the form `attribute=value`, where
+attribute is one of `QUERYABLE_ATTRIBUTES`. A term is satisfied by targets whose attribute has the value, or, for an
+attribute which is a list (e.g. `device_has`), contains it. A term can give several values separated by `|`, it is
+then satisfied by targets having any of them. Values may contain the shell-style wildcards `*`, `?` and `[...]`.
+Prefixing a term with `!` negates it.
+
+For example, the public targets with CAN, the BLE feature and a Cortex-M33 core:
+
+    query_targets(["device_has=CAN", "features=BLE", "core=Cortex-M33*"], targets_json_file)
+"""
+import fnmatch
+import pathlib
+
+from typing import FrozenSet, Iterable, List, Tuple
+
+from mbed_tools.targets.exceptions import TargetError, TargetQueryError
+from mbed_tools.targets._internal import target_attributes
+from mbed_tools.targets._internal.target_index import INDEXED_ATTRIBUTES, TargetIndex
+
+QUERYABLE_ATTRIBUTES = INDEXED_ATTRIBUTES
+_WILDCARDS = "*?["
+
+
+def query_targets(query: Iterable[str], targets_json_file: pathlib.Path) -> List[str]:
+    """Returns the names of the public targets which satisfy every term of a query.
+
+    The targets are returned in the order they are defined in targets.json. The first query of a targets.json file
+    resolves and indexes all of its targets, the index is cached so later queries are answered from it.
+
+    Args:
+        query: the terms of the query, see the module documentation for their syntax.
+        targets_json_file: path to Mbed OS's targets.json file.
+
+    Raises:
+        TargetQueryError: a term of the query is invalid.
+        TargetError: an error has occurred while indexing the targets
+    """
+    terms = [_parse_term(term) for term in query]
+
+    try:
+        index = TargetIndex.from_targets_json_file(targets_json_file)
+    except (FileNotFoundError, target_attributes.TargetAttributesError) as e:
+        raise TargetError(e) from e
+
+    matching = frozenset(index.target_names)
+    for negated, attribute, patterns in terms:
+        targets = _get_targets_matching(index, attribute, patterns)
+        matching = matching - targets if negated else matching & targets
+
+    return [name for name in index.target_names if name in matching]
+
+
+def _parse_term(term: str) -> Tuple[bool, str, List[str]]:
+    """Split a query term into whether it is negated, its attribute and its values."""
+    negated = term.startswith("!")
+    attribute, separator, values = term[1:].partition("=") if negated else term.partition("=")
+    attribute = attribute.strip()
+    if not separator or not values:
+        raise TargetQueryError(f"Invalid query term '{term}', terms have the form 'attribute=value'.")
+    if attribute not in QUERYABLE_ATTRIBUTES:
+        raise TargetQueryError(
+            f"Unable to query targets by '{attribute}', choose from: {', '.join(QUERYABLE_ATTRIBUTES)}."
+        )
+    return negated, attribute, [value.strip() for value in values.split("|")]
+
+
+def _get_targets_matching(index: TargetIndex, attribute: str, patterns: List[str]) -> FrozenSet[str]:
+    """Return the names of the targets whose attribute matches any of the patterns."""
+    targets: FrozenSet[str] = frozenset()
+    for pattern in patterns:
+        if any(wildcard in pattern for wildcard in _WILDCARDS):
+            for value in index.get_values(attribute):
+                if fnmatch.fnmatchcase(value, pattern):
+                    targets |= index.get_targets_with(attribute, value)
+        else:
+            targets |= index.get_targets_with(attribute, pattern)
+    return targets
@@ -0,0 +1,173 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+import subprocess
+
+from unittest import mock
+
+import git
+import pytest
+
+from mbed_tools.build._internal.affected_targets import find_affected_targets, get_changed_files
+from mbed_tools.build.exceptions import MbedBuildError
+
+TARGETS_OUTPUT = """\
+all: phony
+test-a: phony
+test-b: phony
+tests/test-a.elf: CXX_EXECUTABLE_LINKER__test-a_develop
+tests/test-b.elf: CXX_EXECUTABLE_LINKER__test-b_develop
+mbed-os/libmbed-os.a: CXX_STATIC_LIBRARY_LINKER__mbed-os_develop
+"""
+
+QUERY_OUTPUT = """\
+all:
+  input: phony
+    tests/test-a.elf
+    tests/test-b.elf
+test-a:
+  input: phony
+    tests/test-a.elf
+test-b:
+  input: phony
+    tests/test-b.elf
+tests/test-a.elf:
+  input: CXX_EXECUTABLE_LINKER__test-a_develop
+    CMakeFiles/test-a.dir/{src}/test_a.cpp.o
+    mbed-os/libmbed-os.a
+    || cmake_object_order_depends_target_test-a
+  outputs:
+    test-a
+tests/test-b.elf:
+  input: CXX_EXECUTABLE_LINKER__test-b_develop
+    CMakeFiles/test-b.dir/{src}/test_b.cpp.o
+  outputs:
+    test-b
+"""
+
+OBJECT_QUERY = """\
+CMakeFiles/test-a.dir/{src}/test_a.cpp.o:
+  input: CXX_COMPILER__test-a_develop
+    {src}/test_a.cpp
+  outputs:
+    tests/test-a.elf
+mbed-os/libmbed-os.a:
+  input: CXX_STATIC_LIBRARY_LINKER__mbed-os_develop
+    mbed-os/CMakeFiles/mbed-os.dir/{src}/drivers.cpp.o
+  outputs:
+    tests/test-a.elf
+CMakeFiles/test-b.dir/{src}/test_b.cpp.o:
+  input: CXX_COMPILER__test-b_develop
+    {src}/test_b.cpp
+  outputs:
+    tests/test-b.elf
+mbed-os/CMakeFiles/mbed-os.dir/{src}/drivers.cpp.o:
+  input: CXX_COMPILER__mbed-os_develop
+    {src}/drivers.cpp
+  outputs:
+    mbed-os/libmbed-os.a
+"""
+
+LEAF_QUERY = """\
+{path}:
+  outputs:
+    something.o
+"""
+
+DEPS_OUTPUT = """\
+CMakeFiles/test-a.dir/{src}/test_a.cpp.o: #deps 2, deps mtime 1 (VALID)
+    {src}/test_a.cpp
+    {src}/a.h
+
+CMakeFiles/test-b.dir/{src}/test_b.cpp.o: #deps 2, deps mtime 1 (VALID)
+    {src}/test_b.cpp
+    {src}/b.h
+
+mbed-os/CMakeFiles/mbed-os.dir/{src}/drivers.cpp.o: #deps 2, deps mtime 1 (VALID)
+    {src}/drivers.cpp
+    {src}/drivers.h
+
+"""
+
+
+@pytest.fixture
+def repo(tmp_path):
+    src = tmp_path / "src"
+    repo = git.Repo.init(str(src))
+    for name in ("test_a.cpp", "test_b.cpp", "a.h", "b.h", "drivers.cpp", "drivers.h"):
+        (src / name).write_text(name)
+    repo.index.add(["test_a.cpp", "test_b.cpp", "a.h", "b.h", "drivers.cpp", "drivers.h"])
+    repo.index.commit("Initial commit", author=git.Actor("a", "a@a.com"), committer=git.Actor("a", "a@a.com"))
+    return src
+
+
+@pytest.fixture
+def fake_ninja(repo):
+    query_blocks = _split_query_blocks(QUERY_OUTPUT.format(src=repo) + OBJECT_QUERY.format(src=repo))
+
+    def run(args, **kwargs):
+        tool, nodes = args[4], args[5:]
+        if tool == "targets":
+            stdout = TARGETS_OUTPUT
+        elif tool == "deps":
+            stdout = DEPS_OUTPUT.format(src=repo)
+        else:
+            stdout = "".join(query_blocks.get(node, LEAF_QUERY.format(path=node)) for node in nodes)
+        return subprocess.CompletedProcess(args, 0, stdout=stdout)
+
+    with mock.patch("mbed_tools.build._internal.affected_targets.subprocess.run", side_effect=run) as ninja:
+        yield ninja
+
+
+def _split_query_blocks(output):
+    blocks = {}
+    current = None
+    for line in output.splitlines(keepends=True):
+        if not line.startswith(" "):
+            current = line.rstrip().rstrip(":")
+            blocks[current] = ""
+        blocks[current] += line
+    return blocks
+
+
+class TestFindAffectedTargets:
+    def test_returns_target_depending_on_changed_source(self, repo, fake_ninja, tmp_path):
+        (repo / "test_b.cpp").write_text("changed")
+
+        assert find_affected_targets(tmp_path / "build", repo, "HEAD") == ["test-b"]
+
+    def test_returns_targets_depending_on_changed_header(self, repo, fake_ninja, tmp_path):
+        (repo / "a.h").write_text("changed")
+
+        assert find_affected_targets(tmp_path / "build", repo, "HEAD") == ["test-a"]
+
+    def test_returns_targets_depending_on_changed_library_source(self, repo, fake_ninja, tmp_path):
+        (repo / "drivers.h").write_text("changed")
+
+        assert find_affected_targets(tmp_path / "build", repo, "HEAD") == ["test-a"]
+
+    def test_returns_nothing_when_no_changes(self, repo, fake_ninja, tmp_path):
+        assert find_affected_targets(tmp_path / "build", repo, "HEAD") == []
+        fake_ninja.assert_not_called()
+
+    def test_treats_objects_without_deps_as_affected(self, repo, fake_ninja, tmp_path):
+        (repo / "unrelated.txt").write_text("new")
+        with mock.patch("mbed_tools.build._internal.affected_targets._parse_deps", return_value={}):
+            assert find_affected_targets(tmp_path / "build", repo, "HEAD") == ["test-a", "test-b"]
+
+
+class TestGetChangedFiles:
+    def test_includes_modified_and_untracked_files(self, repo):
+        (repo / "a.h").write_text("changed")
+        (repo / "new.h").write_text("new")
+
+        assert get_changed_files(repo, "HEAD") == {str(repo / "a.h"), str(repo / "new.h")}
+
+    def test_raises_for_unknown_ref(self, repo):
+        with pytest.raises(MbedBuildError, match="unknown-ref"):
+            get_changed_files(repo, "unknown-ref")
+
+    def test_raises_when_not_in_git_repo(self, tmp_path):
+        with pytest.raises(MbedBuildError, match="not in a git repository"):
+            get_changed_files(tmp_path, "HEAD")
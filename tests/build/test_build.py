@@ -8,7 +8,13 @@ from unittest import mock
 
 import pytest
 
-from mbed_tools.build.build import build_project, generate_build_system
+from mbed_tools.build.build import (
+    build_affected_targets,
+    build_project,
+    clean_build_tree,
+    generate_build_system,
+    remove_stale_build_trees,
+)
 from mbed_tools.build.exceptions import MbedBuildError
 
 
@@ -36,6 +42,81 @@ class TestBuildProject:
             build_project(build_dir="cmake_build")
 
 
+class TestBuildAffectedTargets:
+    @mock.patch("mbed_tools.build.build.find_affected_targets", autospec=True)
+    def test_builds_affected_targets_in_one_invocation(self, find_affected_targets, subprocess_run, tmp_path):
+        (tmp_path / ".ninja_deps").touch()
+        find_affected_targets.return_value = ["test-a", "test-b"]
+
+        assert build_affected_targets(tmp_path, tmp_path, "origin/master") == ["test-a", "test-b"]
+
+        find_affected_targets.assert_called_once_with(tmp_path, tmp_path, "origin/master")
+        subprocess_run.assert_called_with(
+            ["cmake", "--build", str(tmp_path), "--target", "test-a", "test-b"], check=True
+        )
+
+    @mock.patch("mbed_tools.build.build.find_affected_targets", autospec=True)
+    def test_does_not_build_when_no_targets_affected(self, find_affected_targets, subprocess_run, tmp_path):
+        (tmp_path / ".ninja_deps").touch()
+        find_affected_targets.return_value = []
+
+        assert build_affected_targets(tmp_path, tmp_path, "origin/master") == []
+
+        subprocess_run.assert_called_once()  # Only the check for ninja
+
+    @mock.patch("mbed_tools.build.build.find_affected_targets", autospec=True)
+    def test_builds_everything_without_dependency_information(self, find_affected_targets, subprocess_run, tmp_path):
+        build_affected_targets(tmp_path, tmp_path, "origin/master")
+
+        find_affected_targets.assert_not_called()
+        subprocess_run.assert_called_with(["cmake", "--build", str(tmp_path)], check=True)
+
+
+class TestCleanBuildTree:
+    def test_build_tree_renamed_then_deleted_in_background(self, tmp_path):
+        build_dir = tmp_path / "cmake_build" / "GCC_ARM"
+        (build_dir / "mbed-os").mkdir(parents=True)
+        (build_dir / "mbed-os" / "obj.o").touch()
+
+        with mock.patch("mbed_tools.build.build.threading.Thread", autospec=True) as thread:
+            clean_build_tree(build_dir)
+
+            assert not build_dir.exists()
+            tombstones = thread.call_args[1]["args"][0]
+            assert len(tombstones) == 1 and tombstones[0].exists()
+            thread.return_value.start.assert_called_once()
+
+        clean_build_tree(build_dir).join()
+
+        assert list(build_dir.parent.iterdir()) == []
+
+    def test_stale_tombstones_are_deleted(self, tmp_path):
+        build_dir = tmp_path / "GCC_ARM"
+        build_dir.mkdir()
+        stale_tombstone = tmp_path / ".GCC_ARM.deleted-1234"
+        (stale_tombstone / "mbed-os").mkdir(parents=True)
+        other_build_tree_tombstone = tmp_path / ".ARM.deleted-1234"
+        other_build_tree_tombstone.mkdir()
+
+        remove_stale_build_trees(build_dir).join()
+
+        assert build_dir.exists()
+        assert not stale_tombstone.exists()
+        assert other_build_tree_tombstone.exists()
+
+    def test_no_thread_started_when_nothing_to_delete(self, tmp_path):
+        assert clean_build_tree(tmp_path / "GCC_ARM") is None
+
+    @mock.patch("mbed_tools.build.build.os.replace", side_effect=OSError)
+    def test_deletes_in_place_when_rename_fails(self, _, tmp_path):
+        build_dir = tmp_path / "GCC_ARM"
+        build_dir.mkdir()
+
+        clean_build_tree(build_dir)
+
+        assert not build_dir.exists()
+
+
 class TestConfigureProject:
     def test_invokes_cmake_with_correct_args(self, subprocess_run):
         source_dir = "source_dir"
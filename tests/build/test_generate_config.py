@@ -7,6 +7,8 @@ import json
 import os
 import pytest
 
+from unittest import mock
+
 from mbed_tools.project import MbedProgram
 from mbed_tools.build import generate_config
 from mbed_tools.build.config import CMAKE_CONFIG_FILE, MBEDIGNORE_FILE
@@ -542,3 +544,32 @@ def test_forced_reset_timeout_set(program):
     config_text = (program.files.cmake_build_dir / CMAKE_CONFIG_FILE).read_text()
 
     assert 'MBED_GREENTEA_TEST_RESET_TIMEOUT "20"' in config_text
+
+
+def test_warm_configure_uses_cached_target_attributes(program):
+    first_config, _ = generate_config("K64F", "GCC_ARM", program)
+
+    with mock.patch("mbed_tools.build.config._load_raw_targets_data") as load_raw_targets_data:
+        config, _ = generate_config("K64F", "GCC_ARM", program)
+
+    load_raw_targets_data.assert_not_called()
+    assert config == first_config
+
+
+def test_target_attributes_resolved_again_when_targets_json_changes(program):
+    generate_config("K64F", "GCC_ARM", program)
+    program.mbed_os.targets_json_file.write_text(
+        json.dumps({target: {**TARGET_DATA, "macros": ["NEW_MACRO"]} for target in TARGETS})
+    )
+
+    config, _ = generate_config("K64F", "GCC_ARM", program)
+
+    assert "NEW_MACRO" in config["macros"]
+
+
+def test_custom_target_inherits_from_target_in_targets_json(program):
+    program.files.custom_targets_json.write_text(json.dumps({"IMAGINARYBOARD": {"inherits": ["K64F"]}}))
+
+    config, _ = generate_config("IMAGINARYBOARD", "GCC_ARM", program)
+
+    assert "CPU_MK64FN1M0VMD12" in config["macros"]
@@ -0,0 +1,110 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+import os
+
+import git
+import pytest
+
+from mbed_tools.build._internal.config.config import Config
+from mbed_tools.build._internal.config.source import ConfigSetting
+from mbed_tools.build.mbed_os_cache import MbedOsObjectCache, get_mbed_os_cache_key
+
+
+@pytest.fixture
+def mbed_os_repo(tmp_path):
+    root = tmp_path / "mbed-os"
+    repo = git.Repo.init(str(root))
+    (root / "README.md").write_text("mbed-os")
+    repo.index.add(["README.md"])
+    repo.index.commit("Initial commit", author=git.Actor("a", "a@a.com"), committer=git.Actor("a", "a@a.com"))
+    return root
+
+
+@pytest.fixture
+def config():
+    return Config(
+        {
+            "config": [ConfigSetting(namespace="target", name="foo", value="1")],
+            "macros": {"B", "A", "C"},
+            "labels": {"K64F", "CORTEX_M"},
+        }
+    )
+
+
+def make_build_tree(root, contents="obj"):
+    (root / "mbed-os" / "drivers").mkdir(parents=True)
+    (root / "mbed-os" / "drivers" / "Serial.o").write_text(contents)
+    (root / ".ninja_log").write_text("# ninja log v5\n")
+    (root / ".ninja_deps").write_bytes(b"# ninjadeps\n")
+    return root
+
+
+class TestGetMbedOsCacheKey:
+    def test_key_is_stable_for_same_inputs(self, config, mbed_os_repo):
+        key = get_mbed_os_cache_key(config, "GCC_ARM", "develop", mbed_os_repo)
+
+        assert key is not None
+        assert key == get_mbed_os_cache_key(Config(dict(config)), "gcc_arm", "develop", mbed_os_repo)
+
+    def test_key_changes_with_config(self, config, mbed_os_repo):
+        key = get_mbed_os_cache_key(config, "GCC_ARM", "develop", mbed_os_repo)
+        config["macros"] = {"D"}
+
+        assert key != get_mbed_os_cache_key(config, "GCC_ARM", "develop", mbed_os_repo)
+
+    def test_key_changes_with_toolchain_and_profile(self, config, mbed_os_repo):
+        key = get_mbed_os_cache_key(config, "GCC_ARM", "develop", mbed_os_repo)
+
+        assert key != get_mbed_os_cache_key(config, "ARM", "develop", mbed_os_repo)
+        assert key != get_mbed_os_cache_key(config, "GCC_ARM", "release", mbed_os_repo)
+
+    def test_returns_none_if_mbed_os_is_not_a_git_repo(self, config, tmp_path):
+        assert get_mbed_os_cache_key(config, "GCC_ARM", "develop", tmp_path) is None
+
+    def test_returns_none_if_mbed_os_has_local_modifications(self, config, mbed_os_repo):
+        (mbed_os_repo / "README.md").write_text("modified")
+
+        assert get_mbed_os_cache_key(config, "GCC_ARM", "develop", mbed_os_repo) is None
+
+
+class TestMbedOsObjectCache:
+    def test_seeds_build_tree_from_stored_objects(self, tmp_path):
+        cache = MbedOsObjectCache(tmp_path / "cache")
+        (tmp_path / "cache").mkdir()
+        cache.store("key", make_build_tree(tmp_path / "build1"))
+        new_build_tree = tmp_path / "build2"
+
+        assert cache.seed("key", new_build_tree)
+        assert (new_build_tree / "mbed-os" / "drivers" / "Serial.o").read_text() == "obj"
+        assert (new_build_tree / ".ninja_log").exists()
+        assert (new_build_tree / ".ninja_deps").exists()
+
+    def test_seed_returns_false_for_unknown_key(self, tmp_path):
+        cache = MbedOsObjectCache(tmp_path)
+
+        assert not cache.seed("key", tmp_path / "build")
+        assert not (tmp_path / "build").exists()
+
+    def test_does_not_seed_build_tree_with_existing_outputs(self, tmp_path):
+        cache = MbedOsObjectCache(tmp_path / "cache")
+        (tmp_path / "cache").mkdir()
+        cache.store("key", make_build_tree(tmp_path / "build1"))
+
+        assert not cache.seed("key", make_build_tree(tmp_path / "build2", contents="new"))
+        assert (tmp_path / "build2" / "mbed-os" / "drivers" / "Serial.o").read_text() == "new"
+
+    def test_evicts_least_recently_used_entries(self, tmp_path):
+        cache_dir = tmp_path / "cache"
+        cache_dir.mkdir()
+        cache = MbedOsObjectCache(cache_dir, max_size=150)
+        cache.store("old", make_build_tree(tmp_path / "build1", contents="a" * 40))
+        cache.store("used", make_build_tree(tmp_path / "build2", contents="b" * 40))
+        os.utime(str(cache_dir / "old" / "size"), (0, 0))
+        os.utime(str(cache_dir / "used" / "size"), (1, 1))
+        cache.seed("used", tmp_path / "build3")
+
+        cache.store("new", make_build_tree(tmp_path / "build4", contents="c" * 40))
+
+        assert sorted(p.name for p in cache_dir.iterdir()) == ["new", "used"]
@@ -231,6 +231,60 @@ class TestBuildCommand(TestCase):
             generate_build_system.assert_called_once_with(program.root, program.files.cmake_build_dir, "develop")
             self.assertFalse(program.files.cmake_build_dir.exists())
 
+    @mock.patch("mbed_tools.cli.build.get_mbed_os_cache_key")
+    @mock.patch("mbed_tools.cli.build.MbedOsObjectCache")
+    def test_new_build_tree_seeded_from_and_stored_in_mbed_os_cache(
+        self, mbed_os_cache, get_mbed_os_cache_key, generate_config, mbed_program, build_project, generate_build_system
+    ):
+        program = mbed_program.from_existing()
+        with mock_project_directory(program, mbed_config_exists=True, build_tree_exists=False):
+            config = mock.MagicMock()
+            generate_config.return_value = [config, mock.MagicMock()]
+            get_mbed_os_cache_key.return_value = "key"
+
+            CliRunner().invoke(build, DEFAULT_BUILD_ARGS)
+
+            get_mbed_os_cache_key.assert_called_once_with(config, "GCC_ARM", "develop", program.mbed_os.root)
+            mbed_os_cache().seed.assert_called_once_with("key", program.files.cmake_build_dir)
+            mbed_os_cache().store.assert_called_once_with("key", program.files.cmake_build_dir)
+
+    @mock.patch("mbed_tools.cli.build.get_mbed_os_cache_key")
+    @mock.patch("mbed_tools.cli.build.MbedOsObjectCache")
+    def test_mbed_os_cache_not_used_when_no_mbed_os_cache_flag_passed(
+        self, mbed_os_cache, get_mbed_os_cache_key, generate_config, mbed_program, build_project, generate_build_system
+    ):
+        program = mbed_program.from_existing()
+        with mock_project_directory(program, mbed_config_exists=True, build_tree_exists=False):
+            generate_config.return_value = [mock.MagicMock(), mock.MagicMock()]
+
+            CliRunner().invoke(build, ["--no-mbed-os-cache", *DEFAULT_BUILD_ARGS])
+
+            get_mbed_os_cache_key.assert_not_called()
+            mbed_os_cache.assert_not_called()
+            build_project.assert_called_once_with(program.files.cmake_build_dir)
+
+    @mock.patch("mbed_tools.cli.build.build_affected_targets")
+    def test_only_affected_targets_built_when_changed_since_passed(
+        self, build_affected_targets, generate_config, mbed_program, build_project, generate_build_system
+    ):
+        program = mbed_program.from_existing()
+        with mock_project_directory(program, mbed_config_exists=True, build_tree_exists=True):
+            generate_config.return_value = [mock.MagicMock(), mock.MagicMock()]
+
+            CliRunner().invoke(build, ["--changed-since", "origin/master", *DEFAULT_BUILD_ARGS])
+
+            build_affected_targets.assert_called_once_with(program.files.cmake_build_dir, program.root, "origin/master")
+            build_project.assert_not_called()
+
+    def test_raises_if_changed_since_passed_with_flash(
+        self, generate_config, mbed_program, build_project, generate_build_system
+    ):
+        result = CliRunner().invoke(build, ["--changed-since", "origin/master", "--flash", *DEFAULT_BUILD_ARGS])
+
+        self.assertIsNotNone(result.exception)
+        self.assertRegex(result.output, "--changed-since")
+        build_project.assert_not_called()
+
     @mock.patch("mbed_tools.cli.build.flash_binary")
     @mock.patch("mbed_tools.cli.build.find_all_connected_devices")
     def test_build_flash_options_bin_target(
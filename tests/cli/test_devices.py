@@ -0,0 +1,26 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+from unittest import mock
+
+from click.testing import CliRunner
+
+from mbed_tools.cli.devices import devices
+
+
+@mock.patch("mbed_tools.cli.devices.serve_connected_devices")
+class TestServe:
+    def test_serves_connected_devices(self, serve_connected_devices):
+        result = CliRunner().invoke(devices, ["serve"])
+
+        assert result.exit_code == 0
+        serve_connected_devices.assert_called_once_with()
+
+    def test_stops_quietly_when_interrupted(self, serve_connected_devices):
+        serve_connected_devices.side_effect = KeyboardInterrupt
+
+        result = CliRunner().invoke(devices, ["serve"])
+
+        assert result.exit_code == 0
+        assert result.output == ""
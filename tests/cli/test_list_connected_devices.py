@@ -2,15 +2,16 @@
 # Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
 # SPDX-License-Identifier: Apache-2.0
 #
+import dataclasses
 import json
 import pathlib
 import pytest
 from click.testing import CliRunner
-from mbed_tools.devices.device import ConnectedDevices
+from mbed_tools.devices.device import ConnectedDevices, DeviceEvent
 from mbed_tools.targets import Board
 from unittest import mock
 
-from mbed_tools.cli.list_connected_devices import list_connected_devices
+from mbed_tools.cli.list_connected_devices import _get_devices_ids, _stream_ndjson_output, list_connected_devices
 from mbed_tools.devices import Device
 
 
@@ -282,3 +283,184 @@ class TestListConnectedDevicesJSONOutput:
         assert result.exit_code == 0
         for actual, expected in zip(json.loads(result.output), expected_output):
             assert actual["mbed_board"]["build_targets"] == expected["build_targets"]
+
+
+class TestGetDevicesIds:
+    def test_numbers_each_group_of_boards_with_the_same_name_from_zero(self):
+        devices = [
+            create_fake_device(serial_number="1", board_name="A"),
+            create_fake_device(serial_number="2", board_name="A"),
+            create_fake_device(serial_number="3", board_name="B"),
+            create_fake_device(serial_number="4", board_name="C"),
+            create_fake_device(serial_number="5", board_name="C"),
+        ]
+
+        assert [id for id, _ in _get_devices_ids(devices)] == [0, 1, None, 0, 1]
+
+    def test_reads_each_board_name_a_fixed_number_of_times(self):
+        reads = []
+
+        class CountingBoard:
+            def __init__(self, board_name):
+                self._board_name = board_name
+
+            @property
+            def board_name(self):
+                reads.append(self._board_name)
+                return self._board_name
+
+        devices = [mock.Mock(mbed_board=CountingBoard(f"Board{number % 10}")) for number in range(500)]
+
+        _get_devices_ids(devices)
+
+        assert len(reads) == 2 * len(devices)
+
+
+class TestStreamNDJSONOutput:
+    def test_gives_same_ids_as_table_output(self):
+        devices = [
+            create_fake_device(serial_number="1", board_name="A"),
+            create_fake_device(serial_number="2", board_name="B"),
+            create_fake_device(serial_number="3", board_name="A"),
+            create_fake_device(serial_number="4", board_name="C"),
+            create_fake_device(serial_number="5", board_name="A"),
+            create_fake_device(serial_number="6", board_name="C"),
+        ]
+        table_order = sorted(devices, key=lambda device: (device.mbed_board.board_name, device.serial_number))
+        expected = {device.serial_number: id for id, device in _get_devices_ids(table_order)}
+
+        lines = [json.loads(line) for line in _stream_ndjson_output(devices)]
+
+        assert sorted(line["serial_number"] for line in lines) == ["1", "2", "3", "4", "5", "6"]
+        for line in lines:
+            id = expected[line["serial_number"]]
+            suffix = "" if id is None else f"[{id}]"
+            assert line["mbed_board"]["build_targets"][-1] == f"BoardType{suffix}"
+
+    def test_yields_devices_without_waiting_for_later_ones(self):
+        consumed = []
+
+        def devices():
+            for serial_number in "123":
+                consumed.append(serial_number)
+                yield create_fake_device(serial_number=serial_number, board_name="A")
+
+        lines = _stream_ndjson_output(devices())
+
+        assert json.loads(next(lines))["serial_number"] == "1"
+        assert json.loads(next(lines))["serial_number"] == "2"
+        assert consumed == ["1", "2"]
+
+
+@pytest.fixture
+def iter_connected_devices():
+    with mock.patch("mbed_tools.cli.list_connected_devices.iter_connected_devices") as iter_devices:
+        yield iter_devices
+
+
+class TestListConnectedDevicesNDJSONOutput:
+    def test_prints_a_line_of_json_for_each_mbed_board(self, iter_connected_devices):
+        unidentified = create_fake_device(serial_number="1")
+        identified = dataclasses.replace(create_fake_device(serial_number="2"), mbed_enabled=True)
+        iter_connected_devices.return_value = iter([unidentified, identified])
+
+        result = CliRunner().invoke(list_connected_devices, "--format=ndjson")
+
+        assert result.exit_code == 0
+        assert [json.loads(line)["serial_number"] for line in result.output.splitlines()] == ["2"]
+
+    def test_prints_every_device_when_showing_all(self, iter_connected_devices):
+        iter_connected_devices.return_value = iter(
+            [create_fake_device(serial_number="1"), create_fake_device(serial_number="2", board_name="Other")]
+        )
+
+        result = CliRunner().invoke(list_connected_devices, ["--format=ndjson", "--show-all"])
+
+        assert result.exit_code == 0
+        assert [json.loads(line)["serial_number"] for line in result.output.splitlines()] == ["1", "2"]
+
+    def test_prints_nothing_when_no_devices_connected(self, iter_connected_devices):
+        iter_connected_devices.return_value = iter([])
+
+        result = CliRunner().invoke(list_connected_devices, "--format=ndjson")
+
+        assert result.exit_code == 0
+        assert result.output == ""
+
+
+@pytest.fixture
+def watch_connected_devices():
+    with mock.patch("mbed_tools.cli.list_connected_devices.watch_connected_devices") as watch:
+        yield watch
+
+
+class TestListConnectedDevicesWatch:
+    def test_prints_a_line_of_json_for_each_event(self, watch_connected_devices):
+        device = dataclasses.replace(create_fake_device(), mbed_enabled=True)
+        moved = dataclasses.replace(device, mount_points=(pathlib.Path("/media/you/ELSEWHERE"),))
+        watch_connected_devices.return_value = [
+            DeviceEvent("add", device, 0),
+            DeviceEvent("change", moved, 1.5),
+            DeviceEvent("remove", moved, 2),
+        ]
+
+        result = CliRunner().invoke(list_connected_devices, "--watch")
+
+        assert result.exit_code == 0
+        events = [json.loads(line) for line in result.output.splitlines()]
+        assert [event["event"] for event in events] == ["add", "change", "remove"]
+        assert [event["timestamp"] for event in events] == [
+            "1970-01-01T00:00:00+00:00",
+            "1970-01-01T00:00:01.500000+00:00",
+            "1970-01-01T00:00:02+00:00",
+        ]
+        assert events[1]["device"]["mount_points"] == ["/media/you/ELSEWHERE"]
+        assert events[0]["device"]["mbed_board"]["build_targets"] == ["BoardType_NS", "BoardType_S", "BoardType"]
+
+    def test_only_reports_mbed_boards_unless_showing_all(self, watch_connected_devices):
+        unidentified = create_fake_device(serial_number="1")
+        identified = dataclasses.replace(create_fake_device(serial_number="2"), mbed_enabled=True)
+        no_longer_identified = dataclasses.replace(identified, mbed_enabled=False)
+        watch_connected_devices.return_value = [
+            DeviceEvent("add", unidentified, 0),
+            DeviceEvent("add", identified, 0),
+            DeviceEvent("change", no_longer_identified, 1),
+            DeviceEvent("remove", unidentified, 2),
+        ]
+
+        result = CliRunner().invoke(list_connected_devices, "--watch")
+
+        events = [json.loads(line) for line in result.output.splitlines()]
+        assert [(event["event"], event["device"]["serial_number"]) for event in events] == [
+            ("add", "2"),
+            ("remove", "2"),
+        ]
+
+        result = CliRunner().invoke(list_connected_devices, ["--watch", "--show-all"])
+
+        events = [json.loads(line) for line in result.output.splitlines()]
+        assert [(event["event"], event["device"]["serial_number"]) for event in events] == [
+            ("add", "1"),
+            ("add", "2"),
+            ("change", "2"),
+            ("remove", "1"),
+        ]
+
+    def test_numbers_identical_boards(self, watch_connected_devices):
+        first = dataclasses.replace(create_fake_device(serial_number="1"), mbed_enabled=True)
+        second = dataclasses.replace(create_fake_device(serial_number="2"), mbed_enabled=True)
+        watch_connected_devices.return_value = [DeviceEvent("add", first, 0), DeviceEvent("add", second, 0)]
+
+        result = CliRunner().invoke(list_connected_devices, "--watch")
+
+        events = [json.loads(line) for line in result.output.splitlines()]
+        assert events[0]["device"]["mbed_board"]["build_targets"][-1] == "BoardType"
+        assert events[1]["device"]["mbed_board"]["build_targets"][-1] == "BoardType[1]"
+
+    def test_stops_quietly_when_interrupted(self, watch_connected_devices):
+        watch_connected_devices.side_effect = KeyboardInterrupt
+
+        result = CliRunner().invoke(list_connected_devices, "--watch")
+
+        assert result.exit_code == 0
+        assert result.output == ""
@@ -0,0 +1,45 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+import json
+import pathlib
+
+from unittest import TestCase, mock
+
+from click.testing import CliRunner
+
+from mbed_tools.cli.targets import targets
+
+
+@mock.patch("mbed_tools.cli.targets.query_targets", return_value=["K64F", "NUCLEO_F429ZI"])
+@mock.patch("mbed_tools.cli.targets.MbedProgram")
+class TestQueryCommand(TestCase):
+    def test_queries_targets_of_program(self, program, query_targets):
+        result = CliRunner().invoke(targets, ["query", "device_has=CAN", "!features=BLE"])
+
+        self.assertEqual(result.exit_code, 0)
+        program.from_existing.assert_called_once_with(pathlib.Path("."), pathlib.Path())
+        query_targets.assert_called_once_with(
+            ("device_has=CAN", "!features=BLE"), program.from_existing().mbed_os.targets_json_file
+        )
+        self.assertEqual(result.output, "K64F\nNUCLEO_F429ZI\n")
+
+    def test_uses_mbed_os_path(self, program, query_targets):
+        CliRunner().invoke(targets, ["query", "--mbed-os-path", "extern/mbed-os", "core=Cortex-M4"])
+
+        program.from_existing.assert_called_once_with(
+            pathlib.Path("."), pathlib.Path(), pathlib.Path("extern", "mbed-os")
+        )
+
+    def test_prints_json(self, program, query_targets):
+        result = CliRunner().invoke(targets, ["query", "--format", "json", "core=Cortex-M4"])
+
+        self.assertEqual(json.loads(result.output), ["K64F", "NUCLEO_F429ZI"])
+
+    def test_reports_no_matching_targets(self, program, query_targets):
+        query_targets.return_value = []
+
+        result = CliRunner().invoke(targets, ["query", "core=Cortex-M4"])
+
+        self.assertEqual(result.output, "No targets match the query.\n")
@@ -0,0 +1,133 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Tests for `mbed_tools.completion.entry_point`."""
+from unittest import mock
+
+import pytest
+
+from mbed_tools.cli.main import cli
+from mbed_tools.completion import entry_point
+from mbed_tools.completion.entry_point import complete_mbed_target, get_completions, main
+
+# Completion requests are only answered using the protocol introduced in click 8.
+shell_completion = pytest.importorskip("click.shell_completion")
+
+
+@pytest.fixture
+def mbed_target_completions():
+    with mock.patch.object(entry_point, "get_mbed_target_completions", return_value=["K64F", "K66F"]) as completions:
+        yield completions
+
+
+@pytest.fixture
+def completion_request(monkeypatch):
+    monkeypatch.setattr("sys.argv", ["mbed-tools"])
+
+    def request(instruction, words, cword):
+        monkeypatch.setenv("_MBED_TOOLS_COMPLETE", instruction)
+        monkeypatch.setenv("COMP_WORDS", words)
+        monkeypatch.setenv("COMP_CWORD", cword)
+
+    return request
+
+
+class TestGetCompletions:
+    @pytest.mark.parametrize(
+        "args, targets, devices",
+        [
+            (["configure", "-t", "GCC_ARM", "-m"], True, False),
+            (["-vv", "compile", "--mbed-target"], True, True),
+            (["sterm", "-m"], False, True),
+        ],
+    )
+    def test_completes_mbed_target(self, args, targets, devices, mbed_target_completions):
+        assert get_completions(args, "K6") == ["K64F", "K66F"]
+
+        mbed_target_completions.assert_called_once_with("K6", targets=targets, devices=devices)
+
+    def test_passes_program_paths(self, mbed_target_completions):
+        get_completions(
+            ["compile", "-p", "app", "--mbed-os-path", "os", "--custom-targets-json", "custom.json", "-m"], ""
+        )
+
+        mbed_target_completions.assert_called_once_with(
+            "", targets=True, devices=True, program_path="app", mbed_os_path="os", custom_targets_json="custom.json"
+        )
+
+    def test_ignores_sterm_port(self, mbed_target_completions):
+        get_completions(["sterm", "-p", "/dev/ttyACM0", "-m"], "")
+
+        mbed_target_completions.assert_called_once_with("", targets=False, devices=True)
+
+    @pytest.mark.parametrize(
+        "args", [[], ["-v"], ["configure"], ["configure", "-t"], ["detect", "-m"], ["new", "-m"]],
+    )
+    def test_leaves_other_arguments_to_click(self, args, mbed_target_completions):
+        assert get_completions(args, "") is None
+
+
+class TestCompleteMbedTarget:
+    def test_writes_completions_for_bash(self, completion_request, mbed_target_completions, capsys):
+        completion_request("bash_complete", "mbed-tools configure -m K6", "3")
+
+        assert complete_mbed_target()
+        assert capsys.readouterr().out == "plain,K64F\nplain,K66F\n"
+
+    def test_writes_completions_for_zsh(self, completion_request, mbed_target_completions, capsys):
+        completion_request("zsh_complete", "mbed-tools configure -m K6", "3")
+
+        assert complete_mbed_target()
+        assert capsys.readouterr().out == "plain\nK64F\n_\nplain\nK66F\n_\n"
+
+    def test_leaves_other_requests_to_click(self, completion_request, mbed_target_completions, capsys):
+        completion_request("bash_complete", "mbed-tools conf", "1")
+
+        assert not complete_mbed_target()
+
+        completion_request("source_bash", "", "")
+
+        assert not complete_mbed_target()
+        assert capsys.readouterr().out == ""
+
+    def test_does_nothing_without_completion_request(self, monkeypatch):
+        monkeypatch.delenv("_MBED_TOOLS_COMPLETE", raising=False)
+
+        assert not complete_mbed_target()
+
+
+class TestMain:
+    def test_runs_cli_unless_completion_was_answered(self):
+        with mock.patch.object(entry_point, "complete_mbed_target", return_value=False), mock.patch(
+            "mbed_tools.cli.main.cli"
+        ) as cli:
+            main()
+
+        cli.assert_called_once()
+
+    def test_does_not_run_cli_when_completion_was_answered(self):
+        with mock.patch.object(entry_point, "complete_mbed_target", return_value=True), mock.patch(
+            "mbed_tools.cli.main.cli"
+        ) as cli:
+            main()
+
+        cli.assert_not_called()
+
+
+class TestClickCompletion:
+    @pytest.mark.parametrize(
+        "args, targets, devices",
+        [(["configure", "-m"], True, False), (["compile", "-m"], True, True), (["sterm", "-m"], False, True)],
+    )
+    def test_commands_complete_mbed_target(self, args, targets, devices):
+        with mock.patch(
+            "mbed_tools.completion.click_options.get_mbed_target_completions", return_value=["K64F"]
+        ) as completions:
+            completion = shell_completion.ShellComplete(cli, {}, "mbed-tools", "_MBED_TOOLS_COMPLETE")
+            items = completion.get_completions(args, "K6")
+
+        assert [item.value for item in items] == ["K64F"]
+        assert completions.call_args[0] == ("K6",)
+        assert completions.call_args[1]["targets"] is targets
+        assert completions.call_args[1]["devices"] is devices
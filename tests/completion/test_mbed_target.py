@@ -0,0 +1,138 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Tests for `mbed_tools.completion.mbed_target`."""
+import json
+
+from unittest import mock
+
+import pytest
+
+from mbed_tools.completion import mbed_target
+from mbed_tools.completion.mbed_target import (
+    get_connected_device_names,
+    get_device_names,
+    get_mbed_target_completions,
+    get_public_target_names,
+)
+
+TARGETS = {"Target": {"public": False}, "K64F": {"inherits": ["Target"]}, "K66F": {}, "NUCLEO_F401RE": {}}
+
+
+@pytest.fixture
+def program(tmp_path):
+    (tmp_path / "mbed-os.lib").write_text("https://github.com/ARMmbed/mbed-os")
+    targets_json = tmp_path / "mbed-os" / "targets" / "targets.json"
+    targets_json.parent.mkdir(parents=True)
+    targets_json.write_text(json.dumps(TARGETS))
+    return tmp_path
+
+
+@pytest.fixture
+def connected_device_names():
+    with mock.patch.object(mbed_target, "get_connected_device_names") as get_connected_device_names:
+        yield get_connected_device_names
+
+
+class TestGetMbedTargetCompletions:
+    def test_completes_public_target_names_case_insensitively(self, program):
+        assert get_mbed_target_completions("k6", program_path=str(program)) == ["K64F", "K66F"]
+
+    def test_finds_program_root_from_subdirectory(self, program):
+        subdirectory = program / "source"
+        subdirectory.mkdir()
+
+        assert get_mbed_target_completions("NUC", program_path=str(subdirectory)) == ["NUCLEO_F401RE"]
+
+    def test_completes_custom_targets(self, program):
+        (program / "custom_targets.json").write_text(json.dumps({"K64F_CUSTOM": {"inherits": ["K64F"]}}))
+
+        assert get_mbed_target_completions("K64", program_path=str(program)) == ["K64F", "K64F_CUSTOM"]
+
+    def test_uses_given_paths(self, program, tmp_path):
+        custom_targets_json = tmp_path / "elsewhere.json"
+        custom_targets_json.write_text(json.dumps({"MY_BOARD": {}}))
+
+        assert get_mbed_target_completions(
+            "", mbed_os_path=str(program / "mbed-os"), custom_targets_json=str(custom_targets_json)
+        ) == ["K64F", "K66F", "NUCLEO_F401RE", "MY_BOARD"]
+
+    def test_completes_nothing_outside_a_program(self, tmp_path):
+        assert get_mbed_target_completions("", program_path=str(tmp_path)) == []
+
+    def test_completes_connected_device_names(self, program, connected_device_names):
+        connected_device_names.return_value = ["K64F", "NUCLEO_F401RE[0]", "NUCLEO_F401RE[1]"]
+
+        assert get_mbed_target_completions("nucleo", targets=False, devices=True) == [
+            "NUCLEO_F401RE[0]",
+            "NUCLEO_F401RE[1]",
+        ]
+
+    def test_does_not_repeat_names_of_targets_and_devices(self, program, connected_device_names):
+        connected_device_names.return_value = ["K64F", "K66F[0]", "K66F[1]"]
+
+        assert get_mbed_target_completions("K6", devices=True, program_path=str(program)) == [
+            "K64F",
+            "K66F",
+            "K66F[0]",
+            "K66F[1]",
+        ]
+
+
+class TestGetPublicTargetNames:
+    def test_names_are_cached_by_hash_of_targets_json(self, program, tmp_path):
+        targets_json = program / "mbed-os" / "targets" / "targets.json"
+        get_public_target_names(targets_json, cache_dir=tmp_path / "cache")
+
+        with mock.patch.object(mbed_target, "decode_json") as decode_json:
+            names = get_public_target_names(targets_json, cache_dir=tmp_path / "cache")
+
+        decode_json.assert_not_called()
+        assert names == ["K64F", "K66F", "NUCLEO_F401RE"]
+
+    def test_names_are_refreshed_when_targets_json_changes(self, program, tmp_path):
+        targets_json = program / "mbed-os" / "targets" / "targets.json"
+        get_public_target_names(targets_json, cache_dir=tmp_path / "cache")
+        targets_json.write_text(json.dumps({"DISCO_L475VG_IOT01A": {}}))
+
+        assert get_public_target_names(targets_json, cache_dir=tmp_path / "cache") == ["DISCO_L475VG_IOT01A"]
+
+    def test_returns_no_names_for_unreadable_targets_json(self, tmp_path):
+        (tmp_path / "targets.json").write_text("{")
+
+        assert get_public_target_names(tmp_path / "targets.json", cache_dir=tmp_path / "cache") == []
+        assert get_public_target_names(tmp_path / "missing.json", cache_dir=tmp_path / "cache") == []
+
+
+class TestGetConnectedDeviceNames:
+    def test_names_are_cached_for_a_short_time(self, tmp_path):
+        with mock.patch.object(mbed_target, "_detect_device_names", return_value=["K64F"]) as detect:
+            with mock.patch("time.time", return_value=1000.0):
+                assert get_connected_device_names(tmp_path / "names.json") == ["K64F"]
+                assert get_connected_device_names(tmp_path / "names.json") == ["K64F"]
+            detect.assert_called_once()
+
+            detect.return_value = []
+            with mock.patch("time.time", return_value=1000.0 + mbed_target.DEVICE_NAMES_CACHE_TTL):
+                assert get_connected_device_names(tmp_path / "names.json") == []
+
+    def test_detects_connected_devices(self, tmp_path):
+        device = mock.Mock(serial_number="0240", mbed_board=mock.Mock(board_type="K64F"))
+        with mock.patch("mbed_tools.devices.get_connected_devices") as get_connected_devices:
+            get_connected_devices.return_value.identified_devices = [device]
+
+            assert get_connected_device_names(tmp_path / "names.json") == ["K64F"]
+
+    def test_completes_nothing_when_detection_fails(self, tmp_path):
+        with mock.patch("mbed_tools.devices.get_connected_devices", side_effect=OSError):
+            assert get_connected_device_names(tmp_path / "names.json") == []
+
+
+class TestGetDeviceNames:
+    def test_numbers_devices_with_the_same_board_type_by_serial_number(self):
+        assert get_device_names([("NUCLEO_F401RE", "0720B"), ("K64F", "0240"), ("NUCLEO_F401RE", "0720A")]) == [
+            "K64F",
+            "NUCLEO_F401RE[0]",
+            "NUCLEO_F401RE[1]",
+        ]
@@ -0,0 +1,27 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+import pytest
+
+from mbed_tools.targets import get_board
+from mbed_tools.targets._internal import board_database
+
+
+@pytest.fixture(autouse=True)
+def user_cache_dir(tmp_path_factory, monkeypatch):
+    """Keep anything the tests write to the user cache directory out of the real one."""
+    cache_dir = tmp_path_factory.mktemp("user_cache")
+    monkeypatch.setenv("MBED_TOOLS_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
+@pytest.fixture(autouse=True)
+def clear_board_databases():
+    """Stop the board databases loaded by one test, which may be mocks, being used by the next."""
+    yield
+    get_board._get_all_offline_boards.cache_clear()
+    get_board._get_indexed_offline_boards.cache_clear()
+    get_board._get_online_boards.cache_clear()
+    get_board._get_offline_snapshot_sha256.cache_clear()
+    board_database.clear_online_board_data()
@@ -5,6 +5,7 @@
 """Test Linux Device Detector."""
 
 from collections import namedtuple
+from pathlib import Path
 from unittest import TestCase, mock, skipIf
 from mbed_tools.devices._internal.candidate_device import CandidateDevice
 
@@ -16,80 +17,163 @@ except ImportError:
     import_succeeded = False
 
 
+MockDevice = namedtuple("MockDevice", "properties")
+Partition = namedtuple("Partition", "mountpoint,device")
+
+
 def mock_device_factory(**props):
-    return namedtuple("MockDevice", "properties")(props)
+    return MockDevice(props)
+
+
+class CountingProperties(dict):
+    """Device properties which count how many times they are read."""
+
+    reads = 0
+
+    def get(self, key, default=None):
+        CountingProperties.reads += 1
+        return super().get(key, default)
+
+
+class FakeUdevContext:
+    """A udev database holding USB block devices and tty devices, which counts how often it is enumerated."""
+
+    def __init__(self, block_devices=(), tty_devices=()):
+        self.devices = {"block": list(block_devices), "tty": list(tty_devices)}
+        self.enumerations = 0
+
+    def list_devices(self, subsystem, **properties):
+        self.enumerations += 1
+        return [
+            device
+            for device in self.devices[subsystem]
+            if all(device.properties.get(name) == value for name, value in properties.items())
+        ]
+
+
+def fake_board(number):
+    """Return the block device, tty device and mounted partition of a board, whose properties count their reads."""
+    serial = f"0240000{number:04d}"
+    block_device = MockDevice(
+        CountingProperties(
+            ID_BUS="usb", ID_SERIAL_SHORT=serial, ID_VENDOR_ID="0d28", ID_MODEL_ID="0204", DEVNAME=f"/dev/sd{number}",
+        )
+    )
+    tty_device = MockDevice(CountingProperties(ID_SERIAL_SHORT=serial, DEVNAME=f"/dev/ttyACM{number}"))
+    partition = Partition(mountpoint=f"/media/user/DAPLINK{number}", device=f"/dev/sd{number}")
+    return block_device, tty_device, partition
 
 
 @skipIf(not import_succeeded, "Tests require package dependencies only used on Linux.")
 class TestLinuxDeviceDetector(TestCase):
-    @mock.patch("mbed_tools.devices._internal.linux.device_detector.pyudev.Context")
-    @mock.patch("mbed_tools.devices._internal.linux.device_detector._find_fs_mounts_for_device")
-    @mock.patch("mbed_tools.devices._internal.linux.device_detector._find_serial_port_for_device")
-    def test_builds_list_of_candidates(self, mock_find_serial_port, mock_find_fs_mounts, mock_udev_context):
-        expected_serial = "2090290209"
-        expected_vid = "0x45"
-        expected_pid = "0x48"
-        expected_fs_mount = ["/media/user/DAPLINK"]
-        mock_find_serial_port.return_value = None
-        mock_find_fs_mounts.return_value = expected_fs_mount
-        devs = [
-            mock_device_factory(
-                ID_SERIAL_SHORT=expected_serial,
-                ID_VENDOR_ID=expected_vid,
-                ID_MODEL_ID=expected_pid,
-                DEVNAME="/dev/sdabcde",
-            )
-        ]
-        mock_udev_context().list_devices.return_value = devs
-        detector = device_detector.LinuxDeviceDetector()
-        candidates = detector.find_candidates()
+    def setUp(self):
+        context_patcher = mock.patch("mbed_tools.devices._internal.linux.device_detector.pyudev.Context")
+        psutil_patcher = mock.patch("mbed_tools.devices._internal.linux.device_detector.psutil")
+        self.mock_udev_context = context_patcher.start()
+        self.mock_psutil = psutil_patcher.start()
+        self.addCleanup(context_patcher.stop)
+        self.addCleanup(psutil_patcher.stop)
+
+    def set_udev_database(self, block_devices=(), tty_devices=(), partitions=()):
+        context = FakeUdevContext(block_devices, tty_devices)
+        self.mock_udev_context.return_value = context
+        self.mock_psutil.disk_partitions.return_value = list(partitions)
+        return context
+
+    def test_builds_list_of_candidates(self):
+        block_device, tty_device, partition = fake_board(1)
+        self.set_udev_database([block_device], [tty_device], [partition])
+
+        candidates = device_detector.LinuxDeviceDetector().find_candidates()
+
         self.assertEqual(
             candidates,
             [
                 CandidateDevice(
-                    serial_number=expected_serial,
-                    vendor_id=expected_vid,
-                    product_id=expected_pid,
-                    mount_points=expected_fs_mount,
+                    serial_number=block_device.properties["ID_SERIAL_SHORT"],
+                    vendor_id="0d28",
+                    product_id="0204",
+                    mount_points=(Path(partition.mountpoint),),
+                    serial_port=tty_device.properties["DEVNAME"],
                 )
             ],
         )
 
-    @mock.patch("mbed_tools.devices._internal.linux.device_detector.pyudev.Context")
-    @mock.patch("mbed_tools.devices._internal.linux.device_detector._find_fs_mounts_for_device")
-    def test_handles_filesystem_mountpoint_error_and_skips_device(self, mock_find_fs_mounts, mock_udev_context):
-        mock_find_fs_mounts.return_value = []
-        devs = [
-            mock_device_factory(
-                ID_SERIAL_SHORT="2090290209", ID_VENDOR_ID="0x45", ID_MODEL_ID="0x48", DEVNAME="/dev/sdabcde",
-            )
-        ]
-        mock_udev_context().list_devices.return_value = devs
-        detector = device_detector.LinuxDeviceDetector()
-        candidates = detector.find_candidates()
+    def test_handles_filesystem_mountpoint_error_and_skips_device(self):
+        block_device, tty_device, _ = fake_board(1)
+        self.set_udev_database([block_device], [tty_device], [])
+
+        candidates = device_detector.LinuxDeviceDetector().find_candidates()
+
         self.assertEqual(candidates, [])
 
-    @mock.patch("mbed_tools.devices._internal.linux.device_detector.pyudev.Context")
-    def test_finds_serial_port_with_matching_serial_id(self, mock_udev_context):
-        matching_serial = "a"
-        disk_device = mock_device_factory(ID_SERIAL_SHORT=matching_serial, DEVNAME="/dev/sdc")
-        serial_device_match = mock_device_factory(ID_SERIAL_SHORT=matching_serial, DEVNAME="/dev/ttyACM0")
-        serial_device_diff = mock_device_factory(ID_SERIAL_SHORT="b", DEVNAME="/dev/ttyUSB0")
-        mock_udev_context().list_devices.return_value = [serial_device_match, serial_device_diff]
-        serial_port = device_detector._find_serial_port_for_device(disk_device.properties["ID_SERIAL_SHORT"])
-        self.assertEqual(serial_port, serial_device_match.properties["DEVNAME"])
-
-    @mock.patch("mbed_tools.devices._internal.linux.device_detector.pyudev.Context")
-    def test_returns_empty_none_when_no_matching_serial_id(self, mock_udev_context):
-        disk_device = mock_device_factory(ID_SERIAL_SHORT="i", DEVNAME="/dev/sdc")
-        serial_device = mock_device_factory(ID_SERIAL_SHORT="a", DEVNAME="/dev/ttyACM0")
-        mock_udev_context().list_devices.return_value = [serial_device]
-        serial_port = device_detector._find_serial_port_for_device(disk_device.properties["ID_SERIAL_SHORT"])
-        self.assertEqual(serial_port, None)
-
-    @mock.patch("mbed_tools.devices._internal.linux.device_detector.psutil")
-    def test_finds_fs_mountpoints_for_device_files(self, mock_psutil):
-        partition = namedtuple("Partition", "mountpoint,device")("/media/user/DAPLINK", "/dev/sdc")
-        mock_psutil.disk_partitions.return_value = [partition]
-        mounts = device_detector._find_fs_mounts_for_device("/dev/sdc")
-        self.assertEqual(str(mounts[0]), partition.mountpoint)
+    def test_ignores_block_devices_not_on_usb(self):
+        _, _, partition = fake_board(1)
+        sata_disk = mock_device_factory(ID_BUS="ata", ID_SERIAL_SHORT="x", DEVNAME=partition.device)
+        self.set_udev_database([sata_disk], [], [partition])
+
+        self.assertEqual(device_detector.LinuxDeviceDetector().find_candidates(), [])
+
+    def test_finds_serial_port_with_matching_serial_id(self):
+        block_device, tty_device, partition = fake_board(1)
+        other_tty_device = mock_device_factory(ID_SERIAL_SHORT="b", DEVNAME="/dev/ttyUSB0")
+        self.set_udev_database([block_device], [other_tty_device, tty_device], [partition])
+
+        candidate, = device_detector.LinuxDeviceDetector().find_candidates()
+
+        self.assertEqual(candidate.serial_port, "/dev/ttyACM1")
+
+    def test_uses_first_serial_port_with_matching_serial_id(self):
+        block_device, tty_device, partition = fake_board(1)
+        second_tty_device = mock_device_factory(ID_SERIAL_SHORT=block_device.properties["ID_SERIAL_SHORT"])
+        self.set_udev_database([block_device], [tty_device, second_tty_device], [partition])
+
+        candidate, = device_detector.LinuxDeviceDetector().find_candidates()
+
+        self.assertEqual(candidate.serial_port, "/dev/ttyACM1")
+
+    def test_serial_port_is_none_when_no_matching_serial_id(self):
+        block_device, _, partition = fake_board(1)
+        tty_without_serial = mock_device_factory(DEVNAME="/dev/ttyS0")
+        self.set_udev_database([block_device], [tty_without_serial], [partition])
+
+        candidate, = device_detector.LinuxDeviceDetector().find_candidates()
+
+        self.assertIsNone(candidate.serial_port)
+
+    def test_does_not_pair_serial_ports_without_serial_id(self):
+        tty_without_serial = mock_device_factory(DEVNAME="/dev/ttyS0")
+        context = self.set_udev_database([], [tty_without_serial], [])
+
+        serial_ports = device_detector._map_serial_ports(context)
+
+        # A disk without a serial ID looks its serial port up by None, which used to find any tty without one.
+        self.assertEqual(serial_ports, {})
+        self.assertIsNone(serial_ports.get(None))
+
+    def test_finds_all_fs_mountpoints_for_device(self):
+        block_device, tty_device, partition = fake_board(1)
+        bind_mount = Partition(mountpoint="/mnt/daplink", device=partition.device)
+        self.set_udev_database([block_device], [tty_device], [partition, bind_mount])
+
+        candidate, = device_detector.LinuxDeviceDetector().find_candidates()
+
+        self.assertEqual(candidate.mount_points, (Path(partition.mountpoint), Path(bind_mount.mountpoint)))
+
+    def test_cost_is_linear_in_number_of_devices(self):
+        def detect(number_of_boards):
+            boards = [fake_board(number) for number in range(number_of_boards)]
+            context = self.set_udev_database(*zip(*boards))
+            CountingProperties.reads = 0
+
+            candidates = device_detector.LinuxDeviceDetector().find_candidates()
+
+            self.assertEqual(len(candidates), number_of_boards)
+            self.assertEqual(context.enumerations, 2)
+            self.assertEqual(self.mock_psutil.disk_partitions.call_count, 1)
+            self.mock_psutil.disk_partitions.reset_mock()
+            return CountingProperties.reads
+
+        reads_for_one_board = detect(1)
+
+        self.assertEqual(detect(48), 48 * reads_for_one_board)
@@ -0,0 +1,121 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Test Linux Device Monitor."""
+import os
+import select
+import weakref
+
+from unittest import mock
+
+import pytest
+
+device_monitor = pytest.importorskip("mbed_tools.devices._internal.linux.device_monitor")
+
+
+class FakeUdevMonitor:
+    """A udev monitor whose events are emitted by the test, readable through a pipe like the netlink socket."""
+
+    def __init__(self):
+        self._read_fd, self._write_fd = os.pipe()
+        self._devices = []
+
+    def filter_by(self, subsystem):
+        pass
+
+    def start(self):
+        pass
+
+    def fileno(self):
+        return self._read_fd
+
+    def emit(self, action, **properties):
+        self._devices.append(mock.Mock(action=action, device_path="/devices/fake", properties=properties))
+        os.write(self._write_fd, b"x")
+
+    def poll(self, timeout=None):
+        if not self._devices:
+            return None
+        os.read(self._read_fd, 1)
+        return self._devices.pop(0)
+
+    def close(self):
+        os.close(self._read_fd)
+        os.close(self._write_fd)
+
+
+@pytest.fixture
+def udev_monitor(tmp_path):
+    fake = FakeUdevMonitor()
+    mounts_file = tmp_path / "mounts"
+    mounts_file.write_text("")
+    with mock.patch.object(device_monitor.pyudev, "Context"), mock.patch.object(
+        device_monitor.pyudev.Monitor, "from_netlink", return_value=fake
+    ), mock.patch.object(device_monitor, "MOUNTS_FILE", str(mounts_file)), mock.patch.object(
+        device_monitor, "SETTLE_TIME", 0.01
+    ):
+        yield fake
+    fake.close()
+
+
+class TestLinuxDeviceMonitor:
+    def test_returns_false_when_nothing_changes(self, udev_monitor):
+        monitor = device_monitor.LinuxDeviceMonitor()
+
+        assert monitor.wait_for_change(timeout=0.01) is False
+
+        monitor.close()
+
+    def test_returns_true_when_usb_device_changes(self, udev_monitor):
+        monitor = device_monitor.LinuxDeviceMonitor()
+        udev_monitor.emit("add", ID_BUS="usb")
+        udev_monitor.emit("add", ID_BUS="usb")
+
+        assert monitor.wait_for_change(timeout=1) is True
+        assert udev_monitor.poll() is None
+
+        monitor.close()
+
+    def test_ignores_devices_not_on_usb(self, udev_monitor):
+        monitor = device_monitor.LinuxDeviceMonitor()
+        udev_monitor.emit("add", ID_BUS="ata")
+
+        assert monitor.wait_for_change(timeout=0.05) is False
+
+        monitor.close()
+
+    def test_returns_true_when_mounts_change(self, udev_monitor):
+        monitor = device_monitor.LinuxDeviceMonitor()
+        mounts_fd = monitor._mounts.fileno()
+        poller = mock.Mock(spec=["register", "unregister", "poll"])
+        poller.poll.side_effect = [[(mounts_fd, select.POLLPRI)], []]
+        monitor._poller = poller
+
+        assert monitor.wait_for_change() is True
+
+        monitor.close()
+
+    def test_close_releases_udev_monitor(self, tmp_path):
+        udev_monitors = []
+
+        def from_netlink(context):
+            udev_monitors.append(FakeUdevMonitor())
+            return udev_monitors[-1]
+
+        mounts_file = tmp_path / "mounts"
+        mounts_file.write_text("")
+        with mock.patch.object(device_monitor.pyudev, "Context"), mock.patch.object(
+            device_monitor.pyudev.Monitor, "from_netlink", side_effect=from_netlink
+        ), mock.patch.object(device_monitor, "MOUNTS_FILE", str(mounts_file)):
+            monitor = device_monitor.LinuxDeviceMonitor()
+        udev_monitor = udev_monitors.pop()
+        fds = udev_monitor.fileno(), udev_monitor._write_fd
+        released = weakref.ref(udev_monitor)
+        del udev_monitor
+
+        monitor.close()
+
+        assert released() is None
+        for fd in fds:
+            os.close(fd)
@@ -0,0 +1,169 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Test the Linux sysfs Device Detector."""
+import os
+
+from pathlib import Path
+
+import pytest
+
+from mbed_tools.devices._internal.candidate_device import CandidateDevice
+from mbed_tools.devices._internal.linux.sysfs_device_detector import SysfsDeviceDetector
+
+from tests.devices.markers import linux_only
+
+
+class FakeSysfs:
+    """A tree laid out like sysfs and /proc/self/mountinfo, holding the devices added by a test."""
+
+    def __init__(self, root):
+        self.sys_root = root / "sys"
+        self.dev_root = Path("/dev")
+        self.mountinfo_path = root / "mountinfo"
+        self._usb_root = self.sys_root / "devices" / "pci0000:00" / "0000:00:14.0" / "usb1"
+        self._mountinfo = ["22 1 0:21 / /sys rw,nosuid,nodev,noexec,relatime shared:7 - sysfs sysfs rw"]
+        self._next_minor = 0
+        for directory in ("bus/usb/devices", "class/block", "class/tty"):
+            (self.sys_root / directory).mkdir(parents=True)
+        (self.sys_root / "devices" / "virtual" / "tty").mkdir(parents=True)
+        self._write_mountinfo()
+
+    def add_usb_device(self, port, serial_number="0240000032044e45", vendor_id="0d28", product_id="0204"):
+        device_dir = self._usb_root / f"1-{port}"
+        device_dir.mkdir(parents=True)
+        for name, value in (("serial", serial_number), ("idVendor", vendor_id), ("idProduct", product_id)):
+            if value is not None:
+                (device_dir / name).write_text(f"{value}\n")
+        self._link(self.sys_root / "bus" / "usb" / "devices" / device_dir.name, device_dir)
+        for interface in range(2):
+            interface_dir = device_dir / f"1-{port}:1.{interface}"
+            interface_dir.mkdir()
+            self._link(self.sys_root / "bus" / "usb" / "devices" / interface_dir.name, interface_dir)
+        return device_dir
+
+    def add_block_device(self, parent_dir, name, mount_points=()):
+        block_dir = parent_dir / f"1-{parent_dir.name[2:]}:1.0" / "host0" / "target0:0:0" / "0:0:0:0" / "block" / name
+        return self._add_block(block_dir, name, mount_points)
+
+    def add_ata_block_device(self, name, mount_points=()):
+        block_dir = self.sys_root / "devices" / "pci0000:00" / "0000:00:17.0" / "ata1" / "block" / name
+        return self._add_block(block_dir, name, mount_points)
+
+    def add_tty(self, parent_dir, name):
+        tty_dir = parent_dir / f"1-{parent_dir.name[2:]}:1.1" / "tty" / name
+        tty_dir.mkdir(parents=True)
+        self._link(self.sys_root / "class" / "tty" / name, tty_dir)
+
+    def add_virtual_tty(self, name):
+        tty_dir = self.sys_root / "devices" / "virtual" / "tty" / name
+        tty_dir.mkdir()
+        self._link(self.sys_root / "class" / "tty" / name, tty_dir)
+
+    def add_board(self, port, serial_number, mount_point, block="sdb", tty="ttyACM0"):
+        device_dir = self.add_usb_device(port, serial_number)
+        self.add_block_device(device_dir, block, [mount_point])
+        if tty is not None:
+            self.add_tty(device_dir, tty)
+
+    def _add_block(self, block_dir, name, mount_points):
+        block_dir.mkdir(parents=True)
+        self._next_minor += 16
+        device_number = f"8:{self._next_minor}"
+        (block_dir / "dev").write_text(f"{device_number}\n")
+        self._link(self.sys_root / "class" / "block" / name, block_dir)
+        for mount_point in mount_points:
+            escaped = str(mount_point).replace(" ", "\\040")
+            self._mountinfo.append(
+                f"{len(self._mountinfo) + 30} 1 {device_number} / {escaped} rw,nosuid,nodev shared:1 - vfat "
+                f"/dev/{name} rw,uid=1000"
+            )
+        self._write_mountinfo()
+
+    def _link(self, link, target):
+        link.symlink_to(os.path.relpath(target, link.parent))
+
+    def _write_mountinfo(self):
+        self.mountinfo_path.write_text("\n".join(self._mountinfo) + "\n")
+
+    def detector(self):
+        return SysfsDeviceDetector(self.sys_root, self.dev_root, self.mountinfo_path)
+
+
+@pytest.fixture
+def sysfs(tmp_path):
+    return FakeSysfs(tmp_path)
+
+
+@linux_only
+class TestSysfsDeviceDetector:
+    def test_finds_usb_block_devices_with_their_serial_ports_and_mount_points(self, sysfs):
+        sysfs.add_board(1, "0240000032044e45", "/media/you/DAPLINK")
+        sysfs.add_board(2, "066EFF555051897267233656", "/media/you/NODE_F411RE", block="sdc", tty="ttyACM1")
+
+        assert sysfs.detector().find_candidates() == [
+            CandidateDevice(
+                serial_number="0240000032044e45",
+                vendor_id="0d28",
+                product_id="0204",
+                mount_points=(Path("/media/you/DAPLINK"),),
+                serial_port="/dev/ttyACM0",
+            ),
+            CandidateDevice(
+                serial_number="066EFF555051897267233656",
+                vendor_id="0d28",
+                product_id="0204",
+                mount_points=(Path("/media/you/NODE_F411RE"),),
+                serial_port="/dev/ttyACM1",
+            ),
+        ]
+
+    def test_finds_device_without_serial_port(self, sysfs):
+        sysfs.add_board(1, "0240000032044e45", "/media/you/DAPLINK", tty=None)
+
+        candidate, = sysfs.detector().find_candidates()
+
+        assert candidate.serial_port is None
+
+    def test_finds_every_mount_point_of_a_device(self, sysfs):
+        device_dir = sysfs.add_usb_device(1)
+        sysfs.add_block_device(device_dir, "sdb", ["/media/you/DAPLINK", "/mnt/with space"])
+
+        candidate, = sysfs.detector().find_candidates()
+
+        assert candidate.mount_points == (Path("/media/you/DAPLINK"), Path("/mnt/with space"))
+
+    def test_ignores_devices_not_on_usb(self, sysfs):
+        sysfs.add_ata_block_device("sda", ["/"])
+        sysfs.add_virtual_tty("tty0")
+        sysfs.add_board(1, "0240000032044e45", "/media/you/DAPLINK")
+
+        candidate, = sysfs.detector().find_candidates()
+
+        assert candidate.serial_number == "0240000032044e45"
+
+    def test_ignores_usb_devices_without_serial_number(self, sysfs):
+        device_dir = sysfs.add_usb_device(1, serial_number=None)
+        sysfs.add_block_device(device_dir, "sdb", ["/media/you/STICK"])
+
+        assert sysfs.detector().find_candidates() == []
+
+    def test_replaces_white_space_in_serial_number_like_udev(self, sysfs):
+        sysfs.add_board(1, "SERIAL WITH SPACE", "/media/you/DAPLINK")
+
+        candidate, = sysfs.detector().find_candidates()
+
+        assert candidate.serial_number == "SERIAL_WITH_SPACE"
+
+    def test_warns_and_skips_devices_whose_file_system_is_not_mounted(self, sysfs, caplog):
+        device_dir = sysfs.add_usb_device(1)
+        sysfs.add_block_device(device_dir, "sdb")
+
+        assert sysfs.detector().find_candidates() == []
+        assert "/dev/sdb" in caplog.text
+
+    def test_finds_nothing_without_sysfs(self, tmp_path):
+        detector = SysfsDeviceDetector(tmp_path / "sys", Path("/dev"), tmp_path / "mountinfo")
+
+        assert detector.find_candidates() == []
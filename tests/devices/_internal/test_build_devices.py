@@ -0,0 +1,250 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+import asyncio
+import threading
+import time
+
+from unittest import mock
+
+import pytest
+
+from mbed_tools.devices._internal.build_devices import async_build_devices, build_devices, iter_built_devices
+from mbed_tools.devices.device import Device
+from mbed_tools.devices.exceptions import DeviceLookupFailed
+from tests.devices.factories import CandidateDeviceFactory
+
+
+@pytest.fixture
+def from_candidate():
+    with mock.patch.object(Device, "from_candidate") as from_candidate:
+        yield from_candidate
+
+
+def device_for(candidate):
+    return Device.from_unidentified_candidate(candidate, f"device for {candidate.serial_number}")
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class TestBuildDevices:
+    def test_returns_devices_in_order_of_candidates(self, from_candidate):
+        candidates = [CandidateDeviceFactory() for _ in range(6)]
+        delays = {candidate.serial_number: 0.01 * (6 - number) for number, candidate in enumerate(candidates)}
+
+        def build(candidate):
+            time.sleep(delays[candidate.serial_number])
+            return device_for(candidate)
+
+        from_candidate.side_effect = build
+
+        assert build_devices(candidates, timeout=5) == [device_for(candidate) for candidate in candidates]
+
+    def test_builds_devices_in_parallel_with_bounded_number_of_workers(self, from_candidate):
+        lock = threading.Lock()
+        running = []
+        most_running = []
+
+        def build(candidate):
+            with lock:
+                running.append(candidate)
+                most_running.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.remove(candidate)
+            return device_for(candidate)
+
+        from_candidate.side_effect = build
+
+        build_devices([CandidateDeviceFactory() for _ in range(9)], timeout=5, max_workers=3)
+
+        assert max(most_running) == 3
+
+    def test_reports_hung_device_as_unidentified_and_builds_the_rest(self, from_candidate):
+        hung_candidate, candidate = CandidateDeviceFactory(), CandidateDeviceFactory()
+        release = threading.Event()
+
+        def build(candidate):
+            if candidate is hung_candidate:
+                release.wait(5)
+            return device_for(candidate)
+
+        from_candidate.side_effect = build
+
+        try:
+            start = time.monotonic()
+            devices = build_devices([hung_candidate, candidate], timeout=0.1, max_workers=1)
+            elapsed = time.monotonic() - start
+        finally:
+            release.set()
+
+        assert elapsed < 1
+        assert devices[1] == device_for(candidate)
+        assert not devices[0].mbed_enabled
+        assert devices[0].serial_number == hung_candidate.serial_number
+        assert "Timed out" in devices[0].unidentified_reason
+
+    def test_timeout_starts_when_device_is_started(self, from_candidate):
+        def build(candidate):
+            time.sleep(0.06)
+            return device_for(candidate)
+
+        from_candidate.side_effect = build
+        candidates = [CandidateDeviceFactory() for _ in range(3)]
+
+        # Built one after another the last device finishes after 0.18s, but each takes under the timeout.
+        assert build_devices(candidates, timeout=0.15, max_workers=1) == [device_for(c) for c in candidates]
+
+    def test_raises_error_of_first_failed_device(self, from_candidate):
+        candidates = [CandidateDeviceFactory() for _ in range(3)]
+        from_candidate.side_effect = [device_for(candidates[0]), DeviceLookupFailed("first"), ValueError("second")]
+
+        with pytest.raises(DeviceLookupFailed, match="first"):
+            build_devices(candidates, timeout=5, max_workers=1)
+
+    def test_builds_nothing_without_candidates(self, from_candidate):
+        assert build_devices([]) == []
+        from_candidate.assert_not_called()
+
+
+class TestIterBuiltDevices:
+    def test_yields_each_device_once_built(self, from_candidate):
+        candidates = [CandidateDeviceFactory() for _ in range(2)]
+        release = threading.Event()
+
+        def build(candidate):
+            if candidate is candidates[1]:
+                release.wait(5)
+            return device_for(candidate)
+
+        from_candidate.side_effect = build
+
+        devices = iter_built_devices(candidates, timeout=5)
+        try:
+            assert next(devices) == device_for(candidates[0])
+        finally:
+            release.set()
+        assert next(devices) == device_for(candidates[1])
+
+    def test_does_not_build_remaining_candidates_when_closed(self, from_candidate):
+        candidates = [CandidateDeviceFactory() for _ in range(4)]
+
+        def build(candidate):
+            time.sleep(0.02)
+            return device_for(candidate)
+
+        from_candidate.side_effect = build
+
+        devices = iter_built_devices(candidates, timeout=5, max_workers=1)
+        next(devices)
+        devices.close()
+        time.sleep(0.1)
+
+        assert from_candidate.call_count <= 2
+
+
+class TestAsyncBuildDevices:
+    def test_returns_devices_in_order_of_candidates(self, from_candidate):
+        candidates = [CandidateDeviceFactory() for _ in range(4)]
+        delays = {candidate.serial_number: 0.01 * (4 - number) for number, candidate in enumerate(candidates)}
+
+        def build(candidate):
+            time.sleep(delays[candidate.serial_number])
+            return device_for(candidate)
+
+        from_candidate.side_effect = build
+
+        assert run(async_build_devices(candidates, timeout=5)) == [device_for(candidate) for candidate in candidates]
+
+    def test_builds_devices_concurrently_with_bounded_number_of_workers(self, from_candidate):
+        lock = threading.Lock()
+        running = []
+        most_running = []
+
+        def build(candidate):
+            with lock:
+                running.append(candidate)
+                most_running.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.remove(candidate)
+            return device_for(candidate)
+
+        from_candidate.side_effect = build
+
+        run(async_build_devices([CandidateDeviceFactory() for _ in range(9)], timeout=5, max_workers=3))
+
+        assert max(most_running) == 3
+
+    def test_does_not_block_the_event_loop(self, from_candidate):
+        release = threading.Event()
+        candidate = CandidateDeviceFactory()
+
+        def build(candidate):
+            release.wait(5)
+            return device_for(candidate)
+
+        from_candidate.side_effect = build
+
+        async def build_while_releasing():
+            building = asyncio.ensure_future(async_build_devices([candidate], timeout=5))
+            # Runs only if the event loop is free while the device is being built.
+            await asyncio.sleep(0.01)
+            release.set()
+            return await building
+
+        assert run(build_while_releasing()) == [device_for(candidate)]
+
+    def test_reports_hung_device_as_unidentified_and_builds_the_rest(self, from_candidate):
+        hung_candidate, candidate = CandidateDeviceFactory(), CandidateDeviceFactory()
+        release = threading.Event()
+
+        def build(candidate):
+            if candidate is hung_candidate:
+                release.wait(5)
+            return device_for(candidate)
+
+        from_candidate.side_effect = build
+
+        try:
+            devices = run(async_build_devices([hung_candidate, candidate], timeout=0.1, max_workers=1))
+        finally:
+            release.set()
+
+        assert devices[1] == device_for(candidate)
+        assert "Timed out" in devices[0].unidentified_reason
+
+    def test_raises_error_of_first_failed_device(self, from_candidate):
+        candidates = [CandidateDeviceFactory() for _ in range(3)]
+        from_candidate.side_effect = [device_for(candidates[0]), DeviceLookupFailed("first"), ValueError("second")]
+
+        with pytest.raises(DeviceLookupFailed, match="first"):
+            run(async_build_devices(candidates, timeout=5, max_workers=1))
+
+    def test_does_not_build_remaining_candidates_when_cancelled(self, from_candidate):
+        candidates = [CandidateDeviceFactory() for _ in range(4)]
+
+        def build(candidate):
+            time.sleep(0.05)
+            return device_for(candidate)
+
+        from_candidate.side_effect = build
+
+        async def cancel_while_building():
+            building = asyncio.ensure_future(async_build_devices(candidates, timeout=5, max_workers=1))
+            await asyncio.sleep(0.01)
+            building.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await building
+
+        run(cancel_while_building())
+        time.sleep(0.1)
+
+        assert from_candidate.call_count == 1
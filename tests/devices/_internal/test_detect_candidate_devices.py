@@ -2,6 +2,8 @@
 # Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
 # SPDX-License-Identifier: Apache-2.0
 #
+import os
+
 import pytest
 from unittest import mock
 
@@ -10,8 +12,12 @@ from mbed_tools.devices._internal.base_detector import DeviceDetector
 from mbed_tools.devices.exceptions import UnknownOSError
 from mbed_tools.devices._internal.detect_candidate_devices import (
     detect_candidate_devices,
+    get_device_monitor,
     _get_detector_for_current_os,
+    _get_linux_detector,
 )
+from mbed_tools.devices._internal import detect_candidate_devices as detect_candidate_devices_module
+from mbed_tools.devices._internal.linux.sysfs_device_detector import SysfsDeviceDetector
 
 
 class TestDetectCandidateDevices:
@@ -36,6 +42,7 @@ class TestGetDetectorForCurrentOS:
         assert isinstance(_get_detector_for_current_os(), DarwinDeviceDetector)
 
     @linux_only
+    @mock.patch.dict(os.environ, {"MBED_TOOLS_DEVICE_DETECTOR": "udev"})
     def test_linux_uses_correct_module(self):
         from mbed_tools.devices._internal.linux.device_detector import LinuxDeviceDetector
 
@@ -48,3 +55,55 @@ class TestGetDetectorForCurrentOS:
 
         with pytest.raises(UnknownOSError):
             _get_detector_for_current_os()
+
+
+@linux_only
+class TestGetLinuxDetector:
+    @pytest.fixture(autouse=True)
+    def clear_env(self, monkeypatch):
+        monkeypatch.delenv("MBED_TOOLS_DEVICE_DETECTOR", raising=False)
+
+    @pytest.fixture
+    def udev_running(self, tmp_path, monkeypatch):
+        control_socket = tmp_path / "control"
+        control_socket.touch()
+        monkeypatch.setattr(detect_candidate_devices_module, "UDEV_CONTROL_SOCKET", control_socket)
+
+    @pytest.fixture
+    def udev_not_running(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(detect_candidate_devices_module, "UDEV_CONTROL_SOCKET", tmp_path / "control")
+
+    def test_uses_udev_when_daemon_is_running(self, udev_running):
+        from mbed_tools.devices._internal.linux.device_detector import LinuxDeviceDetector
+
+        assert isinstance(_get_linux_detector(), LinuxDeviceDetector)
+
+    def test_reads_sysfs_when_udev_daemon_is_not_running(self, udev_not_running):
+        assert isinstance(_get_linux_detector(), SysfsDeviceDetector)
+
+    def test_uses_detector_requested_by_environment(self, udev_running, monkeypatch):
+        monkeypatch.setenv("MBED_TOOLS_DEVICE_DETECTOR", "SysFS")
+
+        assert isinstance(_get_linux_detector(), SysfsDeviceDetector)
+
+    def test_uses_udev_when_requested_even_if_daemon_is_not_running(self, udev_not_running, monkeypatch):
+        from mbed_tools.devices._internal.linux.device_detector import LinuxDeviceDetector
+
+        monkeypatch.setenv("MBED_TOOLS_DEVICE_DETECTOR", "udev")
+
+        assert isinstance(_get_linux_detector(), LinuxDeviceDetector)
+
+    def test_warns_and_ignores_unknown_detector(self, udev_not_running, monkeypatch, caplog):
+        monkeypatch.setenv("MBED_TOOLS_DEVICE_DETECTOR", "hal")
+
+        assert isinstance(_get_linux_detector(), SysfsDeviceDetector)
+        assert "Unknown device detector 'hal'" in caplog.text
+
+
+class TestGetDeviceMonitor:
+    @mock.patch("platform.system")
+    def test_raises_when_os_is_not_linux(self, platform_system):
+        platform_system.return_value = "Darwin"
+
+        with pytest.raises(UnknownOSError, match="only supported on Linux"):
+            get_device_monitor()
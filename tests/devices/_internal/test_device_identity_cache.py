@@ -0,0 +1,135 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Tests for `mbed_tools.devices._internal.device_identity_cache`."""
+import os
+import pathlib
+import threading
+
+from unittest import mock
+
+from mbed_tools.targets import Board
+from mbed_tools.devices._internal.device_identity_cache import (
+    MAX_CACHED_DEVICES,
+    CachedIdentity,
+    DeviceIdentityCache,
+    get_device_identity,
+)
+
+from tests.devices.factories import CandidateDeviceFactory
+
+
+def make_board():
+    return Board.from_offline_board_entry(
+        {"board_type": "K64F", "product_code": "0240", "mbed_os_support": ["Mbed OS 6"], "build_variant": ["S"]}
+    )
+
+
+class TestGetDeviceIdentity:
+    def test_none_without_identification_files(self, tmp_path):
+        assert get_device_identity(CandidateDeviceFactory(mount_points=[tmp_path])) is None
+
+    def test_changes_when_identification_files_change(self, tmp_path):
+        details = pathlib.Path(tmp_path, "DETAILS.TXT")
+        details.write_text("Version: 0253")
+        candidate = CandidateDeviceFactory(mount_points=[tmp_path])
+        identity = get_device_identity(candidate)
+
+        assert identity == get_device_identity(candidate)
+
+        details.write_text("Version: 0254\n")
+        new_identity = get_device_identity(candidate)
+        assert new_identity != identity
+
+        os.utime(details, ns=(0, 0))
+        assert get_device_identity(candidate) != new_identity
+
+    def test_changes_with_usb_ids(self, tmp_path):
+        pathlib.Path(tmp_path, "MBED.HTM").write_text("code=0240")
+        candidate = CandidateDeviceFactory(mount_points=[tmp_path], vendor_id="0d28", product_id="0204")
+
+        assert get_device_identity(candidate) != get_device_identity(
+            CandidateDeviceFactory(mount_points=[tmp_path], vendor_id="0d28", product_id="0205")
+        )
+
+    def test_does_not_open_files(self, tmp_path):
+        pathlib.Path(tmp_path, "MBED.HTM").write_text("code=0240")
+
+        with mock.patch.object(pathlib.Path, "open") as open_:
+            get_device_identity(CandidateDeviceFactory(mount_points=[tmp_path]))
+
+        open_.assert_not_called()
+
+
+class TestDeviceIdentityCache:
+    def test_returns_recorded_identity(self, tmp_path):
+        cache = DeviceIdentityCache(tmp_path / "identities.json")
+        board = make_board()
+
+        cache.add("serial", "identity", board, "0253")
+
+        assert DeviceIdentityCache(tmp_path / "identities.json").get("serial", "identity") == CachedIdentity(
+            board, "0253"
+        )
+        assert cache.get("other-serial", "identity") is None
+
+    def test_misses_when_identity_changed(self, tmp_path):
+        cache = DeviceIdentityCache(tmp_path / "identities.json")
+        cache.add("serial", "identity", make_board(), "0253")
+
+        assert cache.get("serial", "new-identity") is None
+
+    def test_replaces_entry_of_device(self, tmp_path):
+        cache = DeviceIdentityCache(tmp_path / "identities.json")
+        cache.add("serial", "identity", make_board(), "0253")
+        cache.add("serial", "new-identity", make_board(), "0254")
+
+        assert cache.get("serial", "identity") is None
+        assert cache.get("serial", "new-identity").interface_version == "0254"
+
+    def test_keeps_most_recently_recorded_devices(self, tmp_path):
+        cache = DeviceIdentityCache(tmp_path / "identities.json")
+        for serial_number in range(MAX_CACHED_DEVICES + 1):
+            cache.add(str(serial_number), "identity", make_board(), None)
+
+        assert cache.get("0", "identity") is None
+        assert cache.get(str(MAX_CACHED_DEVICES), "identity") is not None
+
+    def test_keeps_devices_recorded_by_concurrent_threads(self, tmp_path):
+        start = threading.Barrier(8)
+
+        def record(thread_number):
+            cache = DeviceIdentityCache(tmp_path / "identities.json")
+            start.wait()
+            for device_number in range(5):
+                cache.add(f"{thread_number}-{device_number}", "identity", make_board(), None)
+
+        threads = [threading.Thread(target=record, args=(thread_number,)) for thread_number in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        cache = DeviceIdentityCache(tmp_path / "identities.json")
+        assert all(cache.get(f"{t}-{d}", "identity") is not None for t in range(8) for d in range(5))
+
+    def test_ignores_unreadable_cache(self, tmp_path):
+        cache_file = tmp_path / "identities.json"
+        cache_file.write_text("not json")
+        cache = DeviceIdentityCache(cache_file)
+
+        assert cache.get("serial", "identity") is None
+
+        cache.add("serial", "identity", make_board(), None)
+        assert cache.get("serial", "identity") is not None
+
+    def test_failing_to_write_is_not_an_error(self, tmp_path):
+        cache = DeviceIdentityCache(tmp_path / "identities.json")
+
+        with mock.patch(
+            "mbed_tools.devices._internal.device_identity_cache.write_cache_file", side_effect=PermissionError
+        ):
+            cache.add("serial", "identity", make_board(), None)
+
+        assert cache.get("serial", "identity") is None
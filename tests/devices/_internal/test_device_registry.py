@@ -0,0 +1,68 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+import pathlib
+
+from unittest import mock
+
+import pytest
+
+from mbed_tools.devices._internal.device_registry import DeviceRegistry
+
+from tests.devices.factories import CandidateDeviceFactory
+
+
+@pytest.fixture
+def build_devices():
+    with mock.patch("mbed_tools.devices._internal.device_registry.build_devices") as build_devices:
+        build_devices.side_effect = lambda candidates: [mock.Mock(candidate=candidate) for candidate in candidates]
+        yield build_devices
+
+
+class TestDeviceRegistry:
+    def test_adds_new_devices(self, build_devices):
+        candidates = [CandidateDeviceFactory(), CandidateDeviceFactory()]
+        registry = DeviceRegistry()
+
+        events = registry.update(candidates)
+
+        assert [(event.action, event.device.candidate) for event in events] == [
+            ("add", candidates[0]),
+            ("add", candidates[1]),
+        ]
+        assert registry.devices == [event.device for event in events]
+
+    def test_only_builds_devices_which_are_new_or_changed(self, build_devices):
+        unchanged, changed, new = CandidateDeviceFactory(), CandidateDeviceFactory(), CandidateDeviceFactory()
+        moved = CandidateDeviceFactory(
+            serial_number=changed.serial_number,
+            vendor_id=changed.vendor_id,
+            product_id=changed.product_id,
+            mount_points=[pathlib.Path("/media/elsewhere")],
+        )
+        registry = DeviceRegistry()
+        registry.update([unchanged, changed])
+
+        events = registry.update([unchanged, moved, new])
+
+        build_devices.assert_called_with([moved, new])
+        assert [(event.action, event.device.candidate) for event in events] == [("change", moved), ("add", new)]
+        assert len(registry.devices) == 3
+
+    def test_removes_disconnected_devices(self, build_devices):
+        kept, removed = CandidateDeviceFactory(), CandidateDeviceFactory()
+        registry = DeviceRegistry()
+        added = registry.update([kept, removed])
+
+        events = registry.update([kept])
+
+        assert [(event.action, event.device) for event in events] == [("remove", added[1].device)]
+        assert registry.devices == [added[0].device]
+
+    def test_reports_nothing_when_nothing_changed(self, build_devices):
+        candidates = [CandidateDeviceFactory()]
+        registry = DeviceRegistry()
+        registry.update(candidates)
+
+        assert registry.update(candidates) == []
@@ -0,0 +1,187 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+import pathlib
+import socket
+import tempfile
+import threading
+
+from unittest import mock
+
+import pytest
+
+from mbed_tools.devices.exceptions import DeviceLookupFailed, DeviceServerError
+from mbed_tools.devices._internal.device_server_client import get_devices_from_server, is_server_running
+
+from tests.devices.factories import CandidateDeviceFactory
+
+device_server = pytest.importorskip("mbed_tools.devices._internal.device_server")
+
+
+class StopServer(Exception):
+    pass
+
+
+class FakeMonitor:
+    """A device monitor whose changes are made by the test."""
+
+    def __init__(self):
+        self._changed = threading.Event()
+        self._stopped = False
+        self.closed = False
+
+    def change(self):
+        self._changed.set()
+
+    def stop(self):
+        self._stopped = True
+        self._changed.set()
+
+    def wait_for_change(self, timeout=None):
+        changed = self._changed.wait(timeout)
+        self._changed.clear()
+        if self._stopped:
+            raise StopServer
+        return changed
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def socket_path():
+    # Kept short, as the length of a socket's path is limited.
+    with tempfile.TemporaryDirectory() as directory:
+        yield pathlib.Path(directory, "devices.sock")
+
+
+@pytest.fixture
+def monitor():
+    monitor = FakeMonitor()
+    with mock.patch.object(device_server, "get_device_monitor", return_value=monitor):
+        yield monitor
+
+
+@pytest.fixture
+def detect_candidate_devices():
+    with mock.patch.object(device_server, "detect_candidate_devices") as detect_candidate_devices:
+        yield detect_candidate_devices
+
+
+@pytest.fixture
+def build_devices():
+    with mock.patch("mbed_tools.devices._internal.device_registry.build_devices") as build_devices:
+        build_devices.side_effect = lambda candidates: [
+            mock.Mock(serial_number=candidate.serial_number) for candidate in candidates
+        ]
+        yield build_devices
+
+
+@pytest.fixture
+def serialise_device():
+    with mock.patch.object(device_server, "serialise_device", side_effect=lambda device: device.serial_number):
+        with mock.patch(
+            "mbed_tools.devices._internal.device_server_client.deserialise_device", side_effect=lambda device: device
+        ):
+            yield
+
+
+def start_server(socket_path):
+    server = device_server.DeviceServer(socket_path)
+    errors = []
+
+    def serve():
+        try:
+            server.serve_forever()
+        except StopServer:
+            pass
+        except Exception as err:
+            errors.append(err)
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    while not is_server_running(socket_path):
+        thread.join(0.01)
+    return server, thread, errors
+
+
+@pytest.mark.usefixtures("serialise_device", "build_devices")
+class TestDeviceServer:
+    def test_answers_with_connected_devices_until_stopped(self, socket_path, monitor, detect_candidate_devices):
+        first, second = CandidateDeviceFactory(), CandidateDeviceFactory()
+        detect_candidate_devices.return_value = [first]
+        server, thread, errors = start_server(socket_path)
+
+        assert get_devices_from_server(socket_path, timeout=5) == [first.serial_number]
+
+        detect_candidate_devices.return_value = [second]
+        monitor.change()
+        while server.devices[0].serial_number != second.serial_number:
+            thread.join(0.01)
+        assert get_devices_from_server(socket_path, timeout=5) == [second.serial_number]
+
+        monitor.stop()
+        thread.join(5)
+        assert not errors
+        assert monitor.closed
+        assert not socket_path.exists()
+
+    def test_scans_again_when_no_change_reported(self, socket_path, monitor, detect_candidate_devices):
+        first, second = CandidateDeviceFactory(), CandidateDeviceFactory()
+        detect_candidate_devices.return_value = [first]
+        with mock.patch.object(device_server, "RESCAN_INTERVAL", 0.01):
+            server, thread, errors = start_server(socket_path)
+            assert get_devices_from_server(socket_path, timeout=5) == [first.serial_number]
+
+            detect_candidate_devices.return_value = [second]
+            while server.devices[0].serial_number != second.serial_number:
+                thread.join(0.01)
+            assert get_devices_from_server(socket_path, timeout=5) == [second.serial_number]
+
+            monitor.stop()
+            thread.join(5)
+        assert not errors
+
+    def test_answers_with_error_when_scan_fails(self, socket_path, monitor, detect_candidate_devices):
+        detect_candidate_devices.side_effect = DeviceLookupFailed("no database")
+        server, thread, errors = start_server(socket_path)
+
+        assert get_devices_from_server(socket_path, timeout=5) is None
+        assert server.error == "no database"
+
+        monitor.stop()
+        thread.join(5)
+
+    def test_creates_socket_directory(self, socket_path, monitor, detect_candidate_devices):
+        detect_candidate_devices.return_value = []
+        socket_path = socket_path.parent / "new" / socket_path.name
+        server, thread, errors = start_server(socket_path)
+
+        assert get_devices_from_server(socket_path, timeout=5) == []
+
+        monitor.stop()
+        thread.join(5)
+        assert not errors
+
+    def test_refuses_to_start_when_already_running(self, socket_path, monitor, detect_candidate_devices):
+        detect_candidate_devices.return_value = []
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as other_server:
+            other_server.bind(str(socket_path))
+            other_server.listen()
+
+            with pytest.raises(DeviceServerError):
+                device_server.DeviceServer(socket_path).serve_forever()
+
+    def test_replaces_socket_left_behind(self, socket_path, monitor, detect_candidate_devices):
+        detect_candidate_devices.return_value = []
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as old_server:
+            old_server.bind(str(socket_path))
+        server, thread, errors = start_server(socket_path)
+
+        assert get_devices_from_server(socket_path, timeout=5) == []
+        assert is_server_running(socket_path)
+
+        monitor.stop()
+        thread.join(5)
+        assert not errors
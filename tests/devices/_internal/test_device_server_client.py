@@ -0,0 +1,76 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+import pathlib
+import socket
+import tempfile
+
+import pytest
+
+from mbed_tools.targets import Board
+from mbed_tools.devices.device import Device
+from mbed_tools.devices._internal.device_server_client import (
+    deserialise_device,
+    get_devices_from_server,
+    get_socket_path,
+    is_server_running,
+    serialise_device,
+)
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets required")
+
+
+@pytest.fixture
+def socket_path():
+    # Kept short, as the length of a socket's path is limited.
+    with tempfile.TemporaryDirectory() as directory:
+        yield pathlib.Path(directory, "devices.sock")
+
+
+def make_device():
+    return Device(
+        mbed_board=Board.from_offline_board_entry(
+            {"board_type": "K64F", "board_name": "FRDM-K64F", "product_code": "0240", "build_variant": ["S", "NS"]}
+        ),
+        serial_number="0240000032044e4500257009997b00386781000097969900",
+        serial_port="/dev/ttyACM0",
+        mount_points=(pathlib.Path("/media/you/DAPLINK"),),
+        mbed_enabled=True,
+        interface_version="0253",
+    )
+
+
+class TestSerialiseDevice:
+    def test_round_trips_device(self):
+        device = make_device()
+
+        assert deserialise_device(serialise_device(device)) == device
+
+
+class TestGetDevicesFromServer:
+    def test_none_when_no_server_has_been_started(self, socket_path):
+        assert get_devices_from_server(socket_path) is None
+
+    def test_none_when_server_exited_without_removing_its_socket(self, socket_path):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(str(socket_path))
+
+        assert socket_path.exists()
+        assert not is_server_running(socket_path)
+        assert get_devices_from_server(socket_path) is None
+
+    def test_none_when_server_does_not_answer_in_time(self, socket_path):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(str(socket_path))
+            server.listen()
+
+            assert is_server_running(socket_path)
+            assert get_devices_from_server(socket_path, timeout=0.1) is None
+
+    def test_defaults_to_socket_in_user_cache_dir(self, user_cache_dir):
+        assert get_socket_path().parent.parent == user_cache_dir
+
+    def test_does_not_create_socket_directory(self, user_cache_dir):
+        assert get_devices_from_server() is None
+        assert not get_socket_path().parent.exists()
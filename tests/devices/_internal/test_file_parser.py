@@ -8,7 +8,13 @@ from unittest import mock
 
 import pytest
 
-from mbed_tools.devices._internal.file_parser import OnlineId, read_device_files
+from mbed_tools.devices._internal.file_parser import (
+    MAX_IDENTIFICATION_FILE_SIZE,
+    OnlineId,
+    get_identification_file_stats,
+    read_device_files,
+    read_interface_version,
+)
 
 
 class TestReadDeviceFiles:
@@ -54,11 +60,96 @@ class TestReadDeviceFiles:
     def test_handles_os_error_with_warning(self, tmp_path, caplog, monkeypatch):
         bad_htm = pathlib.Path(tmp_path, "MBED.HTM")
         bad_htm.touch()
-        monkeypatch.setattr(pathlib.Path, "read_text", mock.Mock(side_effect=OSError))
+        monkeypatch.setattr(pathlib.Path, "open", mock.Mock(side_effect=OSError))
 
         read_device_files([tmp_path])
         assert str(bad_htm) in caplog.text
 
+    def test_finds_files_named_in_any_case(self, tmp_path):
+        pathlib.Path(tmp_path, "mBeD.HtM").write_text("code=2222")
+        pathlib.Path(tmp_path, "Details.Txt").write_text("Version: 2")
+
+        info = read_device_files([tmp_path])
+
+        assert info.product_code == "2222"
+        assert info.interface_details == {"Version": "2"}
+
+    def test_reads_differently_named_htm_files_if_no_known_files_found(self, tmp_path):
+        pathlib.Path(tmp_path, "LEGACY.HTM").write_text("code=2222")
+
+        assert read_device_files([tmp_path]).product_code == "2222"
+
+
+class TestBoundedReads:
+    def test_reads_only_identification_files(self, tmp_path):
+        htm_contents = "code=2222 https://os.mbed.com/platforms/SLUG/"
+        pathlib.Path(tmp_path, "MBED.HTM").write_text(htm_contents)
+        pathlib.Path(tmp_path, "OTHER.HTM").write_text("code=3333")
+        pathlib.Path(tmp_path, "firmware.bin").write_bytes(bytes(100000))
+
+        info = read_device_files([tmp_path])
+
+        assert info.product_code == "2222"
+        assert info.bytes_read == len(htm_contents)
+
+    def test_reads_at_most_max_size_from_each_file(self, tmp_path):
+        pathlib.Path(tmp_path, "MBED.HTM").write_text("code=2222" + " " * 2 * MAX_IDENTIFICATION_FILE_SIZE)
+        pathlib.Path(tmp_path, "DETAILS.TXT").write_text("Version: 2\n" + "#" * 2 * MAX_IDENTIFICATION_FILE_SIZE)
+
+        info = read_device_files([tmp_path])
+
+        assert info.product_code == "2222"
+        assert info.interface_details["Version"] == "2"
+        assert info.bytes_read == 2 * MAX_IDENTIFICATION_FILE_SIZE
+
+    def test_stops_reading_once_product_code_and_online_id_found(self, tmp_path):
+        directory_1 = pathlib.Path(tmp_path, "test-1")
+        directory_1.mkdir()
+        directory_2 = pathlib.Path(tmp_path, "test-2")
+        directory_2.mkdir()
+        htm_contents = "code=2222 https://os.mbed.com/platforms/SLUG/"
+        pathlib.Path(directory_1, "mbed.htm").write_text(htm_contents)
+        pathlib.Path(directory_1, "Board.html").write_text(build_board_html())
+        pathlib.Path(directory_2, "mbed.htm").write_text("code=3333")
+
+        info = read_device_files([directory_1, directory_2])
+
+        assert info.online_id == OnlineId(target_type="platform", slug="SLUG")
+        assert info.bytes_read == len(htm_contents)
+
+    def test_reads_htm_file_with_other_name_alongside_details_txt(self, tmp_path):
+        pathlib.Path(tmp_path, "DETAILS.TXT").write_text("Version: 0253\nBuild: Aug 24 2018 11:54:45")
+        pathlib.Path(tmp_path, "MICROBIT.HTM").write_text(
+            '<meta http-equiv="refresh" content="0; url=https://microbit.org/device/?code=9900000037024e45"/>'
+        )
+
+        info = read_device_files([tmp_path])
+
+        assert info.product_code == "9900"
+        assert info.interface_details["Version"] == "0253"
+
+    def test_does_not_list_directory_when_mbed_htm_found(self, tmp_path):
+        pathlib.Path(tmp_path, "MBED.HTM").write_text("code=2222")
+        pathlib.Path(tmp_path, "DETAILS.TXT").write_text("Version: 2")
+
+        with mock.patch.object(pathlib.Path, "iterdir") as iterdir:
+            assert read_device_files([tmp_path]).product_code == "2222"
+
+        iterdir.assert_not_called()
+
+    def test_keeps_reading_htm_files_until_online_id_found(self, tmp_path):
+        directory_1 = pathlib.Path(tmp_path, "test-1")
+        directory_1.mkdir()
+        directory_2 = pathlib.Path(tmp_path, "test-2")
+        directory_2.mkdir()
+        pathlib.Path(directory_1, "mbed.htm").write_text("code=2222")
+        pathlib.Path(directory_2, "mbed.htm").write_text("https://os.mbed.com/platforms/SLUG/")
+
+        info = read_device_files([directory_1, directory_2])
+
+        assert info.product_code == "2222"
+        assert info.online_id == OnlineId(target_type="platform", slug="SLUG")
+
 
 class TestExtractProductCodeFromHtm:
     def test_reads_product_code_from_code_attribute(self, tmp_path):
@@ -161,6 +252,46 @@ class TestExtractsJlinkData:
         assert info.interface_details == {}
 
 
+class TestGetIdentificationFileStats:
+    def test_returns_name_mtime_and_size_of_identification_files(self, tmp_path):
+        htm = pathlib.Path(tmp_path, "MBED.HTM")
+        htm.write_text("code=2222")
+        pathlib.Path(tmp_path, "firmware.bin").write_bytes(bytes(10))
+
+        assert get_identification_file_stats([tmp_path]) == [("mbed.htm", htm.stat().st_mtime_ns, 9)]
+
+    def test_empty_if_no_identification_files(self, tmp_path):
+        assert get_identification_file_stats([tmp_path]) == []
+
+
+class TestReadInterfaceVersion:
+    def test_reads_version_from_details_txt_only(self, tmp_path, monkeypatch):
+        pathlib.Path(tmp_path, "MBED.HTM").write_text("code=2222")
+        pathlib.Path(tmp_path, "DETAILS.TXT").write_text("Interface Version: 0254")
+        opened = []
+        path_open = pathlib.Path.open
+
+        def open_file(path, *args, **kwargs):
+            opened.append(path.name)
+            return path_open(path, *args, **kwargs)
+
+        monkeypatch.setattr(pathlib.Path, "open", open_file)
+
+        assert read_interface_version([tmp_path]) == "0254"
+        assert opened == ["DETAILS.TXT"]
+
+    def test_reads_version_from_segger_html(self, tmp_path):
+        segger_html = '<meta http-equiv="refresh" content="0; url=http://www.segger.com/j-link-ob/"/>'
+        pathlib.Path(tmp_path, "Segger.html").write_text(segger_html)
+
+        assert read_interface_version([tmp_path]) == "j-link-ob"
+
+    def test_none_if_not_found(self, tmp_path):
+        pathlib.Path(tmp_path, "MBED.HTM").write_text("code=2222")
+
+        assert read_interface_version([tmp_path]) is None
+
+
 # Helpers to build test data
 def build_short_details_txt(version="0226", build="Aug 24 2015 17:06:30", commit_sha="27a2367", local_mods="Yes"):
     return (
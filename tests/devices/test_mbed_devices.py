@@ -2,8 +2,11 @@
 # Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
 # SPDX-License-Identifier: Apache-2.0
 #
+import asyncio
+import os
 import pathlib
 import re
+import threading
 
 from unittest import mock
 
@@ -12,15 +15,23 @@ import pytest
 from mbed_tools.targets import Board
 
 from tests.devices.factories import CandidateDeviceFactory
-from mbed_tools.devices.device import Device
+from mbed_tools.devices._internal.base_detector import RESCAN_INTERVAL
+from mbed_tools.devices.device import ConnectedDevices, Device, DeviceEvent
 from mbed_tools.devices._internal.exceptions import NoBoardForCandidate, ResolveBoardError
 
 from mbed_tools.devices.devices import (
     get_connected_devices,
+    async_get_connected_devices,
+    iter_connected_devices,
     find_connected_device,
+    async_find_connected_device,
+    find_connected_device_by_serial_number,
     find_all_connected_devices,
+    watch_connected_devices,
+    wait_for_device,
+    wait_for_removal,
 )
-from mbed_tools.devices.exceptions import DeviceLookupFailed, NoDevicesFound
+from mbed_tools.devices.exceptions import DeviceLookupFailed, DeviceWaitTimedOut, NoDevicesFound, UnknownOSError
 
 
 @mock.patch("mbed_tools.devices.devices.detect_candidate_devices")
@@ -64,6 +75,40 @@ class TestGetConnectedDevices:
             )
         ]
 
+    @mock.patch("mbed_tools.devices._internal.build_devices.DEVICE_TIMEOUT", 0.1)
+    @mock.patch("mbed_tools.devices.device.read_device_files")
+    def test_reports_devices_which_time_out_as_unidentified(
+        self, read_device_files, resolve_board, detect_candidate_devices
+    ):
+        candidate = CandidateDeviceFactory()
+        detect_candidate_devices.return_value = [candidate]
+        release = threading.Event()
+        read_device_files.side_effect = lambda mount_points: release.wait(5)
+
+        try:
+            connected_devices = get_connected_devices()
+        finally:
+            release.set()
+
+        assert connected_devices.identified_devices == []
+        device, = connected_devices.unidentified_devices
+        assert device.serial_number == candidate.serial_number
+        assert "Timed out" in device.unidentified_reason
+
+    @mock.patch("mbed_tools.devices.devices.get_devices_from_server")
+    def test_uses_devices_from_server_when_running(
+        self, get_devices_from_server, resolve_board, detect_candidate_devices
+    ):
+        identified = mock.Mock(mbed_enabled=True, serial_number="2")
+        unidentified = mock.Mock(mbed_enabled=False, serial_number="1")
+        get_devices_from_server.return_value = [identified, unidentified]
+
+        connected_devices = get_connected_devices()
+
+        assert connected_devices.identified_devices == [identified]
+        assert connected_devices.unidentified_devices == [unidentified]
+        detect_candidate_devices.assert_not_called()
+
     @mock.patch("mbed_tools.devices.device.read_device_files")
     def test_raises_when_resolve_board_fails(self, read_device_files, resolve_board, detect_candidate_devices):
         candidate = CandidateDeviceFactory()
@@ -74,6 +119,285 @@ class TestGetConnectedDevices:
             get_connected_devices()
 
 
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+@mock.patch("mbed_tools.devices.devices.detect_candidate_devices")
+@mock.patch("mbed_tools.devices.device.resolve_board")
+class TestAsyncGetConnectedDevices:
+    @mock.patch("mbed_tools.devices.device.read_device_files")
+    def test_builds_devices_from_candidates_in_order_of_serial_number(
+        self, read_device_files, resolve_board, detect_candidate_devices
+    ):
+        candidates = [CandidateDeviceFactory(serial_number=serial_number) for serial_number in ("2", "1")]
+        detect_candidate_devices.return_value = candidates
+        read_device_files.return_value = mock.Mock(interface_details={})
+
+        connected_devices = run(async_get_connected_devices())
+
+        assert [device.serial_number for device in connected_devices.identified_devices] == ["1", "2"]
+        assert all(device.mbed_board == resolve_board.return_value for device in connected_devices.identified_devices)
+
+    @mock.patch("mbed_tools.devices.devices.get_devices_from_server")
+    def test_uses_devices_from_server_when_running(
+        self, get_devices_from_server, resolve_board, detect_candidate_devices
+    ):
+        identified = mock.Mock(mbed_enabled=True, serial_number="2")
+        unidentified = mock.Mock(mbed_enabled=False, serial_number="1")
+        get_devices_from_server.return_value = [identified, unidentified]
+
+        connected_devices = run(async_get_connected_devices())
+
+        assert connected_devices.identified_devices == [identified]
+        assert connected_devices.unidentified_devices == [unidentified]
+        detect_candidate_devices.assert_not_called()
+
+    @mock.patch("mbed_tools.devices.device.read_device_files")
+    def test_raises_when_resolve_board_fails(self, read_device_files, resolve_board, detect_candidate_devices):
+        resolve_board.side_effect = ResolveBoardError
+        detect_candidate_devices.return_value = [CandidateDeviceFactory()]
+
+        with pytest.raises(DeviceLookupFailed, match="candidate"):
+            run(async_get_connected_devices())
+
+
+@mock.patch("mbed_tools.devices.devices.async_get_connected_devices")
+class TestAsyncFindConnectedDevice:
+    def test_finds_device_with_matching_name_identifier(self, async_get_connected_devices):
+        devices = [
+            mock.Mock(mbed_board=mock.Mock(board_type="K64F"), serial_number=serial_number, mbed_enabled=True)
+            for serial_number in ("2", "1")
+        ]
+        connected = ConnectedDevices()
+        for device in devices:
+            connected.add_device(device)
+
+        async def get_connected():
+            return connected
+
+        async_get_connected_devices.side_effect = get_connected
+
+        assert run(async_find_connected_device("k64f", 1)) == devices[0]
+
+    def test_raises_when_no_mbed_enabled_devices_found(self, async_get_connected_devices):
+        async def get_connected():
+            return ConnectedDevices()
+
+        async_get_connected_devices.side_effect = get_connected
+
+        with pytest.raises(NoDevicesFound):
+            run(async_find_connected_device("K64F"))
+
+
+@mock.patch("mbed_tools.devices.device.resolve_board")
+class TestDeviceFromCandidate:
+    def test_identifies_known_device_without_identifying_it_again(self, resolve_board, tmp_path):
+        pathlib.Path(tmp_path, "MBED.HTM").write_text("code=0240")
+        pathlib.Path(tmp_path, "DETAILS.TXT").write_text("Version: 0253")
+        candidate = CandidateDeviceFactory(mount_points=[tmp_path])
+        resolve_board.return_value = Board.from_offline_board_entry({"board_type": "K64F", "product_code": "0240"})
+        device = Device.from_candidate(candidate)
+
+        with mock.patch("mbed_tools.devices.device.read_device_files") as read_device_files:
+            assert Device.from_candidate(candidate) == device
+
+        read_device_files.assert_not_called()
+        resolve_board.assert_called_once()
+        assert device.interface_version == "0253"
+
+    def test_identifies_device_again_when_interface_firmware_changes(self, resolve_board, tmp_path):
+        pathlib.Path(tmp_path, "MBED.HTM").write_text("code=0240")
+        details = pathlib.Path(tmp_path, "DETAILS.TXT")
+        details.write_text("Version: 0253")
+        candidate = CandidateDeviceFactory(mount_points=[tmp_path])
+        resolve_board.return_value = Board.from_offline_board_entry({"board_type": "K64F", "product_code": "0240"})
+        Device.from_candidate(candidate)
+
+        details.write_text("Version: 0254\n")
+
+        assert Device.from_candidate(candidate).interface_version == "0254"
+        assert resolve_board.call_count == 2
+
+    def test_identifies_device_again_when_only_interface_version_changes(self, resolve_board, tmp_path):
+        pathlib.Path(tmp_path, "MBED.HTM").write_text("code=0240")
+        details = pathlib.Path(tmp_path, "DETAILS.TXT")
+        details.write_text("Version: 0253")
+        candidate = CandidateDeviceFactory(mount_points=[tmp_path])
+        resolve_board.return_value = Board.from_offline_board_entry({"board_type": "K64F", "product_code": "0240"})
+        Device.from_candidate(candidate)
+        mtime_ns = details.stat().st_mtime_ns
+
+        # Interface firmware whose virtual file system gives its files a fixed timestamp.
+        details.write_text("Version: 0254")
+        os.utime(details, ns=(mtime_ns, mtime_ns))
+
+        assert Device.from_candidate(candidate).interface_version == "0254"
+        assert resolve_board.call_count == 2
+
+    def test_does_not_remember_unidentified_devices(self, resolve_board, tmp_path):
+        pathlib.Path(tmp_path, "MBED.HTM").write_text("code=9999")
+        candidate = CandidateDeviceFactory(mount_points=[tmp_path])
+        resolve_board.side_effect = NoBoardForCandidate
+
+        Device.from_candidate(candidate)
+        Device.from_candidate(candidate)
+
+        assert resolve_board.call_count == 2
+
+
+@mock.patch("mbed_tools.devices.devices.detect_candidate_devices")
+class TestIterConnectedDevices:
+    @mock.patch("mbed_tools.devices.devices.iter_built_devices")
+    def test_builds_devices_in_order_of_serial_number(self, iter_built_devices, detect_candidate_devices):
+        candidates = [CandidateDeviceFactory(serial_number=serial_number) for serial_number in ("c", "a", "b")]
+        detect_candidate_devices.return_value = candidates
+        iter_built_devices.return_value = iter(["device"])
+
+        assert list(iter_connected_devices()) == ["device"]
+        iter_built_devices.assert_called_once_with([candidates[1], candidates[2], candidates[0]])
+
+
+@mock.patch("mbed_tools.devices.devices.detect_candidate_devices")
+@mock.patch("mbed_tools.devices.devices.get_device_monitor")
+@mock.patch("mbed_tools.devices.devices.DeviceRegistry")
+class TestWatchConnectedDevices:
+    def test_yields_connected_devices_then_changes(self, device_registry, get_device_monitor, detect_candidate_devices):
+        monitor = get_device_monitor.return_value
+        registry = device_registry.return_value
+        added = DeviceEvent("add", mock.Mock(), 1.0)
+        removed = DeviceEvent("remove", mock.Mock(), 2.0)
+        registry.update.side_effect = [[added], [], [removed]]
+
+        events = watch_connected_devices()
+
+        assert next(events) == added
+        monitor.wait_for_change.assert_not_called()
+        assert next(events) == removed
+        assert monitor.wait_for_change.call_count == 2
+        registry.update.assert_called_with(detect_candidate_devices.return_value)
+
+    def test_scans_again_when_no_change_reported(self, device_registry, get_device_monitor, detect_candidate_devices):
+        monitor = get_device_monitor.return_value
+        monitor.wait_for_change.return_value = False
+        port_appeared = DeviceEvent("change", mock.Mock(), 2.0)
+        device_registry.return_value.update.side_effect = [[], [port_appeared]]
+
+        assert next(watch_connected_devices()) == port_appeared
+        monitor.wait_for_change.assert_called_once_with(RESCAN_INTERVAL)
+
+    def test_closes_monitor_when_closed(self, device_registry, get_device_monitor, detect_candidate_devices):
+        device_registry.return_value.update.return_value = [DeviceEvent("add", mock.Mock(), 1.0)]
+
+        events = watch_connected_devices()
+        next(events)
+        events.close()
+
+        get_device_monitor.return_value.close.assert_called_once()
+
+
+def _build_device(candidate, board_type="K64F"):
+    return Device(
+        mbed_board=Board.from_offline_board_entry({"board_type": board_type} if board_type is not None else {}),
+        serial_number=candidate.serial_number,
+        serial_port=candidate.serial_port,
+        mount_points=candidate.mount_points,
+        mbed_enabled=board_type is not None,
+    )
+
+
+@mock.patch("mbed_tools.devices.devices.detect_candidate_devices")
+@mock.patch("mbed_tools.devices.devices.get_device_monitor")
+@mock.patch("mbed_tools.devices._internal.device_registry.build_devices")
+class TestWaitForDevice:
+    def test_returns_device_which_is_already_ready(self, build_devices, get_device_monitor, detect_candidate_devices):
+        candidate = CandidateDeviceFactory(serial_port="/dev/ttyACM0")
+        detect_candidate_devices.return_value = [candidate]
+        build_devices.side_effect = lambda candidates: [_build_device(c) for c in candidates]
+
+        assert wait_for_device(serial_number=candidate.serial_number, timeout=10) == _build_device(candidate)
+        get_device_monitor.return_value.wait_for_change.assert_not_called()
+        get_device_monitor.return_value.close.assert_called_once()
+
+    def test_waits_for_serial_port_to_appear(self, build_devices, get_device_monitor, detect_candidate_devices):
+        mounted = CandidateDeviceFactory(serial_number="123")
+        ready = CandidateDeviceFactory(serial_number="123", serial_port="/dev/ttyACM0")
+        detect_candidate_devices.side_effect = [[], [mounted], [ready]]
+        build_devices.side_effect = lambda candidates: [_build_device(c) for c in candidates]
+
+        assert wait_for_device(serial_number="123", timeout=10) == _build_device(ready)
+        assert get_device_monitor.return_value.wait_for_change.call_count == 2
+
+    def test_identifies_only_devices_with_matching_serial_number(
+        self, build_devices, get_device_monitor, detect_candidate_devices
+    ):
+        other = CandidateDeviceFactory(serial_number="456", serial_port="/dev/ttyACM0")
+        wanted = CandidateDeviceFactory(serial_number="123", serial_port="/dev/ttyACM1")
+        detect_candidate_devices.return_value = [other, wanted]
+        build_devices.side_effect = lambda candidates: [_build_device(c) for c in candidates]
+
+        wait_for_device(serial_number="123", timeout=10)
+
+        build_devices.assert_called_once_with([wanted])
+
+    def test_returns_first_ready_device_of_target(self, build_devices, get_device_monitor, detect_candidate_devices):
+        candidates = [
+            CandidateDeviceFactory(serial_number=serial_number, serial_port=f"/dev/ttyACM{i}")
+            for i, serial_number in enumerate(("3", "2", "1"))
+        ]
+        detect_candidate_devices.return_value = candidates
+        boards = {"3": "K64F", "2": "K64F", "1": None}
+        build_devices.side_effect = lambda candidates: [_build_device(c, boards[c.serial_number]) for c in candidates]
+
+        assert wait_for_device(target_name="k64f", timeout=10).serial_number == "2"
+
+    def test_raises_when_device_is_not_ready_before_timeout(
+        self, build_devices, get_device_monitor, detect_candidate_devices
+    ):
+        detect_candidate_devices.return_value = [CandidateDeviceFactory(serial_number="123")]
+        build_devices.side_effect = lambda candidates: [_build_device(c) for c in candidates]
+        get_device_monitor.return_value.wait_for_change.return_value = False
+
+        with pytest.raises(DeviceWaitTimedOut, match="K64F with serial number 123"):
+            wait_for_device(serial_number="123", target_name="K64F", timeout=0.01)
+        get_device_monitor.return_value.close.assert_called_once()
+
+    @mock.patch("mbed_tools.devices.devices.time.sleep")
+    def test_polls_when_devices_cannot_be_monitored(
+        self, sleep, build_devices, get_device_monitor, detect_candidate_devices
+    ):
+        ready = CandidateDeviceFactory(serial_port="/dev/ttyACM0")
+        detect_candidate_devices.side_effect = [[], [], [ready]]
+        build_devices.side_effect = lambda candidates: [_build_device(c) for c in candidates]
+        get_device_monitor.side_effect = UnknownOSError
+
+        assert wait_for_device(timeout=10) == _build_device(ready)
+        assert sleep.call_count == 2
+
+
+@mock.patch("mbed_tools.devices.devices.detect_candidate_devices")
+@mock.patch("mbed_tools.devices.devices.get_device_monitor")
+class TestWaitForRemoval:
+    def test_returns_once_device_is_disconnected(self, get_device_monitor, detect_candidate_devices):
+        candidate = CandidateDeviceFactory()
+        detect_candidate_devices.side_effect = [[candidate], [candidate], []]
+
+        wait_for_removal(candidate.serial_number, timeout=10)
+
+        assert get_device_monitor.return_value.wait_for_change.call_count == 2
+
+    def test_raises_when_device_is_still_connected_after_timeout(self, get_device_monitor, detect_candidate_devices):
+        candidate = CandidateDeviceFactory()
+        detect_candidate_devices.return_value = [candidate]
+
+        with pytest.raises(DeviceWaitTimedOut, match=candidate.serial_number):
+            wait_for_removal(candidate.serial_number, timeout=0.01)
+
+
 @mock.patch("mbed_tools.devices.devices.find_all_connected_devices")
 class TestFindConnectedDevice:
     def test_finds_device_with_matching_name(self, mock_find_connected_devices):
@@ -86,18 +410,6 @@ class TestFindConnectedDevice:
 
         assert target_name == dev.mbed_board.board_type
 
-    def test_finds_device_with_matching_name_identifier(self, mock_find_connected_devices):
-        target_name = "K64F"
-        target_identifier = 1
-        mock_find_connected_devices.return_value = [
-            mock.Mock(mbed_board=mock.Mock(board_type=target_name, spec=True), serial_number="123", spec=True),
-            mock.Mock(mbed_board=mock.Mock(board_type=target_name, spec=True), serial_number="456", spec=True),
-        ]
-
-        dev = find_connected_device(target_name, target_identifier)
-
-        assert dev.serial_number == "456"
-
     def test_raises_when_multiple_matching_name_no_identifier(self, mock_find_connected_devices):
         target_name = "K64F"
         mock_find_connected_devices.return_value = [
@@ -120,28 +432,90 @@ class TestFindConnectedDevice:
         with pytest.raises(DeviceLookupFailed, match="Multiple"):
             find_connected_device("K64F", None)
 
-    def test_raises_when_identifier_out_of_bounds(self, mock_find_connected_devices):
+
+def _iter_devices(devices, yielded=None):
+    for device in devices:
+        if yielded is not None:
+            yielded.append(device)
+        yield device
+
+
+@mock.patch("mbed_tools.devices.devices.iter_connected_devices")
+class TestFindConnectedDeviceWithIdentifier:
+    def test_finds_device_with_matching_name_identifier(self, iter_connected_devices):
         target_name = "K64F"
-        mock_find_connected_devices.return_value = [
-            mock.Mock(
-                serial_port="tty.0",
-                mount_points=[pathlib.Path("/board")],
-                mbed_board=mock.Mock(board_type=target_name, spec=True),
-                serial_number="456",
-                spec=True,
-            ),
-            mock.Mock(
-                serial_port="tty.1",
-                mount_points=[pathlib.Path("/board2")],
-                mbed_board=mock.Mock(board_type=target_name, spec=True),
-                serial_number="123",
-                spec=True,
-            ),
+        devices = [
+            mock.Mock(mbed_board=mock.Mock(board_type=board_type), serial_number=serial_number, mbed_enabled=True)
+            for board_type, serial_number in (("K64F", "123"), ("DISCO_L475VG_IOT01A", "234"), ("K64F", "456"))
         ]
+        iter_connected_devices.return_value = _iter_devices(devices)
+
+        dev = find_connected_device(target_name, 1)
+
+        assert dev.serial_number == "456"
+
+    def test_stops_identifying_devices_once_device_is_found(self, iter_connected_devices):
+        devices = [
+            mock.Mock(mbed_board=mock.Mock(board_type="K64F"), serial_number=serial_number, mbed_enabled=True)
+            for serial_number in ("123", "456", "789")
+        ]
+        yielded = []
+        iter_connected_devices.return_value = _iter_devices(devices, yielded)
+
+        assert find_connected_device("K64F", 0) == devices[0]
+        assert yielded == [devices[0]]
+        assert iter_connected_devices.return_value.gi_frame is None
+
+    def test_raises_when_identifier_out_of_bounds(self, iter_connected_devices):
+        target_name = "K64F"
+        iter_connected_devices.return_value = _iter_devices(
+            [
+                mock.Mock(
+                    serial_port="tty.0",
+                    mount_points=[pathlib.Path("/board")],
+                    mbed_board=mock.Mock(board_type=target_name, spec=True),
+                    serial_number="123",
+                    mbed_enabled=True,
+                    spec=True,
+                ),
+                mock.Mock(
+                    serial_port="tty.1",
+                    mount_points=[pathlib.Path("/board2")],
+                    mbed_board=mock.Mock(board_type=target_name, spec=True),
+                    serial_number="456",
+                    mbed_enabled=True,
+                    spec=True,
+                ),
+            ]
+        )
 
         with pytest.raises(DeviceLookupFailed, match="valid"):
             find_connected_device("K64F", 2)
 
+    def test_raises_when_no_mbed_enabled_devices_found(self, iter_connected_devices):
+        iter_connected_devices.return_value = _iter_devices([mock.Mock(serial_number="123", mbed_enabled=False)])
+
+        with pytest.raises(NoDevicesFound):
+            find_connected_device("K64F", 0)
+
+
+@mock.patch("mbed_tools.devices.devices.iter_connected_devices")
+class TestFindConnectedDeviceBySerialNumber:
+    def test_stops_identifying_devices_once_device_is_found(self, iter_connected_devices):
+        devices = [mock.Mock(serial_number=serial_number) for serial_number in ("123", "456", "789")]
+        yielded = []
+        iter_connected_devices.return_value = _iter_devices(devices, yielded)
+
+        assert find_connected_device_by_serial_number("456") == devices[1]
+        assert yielded == devices[:2]
+        assert iter_connected_devices.return_value.gi_frame is None
+
+    def test_raises_when_no_device_has_serial_number(self, iter_connected_devices):
+        iter_connected_devices.return_value = _iter_devices([mock.Mock(serial_number="123")])
+
+        with pytest.raises(DeviceLookupFailed, match="456"):
+            find_connected_device_by_serial_number("456")
+
 
 @mock.patch("mbed_tools.devices.devices.get_connected_devices")
 class TestFindAllConnectedDevices:
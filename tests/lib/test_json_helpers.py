@@ -3,10 +3,37 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 import json
+import math
+import sys
+import types
+
+from unittest import mock
 
 import pytest
 
-from mbed_tools.lib.json_helpers import decode_json_file
+from mbed_tools.lib import json_helpers
+from mbed_tools.lib.json_helpers import decode_json, decode_json_file, get_json_backend
+
+
+@pytest.fixture(autouse=True)
+def reset_backend():
+    json_helpers.reset_json_backend()
+    yield
+    json_helpers.reset_json_backend()
+
+
+@pytest.fixture
+def fake_ujson(monkeypatch):
+    def loads(document, precise_float=False):
+        if "NaN" in str(document):
+            raise ValueError("Unsupported value")
+        return {"backend": "ujson"}
+
+    module = types.ModuleType("ujson")
+    module.loads = mock.Mock(side_effect=loads)
+    monkeypatch.setitem(sys.modules, "ujson", module)
+    monkeypatch.setenv("MBED_TOOLS_JSON_BACKEND", "ujson")
+    return module
 
 
 def test_invalid_json(tmp_path):
@@ -15,3 +42,63 @@ def test_invalid_json(tmp_path):
 
     with pytest.raises(json.JSONDecodeError):
         decode_json_file(lib_json_path)
+
+
+@pytest.mark.parametrize("backend", ["json", *json_helpers.ACCELERATED_BACKENDS])
+def test_invalid_json_error_is_same_for_all_backends(backend, monkeypatch):
+    if backend != "json":
+        pytest.importorskip(backend)
+    monkeypatch.setenv("MBED_TOOLS_JSON_BACKEND", backend)
+
+    with pytest.raises(json.JSONDecodeError) as err:
+        decode_json('{"name": }')
+
+    assert get_json_backend()[0] == backend
+    assert (err.value.msg, err.value.pos) == ("Expecting value", 9)
+
+
+@pytest.mark.parametrize("backend", ["json", *json_helpers.ACCELERATED_BACKENDS])
+def test_floats_are_same_for_all_backends(backend, monkeypatch):
+    if backend != "json":
+        pytest.importorskip(backend)
+    monkeypatch.setenv("MBED_TOOLS_JSON_BACKEND", backend)
+    document = "[0.1, 0.30000000000000004, 2.2250738585072014e-308, 1.7976931348623157e308, 5e-324, 1.0000000000000002]"
+
+    assert decode_json(document) == json.loads(document)
+
+
+def test_backend_error_is_replaced_by_stdlib_error(monkeypatch):
+    class BackendDecodeError(ValueError):
+        pass
+
+    module = types.ModuleType("orjson")
+    module.loads = mock.Mock(side_effect=BackendDecodeError("unexpected character: line 1 column 10 (char 9)"))
+    monkeypatch.setitem(sys.modules, "orjson", module)
+    monkeypatch.setenv("MBED_TOOLS_JSON_BACKEND", "orjson")
+
+    with pytest.raises(json.JSONDecodeError) as err:
+        decode_json('{"name": }')
+
+    module.loads.assert_called_once_with('{"name": }')
+    assert (err.value.msg, err.value.pos) == ("Expecting value", 9)
+
+
+def test_uses_stdlib_when_requested(monkeypatch):
+    monkeypatch.setenv("MBED_TOOLS_JSON_BACKEND", "json")
+
+    assert get_json_backend() == ("json", json.loads)
+
+
+def test_uses_requested_accelerated_backend(fake_ujson):
+    assert decode_json(b'{"a": 1}') == {"backend": "ujson"}
+    fake_ujson.loads.assert_called_once_with(b'{"a": 1}', precise_float=True)
+
+
+def test_falls_back_to_stdlib_when_backend_rejects_document(fake_ujson):
+    assert math.isnan(decode_json('{"a": NaN}')["a"])
+
+
+def test_falls_back_to_stdlib_when_requested_backend_missing(monkeypatch):
+    monkeypatch.setenv("MBED_TOOLS_JSON_BACKEND", "not-a-backend")
+    with mock.patch("mbed_tools.lib.json_helpers.importlib.import_module", side_effect=ImportError):
+        assert get_json_backend() == ("json", json.loads)
@@ -4,9 +4,12 @@
 #
 """Tests for `mbed_tools.targets._internal.board_database`."""
 
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from unittest import mock
 
+import json
 import logging
+import threading
 import pytest
 
 import mbed_tools.targets._internal.board_database as board_database
@@ -74,27 +77,37 @@ class TestGetOnlineBoardData:
         board_data = board_database.get_online_board_data()
         assert 42 == board_data, "Target data should match the contents of the target API data"
 
-    @mock.patch("mbed_tools.targets._internal.board_database.requests")
+    @mock.patch("mbed_tools.targets._internal.board_database._get_session")
     @mock.patch("mbed_tools.targets._internal.board_database.env", spec_set=env)
-    def test_auth_header_set_with_token(self, env, requests):
+    def test_auth_header_set_with_token(self, env, get_session):
         """Given an authorization token env variable, get is called with authorization header."""
         env.MBED_API_AUTH_TOKEN = "token"
         header = {"Authorization": "Bearer token"}
         board_database._get_request()
-        requests.get.assert_called_once_with(board_database._BOARD_API, headers=header)
+        get_session().get.assert_called_once_with(board_database._BOARD_API, headers=header)
 
-    @mock.patch("mbed_tools.targets._internal.board_database.requests")
-    def test_no_auth_header_set_with_empty_token_var(self, requests):
+    @mock.patch("mbed_tools.targets._internal.board_database._get_session")
+    def test_no_auth_header_set_with_empty_token_var(self, get_session):
         """Given no authorization token env variable, get is called with no header."""
         board_database._get_request()
-        requests.get.assert_called_once_with(board_database._BOARD_API, headers=None)
+        get_session().get.assert_called_once_with(board_database._BOARD_API, headers=None)
 
-    @mock.patch("mbed_tools.targets._internal.board_database.requests.get")
+    @mock.patch("mbed_tools.targets._internal.board_database._get_session")
+    def test_conditional_headers_set_with_cached_response(self, get_session):
+        """Given a cached response, get is made conditional on the response having changed."""
+        cached_response = board_database.CachedResponse(b"", '"etag"', "Wed, 21 Oct 2015 07:28:00 GMT", 0)
+        board_database._get_request(cached_response)
+        get_session().get.assert_called_once_with(
+            board_database._BOARD_API,
+            headers={"If-None-Match": '"etag"', "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT"},
+        )
+
+    @mock.patch("mbed_tools.targets._internal.board_database.requests.Session.get")
     def test_logs_no_warning_on_success(self, get, caplog):
         board_database._get_request()
         assert not caplog.records
 
-    @mock.patch("mbed_tools.targets._internal.board_database.requests.get")
+    @mock.patch("mbed_tools.targets._internal.board_database.requests.Session.get")
     def test_raises_tools_error_on_connection_error(self, get, caplog):
         get.side_effect = board_database.requests.exceptions.ConnectionError
         with pytest.raises(board_database.BoardAPIError):
@@ -102,14 +115,14 @@ class TestGetOnlineBoardData:
         assert "Unable to connect" in caplog.text
         assert len(caplog.records) == 1
 
-    @mock.patch("mbed_tools.targets._internal.board_database.requests.get")
+    @mock.patch("mbed_tools.targets._internal.board_database.requests.Session.get")
     def test_logs_error_on_requests_ssl_error(self, get, caplog):
         get.side_effect = board_database.requests.exceptions.SSLError
         with pytest.raises(board_database.BoardAPIError):
             board_database._get_request()
         assert "verify an SSL" in caplog.text
 
-    @mock.patch("mbed_tools.targets._internal.board_database.requests.get")
+    @mock.patch("mbed_tools.targets._internal.board_database.requests.Session.get")
     def test_logs_error_on_requests_proxy_error(self, get, caplog):
         get.side_effect = board_database.requests.exceptions.ProxyError
         with pytest.raises(board_database.BoardAPIError):
@@ -146,3 +159,99 @@ class TestGetLocalTargetDatabaseFile:
     def test_returns_path_to_targets(self):
         path = board_database.get_board_database_path()
         assert path.exists(), "Path to boards should exist in the package data folder."
+
+
+class StubBoardAPI(BaseHTTPRequestHandler):
+    """Serves the board data set on the server, honouring conditional requests on its ETag."""
+
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        etag = f'"{hash(json.dumps(self.server.board_data))}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body = json.dumps({"data": self.server.board_data}).encode()
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_board_api(monkeypatch):
+    for proxy_variable in ("http_proxy", "https_proxy", "HTTP_PROXY", "HTTPS_PROXY"):
+        monkeypatch.delenv(proxy_variable, raising=False)
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+    server = HTTPServer(("127.0.0.1", 0), StubBoardAPI)
+    server.board_data = [{"id": "1"}]
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01})
+    thread.start()
+    monkeypatch.setattr(board_database, "_BOARD_API", f"http://127.0.0.1:{server.server_port}/api/v4/targets")
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+class TestOnlineBoardDataCache:
+    def test_downloads_once_per_process(self, stub_board_api):
+        threads = [threading.Thread(target=board_database.get_online_board_data) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert board_database.get_online_board_data() == [{"id": "1"}]
+        assert len(stub_board_api.requests) == 1
+
+    def test_uses_fresh_cached_response_in_new_process(self, stub_board_api):
+        board_database.get_online_board_data()
+        board_database.clear_online_board_data()
+
+        assert board_database.get_online_board_data() == [{"id": "1"}]
+        assert len(stub_board_api.requests) == 1
+
+    def test_revalidates_expired_cached_response(self, stub_board_api, monkeypatch):
+        monkeypatch.setenv("MBED_DATABASE_CACHE_TTL", "0")
+        board_database.get_online_board_data()
+        board_database.clear_online_board_data()
+
+        assert board_database.get_online_board_data() == [{"id": "1"}]
+        assert len(stub_board_api.requests) == 2
+        assert stub_board_api.requests[1]["If-None-Match"] == board_database.get_online_board_data_etag()
+
+    def test_downloads_again_when_changed(self, stub_board_api, monkeypatch):
+        monkeypatch.setenv("MBED_DATABASE_CACHE_TTL", "0")
+        board_database.get_online_board_data()
+        board_database.clear_online_board_data()
+        stub_board_api.board_data = [{"id": "2"}]
+
+        assert board_database.get_online_board_data() == [{"id": "2"}]
+
+    def test_uses_expired_cached_response_when_offline(self, stub_board_api, monkeypatch, caplog):
+        monkeypatch.setenv("MBED_DATABASE_CACHE_TTL", "0")
+        board_database.get_online_board_data()
+        board_database.clear_online_board_data()
+        with mock.patch.object(board_database.requests.Session, "get") as get:
+            get.side_effect = board_database.requests.exceptions.ConnectionError
+
+            assert board_database.get_online_board_data() == [{"id": "1"}]
+        assert "out of date" in caplog.text
+
+    def test_cache_depends_on_auth_token(self, stub_board_api, monkeypatch):
+        board_database.get_online_board_data()
+        board_database.clear_online_board_data()
+        monkeypatch.setenv("MBED_API_AUTH_TOKEN", "token")
+
+        board_database.get_online_board_data()
+
+        assert len(stub_board_api.requests) == 2
+        assert stub_board_api.requests[1]["Authorization"] == "Bearer token"
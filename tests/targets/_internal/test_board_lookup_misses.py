@@ -0,0 +1,104 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Tests for `mbed_tools.targets._internal.board_lookup_misses`."""
+import json
+
+from unittest import mock
+
+from mbed_tools.targets._internal.board_lookup_misses import (
+    MAX_RECORDED_MISSES,
+    BoardLookupMisses,
+    get_database_version,
+)
+
+
+class TestGetDatabaseVersion:
+    def test_changes_with_each_database(self):
+        version = get_database_version("abc", '"etag"', "AUTO")
+
+        assert version == get_database_version("abc", '"etag"', "AUTO")
+        assert version != get_database_version("abd", '"etag"', "AUTO")
+        assert version != get_database_version("abc", '"other"', "AUTO")
+        assert version != get_database_version("abc", None, "AUTO")
+        assert version != get_database_version("abc", '"etag"', "ONLINE")
+
+
+class TestBoardLookupMisses:
+    def test_contains_recorded_misses(self, tmp_path):
+        misses = BoardLookupMisses(tmp_path / "misses.json", ttl=60)
+
+        misses.add("product_code:0240", "v1")
+
+        assert misses.contains("product_code:0240", "v1")
+        assert not misses.contains("product_code:1234", "v1")
+
+    def test_misses_are_persistent(self, tmp_path):
+        BoardLookupMisses(tmp_path / "misses.json", ttl=60).add("product_code:0240", "v1")
+
+        assert BoardLookupMisses(tmp_path / "misses.json", ttl=60).contains("product_code:0240", "v1")
+
+    def test_keeps_misses_recorded_by_other_processes(self, tmp_path):
+        misses = BoardLookupMisses(tmp_path / "misses.json", ttl=60)
+        other_process_misses = BoardLookupMisses(tmp_path / "misses.json", ttl=60)
+        misses.contains("product_code:0240", "v1")
+
+        other_process_misses.add("product_code:1234", "v1")
+        misses.add("product_code:0240", "v1")
+
+        assert misses.contains("product_code:1234", "v1")
+        assert misses.contains("product_code:0240", "v1")
+
+    def test_misses_are_dropped_when_database_version_changes(self, tmp_path):
+        misses = BoardLookupMisses(tmp_path / "misses.json", ttl=60)
+        misses.add("product_code:0240", "v1")
+
+        assert not misses.contains("product_code:0240", "v2")
+
+        misses.add("product_code:1234", "v2")
+
+        assert not misses.contains("product_code:0240", "v2")
+        assert not misses.contains("product_code:1234", "v1")
+
+    def test_misses_expire(self, tmp_path):
+        misses = BoardLookupMisses(tmp_path / "misses.json", ttl=60)
+        with mock.patch("time.time", return_value=1000.0):
+            misses.add("product_code:0240", "v1")
+
+        with mock.patch("time.time", return_value=1059.0):
+            assert misses.contains("product_code:0240", "v1")
+        with mock.patch("time.time", return_value=1060.0):
+            assert not misses.contains("product_code:0240", "v1")
+
+    def test_nothing_is_recorded_when_ttl_is_zero(self, tmp_path):
+        misses = BoardLookupMisses(tmp_path / "misses.json", ttl=0)
+
+        misses.add("product_code:0240", "v1")
+
+        assert not misses.contains("product_code:0240", "v1")
+        assert not (tmp_path / "misses.json").exists()
+
+    def test_oldest_misses_are_dropped(self, tmp_path):
+        misses = BoardLookupMisses(tmp_path / "misses.json", ttl=60)
+        for number in range(MAX_RECORDED_MISSES + 1):
+            misses.add(f"product_code:{number}", "v1")
+
+        assert not misses.contains("product_code:0", "v1")
+        assert misses.contains(f"product_code:{MAX_RECORDED_MISSES}", "v1")
+        assert len(json.loads((tmp_path / "misses.json").read_text())["misses"]) == MAX_RECORDED_MISSES
+
+    def test_ignores_unreadable_file(self, tmp_path):
+        (tmp_path / "misses.json").write_text("not json")
+        misses = BoardLookupMisses(tmp_path / "misses.json", ttl=60)
+
+        assert not misses.contains("product_code:0240", "v1")
+
+        misses.add("product_code:0240", "v1")
+
+        assert misses.contains("product_code:0240", "v1")
+
+    def test_defaults_to_file_in_user_cache_dir(self, user_cache_dir):
+        BoardLookupMisses(ttl=60).add("product_code:0240", "v1")
+
+        assert (user_cache_dir / "board-lookup-misses" / "misses.json").exists()
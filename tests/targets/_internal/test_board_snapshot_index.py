@@ -0,0 +1,78 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+import pytest
+
+from mbed_tools.targets.boards import Boards
+from mbed_tools.targets.exceptions import UnknownBoard
+from mbed_tools.targets._internal.board_database import get_board_database_path
+from mbed_tools.targets._internal.board_snapshot_index import (
+    BoardSnapshotIndex,
+    get_board_snapshot_index_path,
+    write_board_snapshot_index,
+)
+from tests.targets.factories import make_board
+
+BOARDS = [
+    make_board(product_code="0001", slug="First", board_type="FIRST", board_name="First Board", target_type="platform"),
+    make_board(product_code="0002", slug="Second", board_type="SECOND", board_name="First", target_type="module"),
+    make_board(product_code="0001", slug="first", board_type="DUPLICATE", board_name="Dup", target_type="platform"),
+]
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    snapshot_path = tmp_path / "snapshot.json"
+    snapshot_path.write_text(Boards(BOARDS).json_dump())
+    return snapshot_path
+
+
+@pytest.fixture
+def index(tmp_path, snapshot):
+    index_path = tmp_path / "snapshot.sqlite"
+    write_board_snapshot_index(BOARDS, snapshot, index_path)
+    return BoardSnapshotIndex.open(index_path, snapshot)
+
+
+class TestBoardSnapshotIndex:
+    def test_gets_first_board_by_product_code(self, index):
+        assert index.get_board_by_product_code("0001") == BOARDS[0]
+        assert index.get_board_by_product_code("0002") == BOARDS[1]
+
+    def test_gets_board_by_online_id(self, index):
+        assert index.get_board_by_online_id("SECOND", "module") == BOARDS[1]
+        with pytest.raises(UnknownBoard):
+            index.get_board_by_online_id("second", "platform")
+
+    def test_gets_first_board_by_jlink_slug(self, index):
+        assert index.get_board_by_jlink_slug("first") == BOARDS[0]
+        assert index.get_board_by_jlink_slug("duplicate") == BOARDS[2]
+
+    def test_raises_when_board_unknown(self, index):
+        with pytest.raises(UnknownBoard):
+            index.get_board_by_product_code("9999")
+
+    def test_not_used_when_snapshot_changed(self, tmp_path, snapshot):
+        index_path = tmp_path / "snapshot.sqlite"
+        write_board_snapshot_index(BOARDS, snapshot, index_path)
+        snapshot.write_text(Boards(BOARDS[:1]).json_dump())
+
+        assert BoardSnapshotIndex.open(index_path, snapshot) is None
+
+    def test_not_used_when_missing(self, tmp_path, snapshot):
+        assert BoardSnapshotIndex.open(tmp_path / "missing.sqlite", snapshot) is None
+
+    def test_not_used_when_corrupt(self, tmp_path, snapshot):
+        index_path = tmp_path / "snapshot.sqlite"
+        index_path.write_text("not a database")
+
+        assert BoardSnapshotIndex.open(index_path, snapshot) is None
+
+    def test_index_shipped_matches_snapshot_shipped(self):
+        """Fails if the snapshot was updated without regenerating the index with ci_scripts/sync_board_database.py."""
+        index = BoardSnapshotIndex.open(get_board_snapshot_index_path(), get_board_database_path())
+
+        assert index is not None
+        for board in Boards.from_offline_database():
+            assert index.get_board_by_product_code(board.product_code).product_code == board.product_code
@@ -0,0 +1,103 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+import json
+
+from unittest import mock
+
+import pytest
+
+from mbed_tools.targets._internal import lazy_targets_json
+from mbed_tools.targets._internal.lazy_targets_json import LazyTargetsJson, index_json_object
+from mbed_tools.targets._internal.target_attributes import get_target_attributes
+
+TARGETS = {
+    "Target": {"public": False, "core": None, "macros": ["BASE"], "config": {"foo": {"value": 0}}},
+    "MCU": {"inherits": ["Target"], "core": "Cortex-M4", "macros_add": ["MCU"], "name": "Brace } and \"quote\""},
+    "BOARD": {"inherits": ["MCU"], "overrides": {"foo": 1}, "device_name": "Ünïcödé"},
+    "OTHER": {"inherits": ["Target"], "core": "Cortex-M0"},
+}
+
+
+@pytest.fixture
+def targets_json(tmp_path):
+    path = tmp_path / "targets.json"
+    path.write_text(json.dumps(TARGETS, indent=4, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+class TestIndexJsonObject:
+    def test_indexes_every_member(self, targets_json):
+        document = targets_json.read_bytes()
+
+        index = index_json_object(document)
+
+        assert {name: json.loads(document[start:end]) for name, (start, end) in index.items()} == TARGETS
+
+    def test_decodes_non_ascii_keys(self):
+        document = json.dumps({"Bé": 1, "A": [2]}, ensure_ascii=False).encode()
+
+        index = index_json_object(document)
+
+        assert {name: json.loads(document[start:end]) for name, (start, end) in index.items()} == {"Bé": 1, "A": [2]}
+
+    def test_indexes_empty_object(self):
+        assert index_json_object(b" { } ") == {}
+
+    @pytest.mark.parametrize("document", [b"", b"[1]", b"{", b'{"a" 1}', b'{"a": 1,}', b'{"a": [1}', b'{"a": 1} x'])
+    def test_raises_when_not_a_json_object(self, document):
+        with pytest.raises(json.JSONDecodeError):
+            index_json_object(document)
+
+
+class TestLazyTargetsJson:
+    def test_behaves_like_decoded_targets_json(self, targets_json, tmp_path):
+        targets_data = LazyTargetsJson.from_file(targets_json, tmp_path / "cache")
+
+        assert dict(targets_data) == TARGETS
+        assert list(targets_data) == list(TARGETS)
+        assert len(targets_data) == len(TARGETS)
+        assert "BOARD" in targets_data
+        assert "UNKNOWN" not in targets_data
+        assert targets_data.get("UNKNOWN") is None
+        with pytest.raises(KeyError):
+            targets_data["UNKNOWN"]
+
+    def test_only_decodes_target_and_ancestors(self, targets_json, tmp_path):
+        targets_data = LazyTargetsJson.from_file(targets_json, tmp_path / "cache")
+
+        with mock.patch.object(lazy_targets_json, "decode_json", wraps=lazy_targets_json.decode_json) as decode_json:
+            attributes = get_target_attributes(targets_data, "BOARD")
+
+        assert decode_json.call_count == 3
+        assert attributes == get_target_attributes(TARGETS, "BOARD")
+
+    def test_uses_cached_index(self, targets_json, tmp_path):
+        LazyTargetsJson.from_file(targets_json, tmp_path / "cache")
+
+        with mock.patch.object(lazy_targets_json, "index_json_object") as index_json_object:
+            targets_data = LazyTargetsJson.from_file(targets_json, tmp_path / "cache")
+
+        index_json_object.assert_not_called()
+        assert targets_data["OTHER"] == TARGETS["OTHER"]
+
+    def test_indexes_again_when_file_changes(self, targets_json, tmp_path):
+        LazyTargetsJson.from_file(targets_json, tmp_path / "cache")
+        targets_json.write_text(json.dumps({"NEW": {}}))
+
+        assert dict(LazyTargetsJson.from_file(targets_json, tmp_path / "cache")) == {"NEW": {}}
+
+    def test_ignores_corrupt_cached_index(self, targets_json, tmp_path):
+        LazyTargetsJson.from_file(targets_json, tmp_path / "cache")
+        for index_file in (tmp_path / "cache").iterdir():
+            index_file.write_text("[")
+
+        assert dict(LazyTargetsJson.from_file(targets_json, tmp_path / "cache")) == TARGETS
+
+    def test_raises_when_file_invalid(self, tmp_path):
+        targets_json = tmp_path / "targets.json"
+        targets_json.write_text('{"BOARD": ')
+
+        with pytest.raises(json.JSONDecodeError):
+            LazyTargetsJson.from_file(targets_json, tmp_path / "cache")
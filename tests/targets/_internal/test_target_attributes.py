@@ -3,10 +3,13 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 """Tests for `mbed_tools.targets.target_attributes`."""
+import copy
 from unittest import TestCase, mock
 
 from mbed_tools.targets._internal.target_attributes import (
+    ParsingTargetsJSONError,
     TargetNotFoundError,
+    get_all_target_attributes,
     get_target_attributes,
     _extract_target_attributes,
     _extract_core_labels,
@@ -68,6 +71,71 @@ class TestGetTargetAttributes(TestCase):
         self.assertEqual(result, extract_target_attributes.return_value)
 
 
+# A diamond with modifiers at every level, a private base and a target defining an accumulating attribute itself.
+ALL_TARGETS_DATA = {
+    "Target": {
+        "public": False,
+        "core": None,
+        "config": {"foo": {"value": 0}, "bar": {"value": 1}},
+        "macros": ["BASE", "VALUE=1"],
+        "device_has": ["SERIAL"],
+        "supported_toolchains": ["GCC_ARM"],
+    },
+    "MCU_A": {"inherits": ["Target"], "core": "Cortex-M4", "macros_add": ["A"], "device_has_remove": ["SERIAL"]},
+    "MCU_B": {
+        "inherits": ["Target"],
+        "core": "Cortex-M0",
+        "macros_add": ["B"],
+        "macros_remove": ["VALUE"],
+        "features": ["BLE"],
+        "config": {"baz": {"value": 2}},
+    },
+    "BOARD_A": {"inherits": ["MCU_A"], "overrides": {"foo": 5}, "extra_labels_add": ["A_LABEL"]},
+    "BOARD_AB": {"inherits": ["MCU_A", "MCU_B"], "macros_add": ["AB"], "overrides": {"baz": 3}},
+    "BOARD_BA": {"inherits": ["MCU_B", "MCU_A"], "device_has": ["USB"], "device_has_add": ["IGNORED"]},
+    "BOARD_AB_CHILD": {"inherits": ["BOARD_AB"], "features_add": ["CHILD"], "core": "Cortex-M33"},
+}
+
+
+class TestGetAllTargetAttributes(TestCase):
+    def test_same_result_as_resolving_each_target(self):
+        all_target_attributes = get_all_target_attributes(copy.deepcopy(ALL_TARGETS_DATA))
+
+        expected = {
+            name: get_target_attributes(copy.deepcopy(ALL_TARGETS_DATA), name)
+            for name in ALL_TARGETS_DATA
+            if name != "Target"
+        }
+        self.assertEqual(all_target_attributes, expected)
+        self.assertEqual(list(all_target_attributes), list(expected))
+
+    def test_does_not_modify_targets_data(self):
+        targets_json_data = copy.deepcopy(ALL_TARGETS_DATA)
+
+        get_all_target_attributes(targets_json_data)
+
+        self.assertEqual(targets_json_data, ALL_TARGETS_DATA)
+
+    def test_results_do_not_share_config(self):
+        all_target_attributes = get_all_target_attributes(copy.deepcopy(ALL_TARGETS_DATA))
+
+        self.assertEqual(all_target_attributes["BOARD_A"]["config"]["foo"]["value"], 5)
+        self.assertEqual(all_target_attributes["MCU_A"]["config"]["foo"]["value"], 0)
+
+    def test_target_defined_before_its_parent(self):
+        targets_json_data = {"BOARD": {"inherits": ["MCU"], "macros_add": ["B"]}, "MCU": {"macros": ["M"]}}
+
+        self.assertEqual(get_all_target_attributes(targets_json_data)["BOARD"]["macros"], {"B", "M"})
+
+    def test_raises_when_parent_undefined(self):
+        with self.assertRaises(ParsingTargetsJSONError):
+            get_all_target_attributes({"BOARD": {"inherits": ["MCU"]}})
+
+    def test_raises_when_inheritance_is_circular(self):
+        with self.assertRaises(ParsingTargetsJSONError):
+            get_all_target_attributes({"A": {"inherits": ["B"]}, "B": {"inherits": ["C"]}, "C": {"inherits": ["A"]}})
+
+
 class TestExtractCoreLabels(TestCase):
     @mock.patch("mbed_tools.targets._internal.target_attributes.decode_json_file")
     def test_extract_core(self, read_json_file):
@@ -0,0 +1,94 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+import json
+import os
+
+import pytest
+
+from mbed_tools.targets._internal import target_attributes_cache
+from mbed_tools.targets._internal.target_attributes_cache import (
+    TargetAttributesCache,
+    get_target_attributes_cache_key,
+)
+
+ATTRIBUTES = {
+    "core": "Cortex-M4F",
+    "labels": {"CORTEX", "CORTEX_M"},
+    "macros": {"MBED_TICKLESS"},
+    "device_has": ["TRNG"],
+    "config": {"xip-enable": {"value": False}},
+}
+
+
+@pytest.fixture
+def targets_json(tmp_path):
+    path = tmp_path / "targets.json"
+    path.write_text(json.dumps({"K64F": {}}))
+    return path
+
+
+class TestGetTargetAttributesCacheKey:
+    def test_key_is_stable(self, targets_json):
+        assert get_target_attributes_cache_key(targets_json) == get_target_attributes_cache_key(targets_json)
+
+    def test_key_changes_when_targets_json_changes(self, targets_json):
+        key = get_target_attributes_cache_key(targets_json)
+        targets_json.write_text(json.dumps({"K64F": {"core": "Cortex-M4"}}))
+
+        assert get_target_attributes_cache_key(targets_json) != key
+
+    def test_key_changes_when_custom_targets_json_added(self, targets_json, tmp_path):
+        custom_targets_json = tmp_path / "custom_targets.json"
+        key = get_target_attributes_cache_key(targets_json, custom_targets_json)
+        custom_targets_json.write_text(json.dumps({"MY_TARGET": {}}))
+
+        assert get_target_attributes_cache_key(targets_json, custom_targets_json) != key
+
+    def test_key_changes_when_metadata_changes(self, targets_json, tmp_path, monkeypatch):
+        key = get_target_attributes_cache_key(targets_json)
+        metadata = tmp_path / "targets_metadata.json"
+        metadata.write_text(json.dumps({"CORE_LABELS": {}}))
+        monkeypatch.setattr(target_attributes_cache, "MBED_OS_METADATA_FILE", metadata)
+
+        assert get_target_attributes_cache_key(targets_json) != key
+
+
+class TestTargetAttributesCache:
+    def test_returns_none_when_not_cached(self, tmp_path):
+        assert TargetAttributesCache(tmp_path).get("key", "K64F") is None
+
+    def test_returns_stored_attributes(self, tmp_path):
+        cache = TargetAttributesCache(tmp_path)
+        cache.store("key", "K64F", ATTRIBUTES)
+
+        assert cache.get("key", "K64F") == ATTRIBUTES
+        assert cache.get("other-key", "K64F") is None
+        assert cache.get("key", "NUCLEO_F401RE") is None
+
+    def test_ignores_corrupt_entries(self, tmp_path):
+        cache = TargetAttributesCache(tmp_path)
+        cache.store("key", "K64F", ATTRIBUTES)
+        for entry in (tmp_path / "key").iterdir():
+            entry.write_text("{not json")
+
+        assert cache.get("key", "K64F") is None
+
+    def test_does_not_store_unserialisable_attributes(self, tmp_path):
+        cache = TargetAttributesCache(tmp_path)
+        cache.store("key", "K64F", {"core": object()})
+
+        assert cache.get("key", "K64F") is None
+
+    def test_evicts_oldest_keys(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(target_attributes_cache, "MAX_CACHED_KEYS", 2)
+        cache = TargetAttributesCache(tmp_path)
+        for mtime, key in enumerate(("first", "second", "third")):
+            cache.store(key, "K64F", ATTRIBUTES)
+            # Make the modification times distinct regardless of the file system's timestamp resolution.
+            os.utime(tmp_path / key, (mtime, mtime))
+
+        assert cache.get("first", "K64F") is None
+        assert cache.get("second", "K64F") == ATTRIBUTES
+        assert cache.get("third", "K64F") == ATTRIBUTES
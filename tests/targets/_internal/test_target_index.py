@@ -0,0 +1,109 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Tests for `mbed_tools.targets._internal.target_index`."""
+import json
+
+from unittest import mock
+
+import pytest
+
+from mbed_tools.targets._internal import target_index
+from mbed_tools.targets._internal.target_attributes import ParsingTargetsJSONError
+from mbed_tools.targets._internal.target_index import TargetIndex
+
+TARGETS = {
+    "Target": {"core": None, "public": False, "supported_toolchains": ["ARM", "GCC_ARM"], "device_has": ["SERIAL"]},
+    "MCU_M33": {"inherits": ["Target"], "core": "Cortex-M33", "public": False, "device_has_add": ["CAN"]},
+    "BOARD_A": {"inherits": ["MCU_M33"], "features": ["BLE"], "c_lib": "small"},
+    "BOARD_B": {"inherits": ["MCU_M33"], "device_has_remove": ["CAN"], "macros": ["X=1"]},
+}
+
+
+@pytest.fixture
+def targets_json_file(tmp_path):
+    path = tmp_path / "targets.json"
+    path.write_text(json.dumps(TARGETS))
+    return path
+
+
+class TestTargetIndex:
+    def test_indexes_resolved_attributes(self):
+        index = TargetIndex.from_target_attributes(
+            {
+                "A": {"device_has": ["CAN", "SERIAL"], "core": "Cortex-M33", "features": {"BLE"}},
+                "B": {"device_has": ["SERIAL"], "core": "Cortex-M4", "c_lib": None},
+            }
+        )
+
+        assert index.target_names == ["A", "B"]
+        assert index.get_targets_with("device_has", "SERIAL") == {"A", "B"}
+        assert index.get_targets_with("device_has", "CAN") == {"A"}
+        assert index.get_targets_with("core", "Cortex-M4") == {"B"}
+        assert index.get_targets_with("features", "BLE") == {"A"}
+        assert index.get_targets_with("features", "LWIP") == set()
+        assert index.get_values("device_has") == ["CAN", "SERIAL"]
+        assert index.get_values("c_lib") == []
+
+    def test_round_trips_through_json(self):
+        index = TargetIndex.from_target_attributes({"A": {"device_has": ["CAN"]}, "B": {"macros": {"X=1"}}})
+
+        loaded = TargetIndex.from_json(index.to_json())
+
+        assert loaded.target_names == ["A", "B"]
+        assert loaded.get_targets_with("device_has", "CAN") == {"A"}
+        assert loaded.get_targets_with("macros", "X=1") == {"B"}
+
+
+class TestFromTargetsJsonFile:
+    def test_indexes_public_targets(self, targets_json_file, tmp_path):
+        index = TargetIndex.from_targets_json_file(targets_json_file, tmp_path / "cache")
+
+        assert index.target_names == ["BOARD_A", "BOARD_B"]
+        assert index.get_targets_with("device_has", "CAN") == {"BOARD_A"}
+        assert index.get_targets_with("device_has", "SERIAL") == {"BOARD_A", "BOARD_B"}
+        assert index.get_targets_with("core", "Cortex-M33") == {"BOARD_A", "BOARD_B"}
+        assert index.get_targets_with("supported_toolchains", "GCC_ARM") == {"BOARD_A", "BOARD_B"}
+        assert index.get_targets_with("c_lib", "small") == {"BOARD_A"}
+        assert index.get_targets_with("macros", "X=1") == {"BOARD_B"}
+
+    def test_index_is_cached(self, targets_json_file, tmp_path):
+        TargetIndex.from_targets_json_file(targets_json_file, tmp_path / "cache")
+
+        with mock.patch.object(target_index, "get_all_target_attributes") as get_all_target_attributes:
+            index = TargetIndex.from_targets_json_file(targets_json_file, tmp_path / "cache")
+
+        get_all_target_attributes.assert_not_called()
+        assert index.get_targets_with("features", "BLE") == {"BOARD_A"}
+
+    def test_index_is_rebuilt_when_targets_json_changes(self, targets_json_file, tmp_path):
+        TargetIndex.from_targets_json_file(targets_json_file, tmp_path / "cache")
+        targets_json_file.write_text(json.dumps({**TARGETS, "BOARD_C": {"inherits": ["MCU_M33"]}}))
+
+        index = TargetIndex.from_targets_json_file(targets_json_file, tmp_path / "cache")
+
+        assert index.target_names == ["BOARD_A", "BOARD_B", "BOARD_C"]
+
+    def test_ignores_unreadable_cached_index(self, targets_json_file, tmp_path):
+        TargetIndex.from_targets_json_file(targets_json_file, tmp_path / "cache")
+        for cached_index in (tmp_path / "cache").iterdir():
+            cached_index.write_text("{}")
+
+        index = TargetIndex.from_targets_json_file(targets_json_file, tmp_path / "cache")
+
+        assert index.target_names == ["BOARD_A", "BOARD_B"]
+
+    def test_keeps_a_limited_number_of_indexes(self, targets_json_file, tmp_path):
+        for number in range(target_index.MAX_CACHED_INDEXES + 2):
+            targets_json_file.write_text(json.dumps({**TARGETS, f"BOARD_{number}": {}}))
+            TargetIndex.from_targets_json_file(targets_json_file, tmp_path / "cache")
+
+        assert len(list((tmp_path / "cache").iterdir())) == target_index.MAX_CACHED_INDEXES
+
+    def test_raises_when_targets_cannot_be_resolved(self, tmp_path):
+        targets_json_file = tmp_path / "targets.json"
+        targets_json_file.write_text(json.dumps({"A": {"inherits": ["Undefined"]}}))
+
+        with pytest.raises(ParsingTargetsJSONError):
+            TargetIndex.from_targets_json_file(targets_json_file, tmp_path / "cache")
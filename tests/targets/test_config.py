@@ -5,7 +5,7 @@
 import os
 from unittest import TestCase, mock
 
-from mbed_tools.targets.env import env
+from mbed_tools.targets.env import DEFAULT_DATABASE_CACHE_TTL, env
 
 
 class TestMbedApiAuthToken(TestCase):
@@ -21,3 +21,16 @@ class TestDatabaseMode(TestCase):
 
     def test_returns_default_database_mode_if_not_set_in_env(self):
         self.assertEqual(env.MBED_DATABASE_MODE, "AUTO")
+
+
+class TestDatabaseCacheTtl(TestCase):
+    @mock.patch.dict(os.environ, {"MBED_DATABASE_CACHE_TTL": "60"})
+    def test_returns_ttl_set_in_env(self):
+        self.assertEqual(env.MBED_DATABASE_CACHE_TTL, 60)
+
+    def test_returns_default_ttl_if_not_set_in_env(self):
+        self.assertEqual(env.MBED_DATABASE_CACHE_TTL, DEFAULT_DATABASE_CACHE_TTL)
+
+    @mock.patch.dict(os.environ, {"MBED_DATABASE_CACHE_TTL": "a while"})
+    def test_returns_default_ttl_if_env_invalid(self):
+        self.assertEqual(env.MBED_DATABASE_CACHE_TTL, DEFAULT_DATABASE_CACHE_TTL)
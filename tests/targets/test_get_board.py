@@ -16,17 +16,12 @@ from mbed_tools.targets.get_board import (
     _get_database_mode,
     get_board,
 )
+from mbed_tools.targets.boards import Boards
 from mbed_tools.targets.env import env
 from mbed_tools.targets.exceptions import UnknownBoard, UnsupportedMode
 from tests.targets.factories import make_board
 
 
-@pytest.fixture
-def mock_get_board():
-    with mock.patch("mbed_tools.targets.get_board.get_board", autospec=True) as gbp:
-        yield gbp
-
-
 @pytest.fixture
 def mock_env():
     with mock.patch("mbed_tools.targets.get_board.env", spec_set=env) as gbp:
@@ -91,56 +86,125 @@ class TestGetBoard:
         mocked_boards.from_online_database().get_board.assert_called_once_with(fn)
 
 
+@pytest.fixture
+def offline_boards(mock_env):
+    mock_env.MBED_DATABASE_MODE = "OFFLINE"
+    with mock.patch("mbed_tools.targets.get_board.BoardSnapshotIndex.open", return_value=None), mock.patch(
+        "mbed_tools.targets.get_board.Boards.from_offline_database", autospec=True
+    ) as from_offline:
+
+        def set_boards(*boards):
+            from_offline.return_value = Boards(boards)
+
+        yield set_boards
+
+
 class TestGetBoardByProductCode:
-    def test_matches_boards_by_product_code(self, mock_get_board):
-        product_code = "swag"
+    def test_matches_boards_by_product_code(self, offline_boards):
+        matching_board = make_board(product_code="swag")
+        offline_boards(make_board(product_code="whatever"), matching_board, make_board(product_code="swag"))
+
+        assert get_board_by_product_code("swag") is matching_board
 
-        assert get_board_by_product_code(product_code) == mock_get_board.return_value
+    def test_raises_when_no_board_matches(self, offline_boards):
+        offline_boards(make_board(product_code="whatever"))
+
+        with pytest.raises(UnknownBoard):
+            get_board_by_product_code("swag")
 
-        # Test callable matches correct boards
-        fn = mock_get_board.call_args[0][0]
+    def test_loads_database_once_per_process(self, offline_boards):
+        offline_boards(make_board(product_code="swag"), make_board(product_code="0240"))
 
-        matching_board = make_board(product_code=product_code)
-        not_matching_board = make_board(product_code="whatever")
+        get_board_by_product_code("swag")
+        get_board_by_product_code("0240")
+
+        Boards.from_offline_database.assert_called_once()
+
+    def test_falls_back_to_online_database(self, mock_env, mocked_boards):
+        mock_env.MBED_DATABASE_MODE = "AUTO"
+        mocked_boards.from_offline_database().get_board_by_product_code.side_effect = UnknownBoard
 
-        assert fn(matching_board)
-        assert not fn(not_matching_board)
+        with mock.patch("mbed_tools.targets.get_board.BoardSnapshotIndex.open", return_value=None):
+            subject = get_board_by_product_code("swag")
+
+        assert subject == mocked_boards.from_online_database().get_board_by_product_code.return_value
+        mocked_boards.from_online_database().get_board_by_product_code.assert_called_once_with("swag")
+
+    def test_uses_snapshot_index_when_available(self, mock_env):
+        mock_env.MBED_DATABASE_MODE = "OFFLINE"
+        with mock.patch("mbed_tools.targets.get_board.BoardSnapshotIndex.open") as open_index:
+            subject = get_board_by_product_code("swag")
+
+        assert subject == open_index().get_board_by_product_code.return_value
+        open_index().get_board_by_product_code.assert_called_once_with("swag")
 
 
 class TestGetBoardByOnlineId:
-    def test_matches_boards_by_online_id(self, mock_get_board):
+    def test_matches_boards_by_online_id(self, offline_boards):
         target_type = "platform"
+        matching_board = make_board(target_type=target_type, slug="SlUg")
+        offline_boards(make_board(target_type="module", slug="slug"), matching_board)
+
+        assert get_board_by_online_id(slug="slug", target_type=target_type) is matching_board
+        assert get_board_by_online_id(slug="SLUG", target_type=target_type) is matching_board
+        with pytest.raises(UnknownBoard):
+            get_board_by_online_id(slug="whatever", target_type=target_type)
+
 
-        assert get_board_by_online_id(slug="slug", target_type=target_type) == mock_get_board.return_value
+class TestGetBoardByJlinkSlug:
+    def test_matches_boards_by_jlink_slug(self, offline_boards):
+        matching_board_1 = make_board(slug="slug1")
+        matching_board_2 = make_board(board_type="SLUG2")
+        matching_board_3 = make_board(board_name="slug3")
+        offline_boards(matching_board_1, matching_board_2, matching_board_3)
+
+        assert get_board_by_jlink_slug(slug="slug1") is matching_board_1
+        assert get_board_by_jlink_slug(slug="slug2") is matching_board_2
+        assert get_board_by_jlink_slug(slug="Slug3") is matching_board_3
+        with pytest.raises(UnknownBoard):
+            get_board_by_jlink_slug(slug="whatever")
 
-        # Test callable matches correct boards
-        fn = mock_get_board.call_args[0][0]
 
-        matching_board_1 = make_board(target_type=target_type, slug="slug")
-        matching_board_2 = make_board(target_type=target_type, slug="SlUg")
-        not_matching_board = make_board(target_type=target_type, slug="whatever")
+@pytest.fixture
+def unknown_in_auto_mode(mock_env, mocked_boards):
+    mock_env.MBED_DATABASE_MODE = "AUTO"
+    mocked_boards.from_offline_database().get_board_by_product_code.side_effect = UnknownBoard
+    mocked_boards.from_online_database().get_board_by_product_code.side_effect = UnknownBoard
+    with mock.patch("mbed_tools.targets.get_board.BoardSnapshotIndex.open", return_value=None):
+        yield mocked_boards.from_online_database().get_board_by_product_code
 
-        assert fn(matching_board_1)
-        assert fn(matching_board_2)
-        assert not fn(not_matching_board)
 
+class TestBoardLookupMisses:
+    def test_repeated_lookup_of_unknown_board_does_not_search_again(self, unknown_in_auto_mode):
+        for _ in range(2):
+            with pytest.raises(UnknownBoard):
+                get_board_by_product_code("swag")
 
-class TestGetBoardByJlinkSlug:
-    def test_matches_boards_by_online_id(self, mock_get_board):
-        assert get_board_by_jlink_slug(slug="slug") == mock_get_board.return_value
+        unknown_in_auto_mode.assert_called_once_with("swag")
+
+    def test_lookup_is_not_recorded_when_online_database_is_unavailable(self, unknown_in_auto_mode):
+        unknown_in_auto_mode.side_effect = BoardAPIError
+        for _ in range(2):
+            with pytest.raises(UnknownBoard):
+                get_board_by_product_code("swag")
+
+        assert unknown_in_auto_mode.call_count == 2
+
+    def test_searches_again_when_online_database_changes(self, unknown_in_auto_mode):
+        etags = ['"1"', '"1"', '"2"', '"2"']
+        with mock.patch("mbed_tools.targets.get_board.board_database.get_online_board_data_etag", side_effect=etags):
+            for _ in range(2):
+                with pytest.raises(UnknownBoard):
+                    get_board_by_product_code("swag")
 
-        # Test callable matches correct boards
-        fn = mock_get_board.call_args[0][0]
+        assert unknown_in_auto_mode.call_count == 2
 
-        matching_board_1 = make_board(slug="slug")
-        matching_board_2 = make_board(board_type="slug")
-        matching_board_3 = make_board(board_name="slug")
-        not_matching_board = make_board()
+    def test_searches_again_when_lookup_is_different(self, unknown_in_auto_mode):
+        for product_code in ("swag", "0240"):
+            with pytest.raises(UnknownBoard):
+                get_board_by_product_code(product_code)
 
-        assert fn(matching_board_1)
-        assert fn(matching_board_2)
-        assert fn(matching_board_3)
-        assert not fn(not_matching_board)
+        assert unknown_in_auto_mode.call_count == 2
 
 
 class TestGetDatabaseMode:
@@ -3,7 +3,7 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 from unittest import TestCase, mock
-from mbed_tools.targets.get_target import get_target_by_board_type, get_target_by_name
+from mbed_tools.targets.get_target import get_all_targets, get_target_by_board_type, get_target_by_name
 from mbed_tools.targets.exceptions import TargetError
 from mbed_tools.targets._internal.target_attributes import TargetAttributesError
 
@@ -37,6 +37,22 @@ class TestGetTarget(TestCase):
         with self.assertRaises(TargetError):
             get_target_by_name(target_name, targets_json_file_path)
 
+    @mock.patch("mbed_tools.targets.get_target.target_attributes.get_all_target_attributes")
+    def test_get_all(self, mock_all_target_attrs):
+        targets_json_data = {"Target": {}}
+
+        result = get_all_targets(targets_json_data)
+
+        self.assertEqual(result, mock_all_target_attrs.return_value)
+        mock_all_target_attrs.assert_called_once_with(targets_json_data)
+
+    @mock.patch("mbed_tools.targets.get_target.target_attributes.get_all_target_attributes")
+    def test_get_all_raises_target_error_when_target_attr_collection_fails(self, mock_all_target_attrs):
+        mock_all_target_attrs.side_effect = TargetAttributesError
+
+        with self.assertRaises(TargetError):
+            get_all_targets({"Target": {}})
+
     @mock.patch("mbed_tools.targets.get_target.get_target_by_name")
     def test_get_by_board_type(self, mock_get_target_by_name):
         board_type = "Board"
@@ -0,0 +1,58 @@
+#
+# Copyright (c) 2020-2021 Arm Limited and Contributors. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Tests for `mbed_tools.targets.query_targets`."""
+import json
+
+import pytest
+
+# Import from top level as this is the expected interface for users
+from mbed_tools.targets import query_targets
+from mbed_tools.targets.exceptions import TargetError, TargetQueryError
+
+TARGETS = {
+    "Target": {"core": None, "public": False, "supported_toolchains": ["ARM", "GCC_ARM"], "device_has": ["SERIAL"]},
+    "MCU_M33": {"inherits": ["Target"], "core": "Cortex-M33F", "public": False, "device_has_add": ["CAN"]},
+    "M33_BLE": {"inherits": ["MCU_M33"], "features": ["BLE"]},
+    "M33_NO_CAN": {"inherits": ["MCU_M33"], "device_has_remove": ["CAN"], "features": ["BLE"]},
+    "M4_CAN": {"inherits": ["Target"], "core": "Cortex-M4", "device_has_add": ["CAN"], "c_lib": "small"},
+    "M33NS": {"inherits": ["Target"], "core": "Cortex-M33-NS", "supported_toolchains": ["GCC_ARM"]},
+}
+
+
+@pytest.fixture
+def targets_json_file(tmp_path):
+    path = tmp_path / "targets.json"
+    path.write_text(json.dumps(TARGETS))
+    return path
+
+
+class TestQueryTargets:
+    def test_returns_targets_matching_every_term(self, targets_json_file):
+        assert query_targets(["device_has=CAN", "features=BLE"], targets_json_file) == ["M33_BLE"]
+
+    def test_returns_all_public_targets_for_empty_query(self, targets_json_file):
+        assert query_targets([], targets_json_file) == ["M33_BLE", "M33_NO_CAN", "M4_CAN", "M33NS"]
+
+    def test_matches_any_of_several_values(self, targets_json_file):
+        assert query_targets(["core=Cortex-M4|Cortex-M33-NS"], targets_json_file) == ["M4_CAN", "M33NS"]
+
+    def test_matches_wildcards(self, targets_json_file):
+        assert query_targets(["core=Cortex-M33*"], targets_json_file) == ["M33_BLE", "M33_NO_CAN", "M33NS"]
+
+    def test_negates_terms(self, targets_json_file):
+        assert query_targets(["!supported_toolchains=ARM"], targets_json_file) == ["M33NS"]
+        assert query_targets(["device_has=CAN", "!c_lib=small"], targets_json_file) == ["M33_BLE"]
+
+    def test_returns_nothing_for_unknown_value(self, targets_json_file):
+        assert query_targets(["features=LWIP"], targets_json_file) == []
+
+    @pytest.mark.parametrize("term", ["device_has", "device_has=", "=CAN", "device_has_add=CAN", "!name=x"])
+    def test_raises_for_invalid_term(self, term, targets_json_file):
+        with pytest.raises(TargetQueryError):
+            query_targets([term], targets_json_file)
+
+    def test_raises_when_targets_json_is_missing(self, tmp_path):
+        with pytest.raises(TargetError):
+            query_targets(["device_has=CAN"], tmp_path / "targets.json")